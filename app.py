@@ -11,8 +11,11 @@ from src.snowflake_utils import SnowflakeConnection
 from src.column_mapper import ColumnMapper
 from config import load_aws_config, get_environment_name, get_config
 from src.transformations import apply_transformation, TRANSFORMATION_TEMPLATES, preview_transformation_step
+from src.transformation_plan import apply_transformations
 from src.wide_format_handler import detect_and_transform
 from src.logo_detection import detect_header_row
+from src.upload_pipeline import (read_upload_chunks, resolve_date_detection, survey_uploads, transform_chunks,
+                                 unpack_frame, will_stream)
 
 # Transformation Builder Modal
 @st.dialog("🔧 Transformation Builder", width="large")
@@ -1157,6 +1160,8 @@ def get_cached_partners(_sf_conn):
 def validate_connection(sf_conn):
     """
     Validate that the Snowflake connection is still alive.
+    Cheap on most reruns: is_connected() only queries Snowflake when nothing has
+    succeeded recently, and replaces dropped sessions itself.
     If connection is dead, clear the cache to force reconnection on next call.
 
     Args:
@@ -1434,8 +1439,10 @@ def upload_and_map_tab(sf_conn):
                             st.session_state.config_id = existing_config['CONFIG_ID']
 
                             # Load sample data back into dataframe
-                            if existing_config.get('SAMPLE_DATA'):
-                                sample_df = pd.DataFrame(existing_config['SAMPLE_DATA'])
+                            # Sample rows are only fetched when a config is actually loaded
+                            sample_data = sf_conn.get_config_sample_data(existing_config['CONFIG_ID'])
+                            if sample_data:
+                                sample_df = pd.DataFrame(sample_data)
                                 st.session_state.df = sample_df
                                 st.session_state.filename = f"[Loaded from config] {platform} - {partner_display}"
 
@@ -2248,13 +2255,18 @@ def display_configs(configs, sf_conn):
 
 def borrowed_viewership_ui(sf_conn):
     """UI for inserting borrowed viewership into platform_viewership and episode_details."""
+    # One pooled session for the whole render, so this UI never shares a cursor with other users
+    with sf_conn.session() as session:
+        _borrowed_viewership_ui(sf_conn, session.cursor)
+
+
+def _borrowed_viewership_ui(sf_conn, cur):
     import pandas as pd
     import io
 
     st.subheader("Borrowed Viewership Insert")
 
     try:
-        cur = sf_conn.cursor
         cur.execute("""
             SELECT DISTINCT deal_parent, partner, channel, channel_id, territory, territory_id
             FROM dictionary.public.deal_grid
@@ -2594,7 +2606,7 @@ def borrowed_viewership_ui(sf_conn):
                 dsc1, dsc2 = st.columns(2)
                 with dsc1:
                     if st.button("✓ Confirm", type="primary", key="bv_del_skipped_ok"):
-                        _cur = sf_conn.cursor
+                        _cur = cur
                         del_pv = del_ed = 0
                         for _, sr in skipped_rows.iterrows():
                             _ch  = sr['File Channel'].replace("'", "''")
@@ -2874,56 +2886,60 @@ def load_data_tab(sf_conn):
 
                 # Show summary of all files
                 total_rows = 0
-                file_info = []
-
-                for uploaded_file in uploaded_files:
+                surveyed = {}
+
+                app_config = get_config()
+                max_rows = 100 if debug_mode else None
+                # Delta loads compare the whole file, so they are never streamed
+                stream_min_bytes = None if app_config.DELTA_LOAD else app_config.STREAM_UPLOAD_MIN_BYTES
+                survey_status = st.empty()
+                survey_status.text(f"Reading {len(uploaded_files)} file(s)...")
+                # Ingest each file chunk by chunk (header detection, empty-row removal and
+                # wide-to-long transformation happen in read_upload_chunks). Files that will be
+                # streamed are not kept; the rest come back whole, so loading does not read them again.
+                # Several files are ingested in worker processes; each one is summarized as it finishes.
+                surveys = survey_uploads([(f, f.name) for f in uploaded_files], app_config.STREAM_CHUNK_ROWS,
+                                         max_rows, app_config.SURVEY_WORKERS, keep_frames=True,
+                                         stream_min_bytes=stream_min_bytes)
+                for idx, survey, error in surveys:
+                    uploaded_file = uploaded_files[idx]
                     try:
-                        # Read the file with logo/banner row detection
-                        if uploaded_file.name.endswith('.csv'):
-                            df_peek = pd.read_csv(uploaded_file, header=None, nrows=15)
-                            header_row = detect_header_row(df_peek)
-                            uploaded_file.seek(0)
-                            df = pd.read_csv(uploaded_file, header=header_row)
-                        else:
-                            df_peek = pd.read_excel(uploaded_file, header=None, nrows=15)
-                            header_row = detect_header_row(df_peek)
-                            uploaded_file.seek(0)
-                            df = pd.read_excel(uploaded_file, header=header_row)
-                        df.columns = df.columns.str.strip()
-
-                        # Filter out completely empty rows (all NaN/null values)
-                        original_count = len(df)
-                        df = df.dropna(how='all')
-                        empty_rows_removed = original_count - len(df)
-
-                        if empty_rows_removed > 0:
-                            st.info(f"🧹 Removed {empty_rows_removed:,} empty rows from {uploaded_file.name}")
-
-                        # Detect and transform wide format (dates as columns) to long format (dates as rows)
-                        bulk_file_type = 'csv' if uploaded_file.name.endswith('.csv') else 'xlsx'
-                        uploaded_file.seek(0)
-                        df, was_transformed, filtered_count = detect_and_transform(df, file_buffer=uploaded_file, file_type=bulk_file_type)
+                        if error is not None:
+                            raise error
+                        stats = survey['stats']
+
+                        if stats['empty_rows_removed'] > 0:
+                            st.info(f"🧹 Removed {stats['empty_rows_removed']:,} empty rows from {uploaded_file.name}")
 
-                        if was_transformed:
-                            st.info(f"📊 Wide format detected in {uploaded_file.name} - transformed to long format ({len(df)} records)")
-                            if filtered_count > 0:
-                                st.warning(f"⚠️ Filtered out {filtered_count} rows from {uploaded_file.name} with no content identification (blank title/series)")
+                        if stats['wide_format']:
+                            st.info(f"📊 Wide format detected in {uploaded_file.name} - transformed to long format ({survey['rows']} records)")
+                            if stats['filtered_count'] > 0:
+                                st.warning(f"⚠️ Filtered out {stats['filtered_count']} rows from {uploaded_file.name} with no content identification (blank title/series)")
 
-                        # Apply debug mode limit if enabled
                         if debug_mode:
-                            original_count = len(df)
-                            df = df.head(100)
-                            st.info(f"🐛 DEBUG MODE: Limited {uploaded_file.name} from {original_count:,} to {len(df)} rows")
+                            st.info(f"🐛 DEBUG MODE: Limited {uploaded_file.name} to {survey['rows']} rows")
 
-                        file_info.append({
+                        surveyed[idx] = {
                             'name': uploaded_file.name,
-                            'rows': len(df),
-                            'columns': len(df.columns),
-                            'df': df
-                        })
-                        total_rows += len(df)
+                            'rows': survey['rows'],
+                            'columns': len(survey['columns']),
+                            'preview': survey['preview'],
+                            'file': uploaded_file,
+                            'dtypes': survey['dtypes'],
+                            'max_rows': max_rows,
+                            # Only large files read chunk by chunk are streamed; the rest are loaded
+                            # in memory from 'frame' (an Arrow IPC buffer when ingested by a worker)
+                            'stream': will_stream(stats, uploaded_file.size, stream_min_bytes),
+                            'frame': survey['frame']
+                        }
+                        total_rows += survey['rows']
+                        survey_status.text(f"Read {len(surveyed)}/{len(uploaded_files)} file(s) - "
+                                           f"{uploaded_file.name}: {survey['rows']:,} rows")
                     except Exception as e:
                         st.error(f"Error reading {uploaded_file.name}: {str(e)}")
+                survey_status.empty()
+                # Files in upload order, whatever order they finished in
+                file_info = [surveyed[idx] for idx in sorted(surveyed)]
 
                 if file_info:
                     # Show file summary
@@ -2950,7 +2966,7 @@ def load_data_tab(sf_conn):
                             effective_channel = channel if channel else config.get('CHANNEL', '')
                             effective_territory = territory if territory else config.get('TERRITORY', '')
 
-                            preview_batches = get_quarterly_batches(file_info[0]['df'].head(50), column_mappings, data_type, month, quarter)
+                            preview_batches = get_quarterly_batches(file_info[0]['preview'], column_mappings, data_type, month, quarter)
                             preview_parts = [
                                 apply_column_mappings(b_df, column_mappings, platform, effective_channel, effective_territory, domain, file_info[0]['name'], year, quarter, b_month, partner=effective_partner)
                                 for b_df, b_month in preview_batches
@@ -2972,7 +2988,7 @@ def load_data_tab(sf_conn):
                         except Exception as e:
                             st.warning(f"Could not generate transformed preview: {str(e)}")
                             st.caption("Showing raw data instead:")
-                            st.dataframe(file_info[0]['df'].head(10), use_container_width=True)
+                            st.dataframe(file_info[0]['preview'].head(10), use_container_width=True)
 
                     # Apply mappings and load
                     st.subheader("3. Load Data")
@@ -3006,12 +3022,15 @@ def load_data_tab(sf_conn):
 
                             # Process each file
                             total_loaded = 0
-                            total_hov = 0.0
-                            all_transformed_dfs = []
+                            load_reports = []
                             progress_bar = st.progress(0)
                             status_text = st.empty()
                             batch_status = st.empty()
 
+                            load_jobs = []
+                            stream_jobs = []
+                            stream_chunk_rows = get_config().STREAM_CHUNK_ROWS
+                            files_done = 0
                             for idx, info in enumerate(file_info):
                                 status_text.text(f"Processing {info['name']}... ({idx + 1}/{len(file_info)})")
                                 batch_status.text("")
@@ -3022,70 +3041,98 @@ def load_data_tab(sf_conn):
                                     effective_channel = channel if channel else config.get('CHANNEL', '')
                                     effective_territory = territory if territory else config.get('TERRITORY', '')
 
-                                    # Transform data according to mappings (quarterly split if Revenue with no month/date)
-                                    batches = get_quarterly_batches(info['df'], column_mappings, data_type, month, quarter)
-                                    batch_parts = [
-                                        apply_column_mappings(b_df, column_mappings, platform, effective_channel, effective_territory, domain, info['name'], year, quarter, b_month, partner=effective_partner)
-                                        for b_df, b_month in batches
-                                    ]
-                                    transformed_df = pd.concat(batch_parts, ignore_index=True) if len(batch_parts) > 1 else batch_parts[0]
-
-                                    # Filter out records with zero or empty revenue
-                                    if 'REVENUE' in transformed_df.columns:
-                                        original_count = len(transformed_df)
-                                        # Clean revenue column first
-                                        transformed_df['REVENUE'] = transformed_df['REVENUE'].apply(lambda x:
-                                            x.replace('$', '').replace(',', '').replace(' ', '').strip() if isinstance(x, str) else x
-                                        )
-                                        # Remove rows where revenue is 0, empty, "-", or NULL
-                                        transformed_df = transformed_df[
-                                            (transformed_df['REVENUE'].notna()) &
-                                            (transformed_df['REVENUE'] != '') &
-                                            (transformed_df['REVENUE'] != '-') &
-                                            (transformed_df['REVENUE'] != '0') &
-                                            (transformed_df['REVENUE'].astype(str) != '0.0')
-                                        ]
-                                        filtered_count = original_count - len(transformed_df)
-                                        if filtered_count > 0:
-                                            st.info(f"  └─ Filtered out {filtered_count:,} zero-revenue records. Loading {len(transformed_df):,} records.")
-
-                                    # Filter out summary/total rows with no content identifier
-                                    if 'PLATFORM_CONTENT_ID' in transformed_df.columns:
-                                        pre_filter = len(transformed_df)
-                                        transformed_df = transformed_df[
-                                            transformed_df['PLATFORM_CONTENT_ID'].notna() &
-                                            (transformed_df['PLATFORM_CONTENT_ID'].astype(str).str.strip() != '')
-                                        ]
-                                        removed = pre_filter - len(transformed_df)
-                                        if removed > 0:
-                                            st.info(f"  └─ Filtered out {removed:,} row(s) with no content identifier (e.g. summary/total rows).")
-
-                                    # Calculate total hours of viewership
-                                    if 'TOT_HOV' in transformed_df.columns:
-                                        total_hov += transformed_df['TOT_HOV'].sum()
-                                    elif 'TOT_MOV' in transformed_df.columns:
-                                        # Convert minutes to hours
-                                        total_hov += transformed_df['TOT_MOV'].sum() / 60.0
+                                    load_args = dict(
+                                        data_type=data_type, platform=platform, channel=effective_channel,
+                                        territory=effective_territory, domain=domain, year=year, quarter=quarter,
+                                        month=month, partner=effective_partner
+                                    )
+
+                                    # Large files are streamed chunk by chunk after the in-memory files
+                                    if info['stream']:
+                                        stream_jobs.append((info, load_args))
+                                        continue
+
+                                    df = unpack_frame(info['frame'])
+                                    transformed_df, revenue_filtered, removed = transform_for_load(df, column_mappings, filename=info['name'], **load_args)
+                                    del df
+
+                                    if revenue_filtered > 0:
+                                        st.info(f"  └─ Filtered out {revenue_filtered:,} zero-revenue records. Loading {len(transformed_df):,} records.")
+                                    if removed > 0:
+                                        st.info(f"  └─ Filtered out {removed:,} row(s) with no content identifier (e.g. summary/total rows).")
+
+                                    load_jobs.append((info, transformed_df))
+
+                                except Exception as e:
+                                    st.error(f"✗ {info['name']}: {str(e)}")
+                                    files_done += 1
+                                    progress_bar.progress(files_done / len(file_info))
+
+                            # Load the transformed files (several at once when parallel loading is enabled)
+                            app_config = get_config()
+                            if app_config.FILE_LOAD_WORKERS > 1 and len(load_jobs) > 1:
+                                status_text.text(f"Loading {len(load_jobs)} files...")
+                                load_results = load_files_concurrently(sf_conn, load_jobs, app_config.FILE_LOAD_WORKERS, batch_status)
+                            else:
+                                load_results = []
+                                for info, transformed_df in load_jobs:
+                                    status_text.text(f"Loading {info['name']}...")
 
                                     # Define progress callback for batch updates
                                     def batch_progress(batch_num, total_batches, rows_in_batch):
                                         batch_status.text(f"  └─ Batch {batch_num}/{total_batches}: Inserted {rows_in_batch:,} rows")
 
                                     # Load to Snowflake with batch progress
-                                    rows_loaded = sf_conn.load_to_platform_viewership(transformed_df, progress_callback=batch_progress)
-                                    total_loaded += rows_loaded
-
-                                    # Only add to Lambda queue after successful Snowflake insert
-                                    all_transformed_dfs.append(transformed_df)
-
+                                    try:
+                                        report = sf_conn.load_to_platform_viewership(transformed_df, progress_callback=batch_progress, return_report=True)
+                                        load_results.append((info, transformed_df, report, None))
+                                    except Exception as e:
+                                        load_results.append((info, transformed_df, None, e))
                                     batch_status.text("")  # Clear batch status
-                                    st.success(f"✓ {info['name']}: {rows_loaded:,} rows loaded")
 
+                            # Stream the large files: read, transform and load one chunk at a time
+                            for info, load_args in stream_jobs:
+                                status_text.text(f"Streaming {info['name']}...")
+                                try:
+                                    report, revenue_filtered, removed = load_file_streaming(
+                                        sf_conn, info, column_mappings, load_args, stream_chunk_rows, batch_status
+                                    )
+                                    if revenue_filtered > 0:
+                                        st.info(f"  └─ Filtered out {revenue_filtered:,} zero-revenue records from {info['name']}.")
+                                    if removed > 0:
+                                        st.info(f"  └─ Filtered out {removed:,} row(s) with no content identifier from {info['name']} (e.g. summary/total rows).")
+                                    load_results.append((info, None, report, None))
                                 except Exception as e:
-                                    st.error(f"✗ {info['name']}: {str(e)}")
+                                    load_results.append((info, None, None, e))
+                                batch_status.text("")
+
+                            for info, transformed_df, report, error in load_results:
+                                if error is None:
+                                    total_loaded += report['rows_loaded']
+                                    # Only add to Lambda queue after a successful and verified Snowflake insert
+                                    if report['verified']:
+                                        load_reports.append((info['name'], report))
+                                    if 'delta' in report:
+                                        delta = report['delta']
+                                        st.success(f"✓ {info['name']}: {delta['inserted']:,} changed rows loaded, "
+                                                   f"{delta['deleted']:,} replaced rows removed, {delta['unchanged']:,} unchanged")
+                                    else:
+                                        st.success(f"✓ {info['name']}: {report['rows_loaded']:,} rows loaded")
+                                    if not report['verified']:
+                                        failed = ', '.join(
+                                            f"{check['name']} (expected {check['expected']}, found {check['actual']})"
+                                            for check in report['checks'] if not check['ok']
+                                        )
+                                        st.error(f"✗ {info['name']}: post-load verification mismatch - {failed}. "
+                                                 f"Post-processing skipped for this file; re-upload it once the mismatch is resolved.")
+                                    elif report['skipped']:
+                                        st.caption(f"  └─ Not verified (columns absent): {', '.join(report['skipped'])}")
+                                else:
+                                    st.error(f"✗ {info['name']}: {str(error)}")
 
                                 # Update progress
-                                progress_bar.progress((idx + 1) / len(file_info))
+                                files_done += 1
+                                progress_bar.progress(files_done / len(file_info))
 
                             status_text.text("Complete!")
                             st.success(f"🎉 Successfully loaded {total_loaded:,} total rows from {len(file_info)} file(s) to platform_viewership table!")
@@ -3109,16 +3156,14 @@ def load_data_tab(sf_conn):
 
                                     # Invoke Lambda once per file (not once for all files with concatenated filenames)
                                     lambda_success_count = 0
-                                    for file_idx, transformed_df in enumerate(all_transformed_dfs):
-                                        filename = file_info[file_idx]['name']
-                                        record_count = len(transformed_df)
-
-                                        # Calculate TOT_HOV for this specific file
-                                        file_hov = 0.0
-                                        if 'TOT_HOV' in transformed_df.columns:
-                                            file_hov = transformed_df['TOT_HOV'].sum()
-                                        elif 'TOT_MOV' in transformed_df.columns:
-                                            file_hov = transformed_df['TOT_MOV'].sum() / 60.0
+                                    for filename, report in load_reports:
+                                        # Row count and TOT_HOV come from the post-load verification report
+                                        record_count = report['record_count']
+                                        file_hov = report['tot_hov']
+                                        if record_count == 0:
+                                            # Delta re-upload with no changed rows: nothing to process
+                                            st.info(f"ℹ️ {filename}: no changed rows, post-processing skipped")
+                                            continue
 
                                         # Convert numpy/pandas types to native Python types for JSON serialization
                                         def convert_to_native(val):
@@ -3194,6 +3239,162 @@ def load_data_tab(sf_conn):
                             # Reset flag to allow future uploads
                             st.session_state.upload_in_progress = False
 
+def transform_for_load(df, column_mappings, data_type, platform, channel, territory, domain, filename=None,
+                       year=None, quarter=None, month=None, partner=None, show_messages=True):
+    """
+    Turn source rows into platform_viewership rows: apply the template mappings
+    (split per month for quarterly revenue) and drop zero-revenue and summary rows
+
+    Args:
+        df: Source rows (a whole file or one chunk of it)
+        column_mappings: Template column mappings
+        data_type: Data type of the upload
+        platform, channel, territory, domain, filename, year, quarter, month, partner:
+            See apply_column_mappings
+        show_messages: Show apply_column_mappings' informational notes
+
+    Returns:
+        Tuple of (transformed DataFrame, zero-revenue rows removed, rows without content identifier removed)
+    """
+    # Transform data according to mappings (quarterly split if Revenue with no month/date)
+    batches = get_quarterly_batches(df, column_mappings, data_type, month, quarter)
+    batch_parts = [
+        apply_column_mappings(b_df, column_mappings, platform, channel, territory, domain, filename, year, quarter, b_month,
+                              partner=partner, show_messages=show_messages, log_timings=True)
+        for b_df, b_month in batches
+    ]
+    transformed_df = pd.concat(batch_parts, ignore_index=True) if len(batch_parts) > 1 else batch_parts[0]
+
+    # Filter out records with zero or empty revenue
+    revenue_filtered = 0
+    if 'REVENUE' in transformed_df.columns:
+        original_count = len(transformed_df)
+        # Clean revenue column first
+        transformed_df['REVENUE'] = transformed_df['REVENUE'].apply(lambda x:
+            x.replace('$', '').replace(',', '').replace(' ', '').strip() if isinstance(x, str) else x
+        )
+        # Remove rows where revenue is 0, empty, "-", or NULL
+        transformed_df = transformed_df[
+            (transformed_df['REVENUE'].notna()) &
+            (transformed_df['REVENUE'] != '') &
+            (transformed_df['REVENUE'] != '-') &
+            (transformed_df['REVENUE'] != '0') &
+            (transformed_df['REVENUE'].astype(str) != '0.0')
+        ]
+        revenue_filtered = original_count - len(transformed_df)
+
+    # Filter out summary/total rows with no content identifier
+    removed = 0
+    if 'PLATFORM_CONTENT_ID' in transformed_df.columns:
+        pre_filter = len(transformed_df)
+        transformed_df = transformed_df[
+            transformed_df['PLATFORM_CONTENT_ID'].notna() &
+            (transformed_df['PLATFORM_CONTENT_ID'].astype(str).str.strip() != '')
+        ]
+        removed = pre_filter - len(transformed_df)
+
+    return transformed_df, revenue_filtered, removed
+
+
+def load_file_streaming(sf_conn, info, column_mappings, load_args, chunk_rows, batch_status):
+    """
+    Read, transform and load one file a chunk at a time
+
+    Only one chunk is in memory at a time. The Date format is detected once on the first
+    chunk and reused for the rest, so every chunk parses dates the same way.
+
+    Args:
+        sf_conn: SnowflakeConnection instance
+        info: File info dict from the Load Data tab (file, name, dtypes, max_rows)
+        column_mappings: Template column mappings
+        load_args: Keyword arguments for transform_for_load
+        chunk_rows: Rows per chunk
+        batch_status: Streamlit placeholder for progress text
+
+    Returns:
+        Tuple of (verification report, zero-revenue rows removed, rows without content identifier removed)
+    """
+    filtered = {'revenue': 0, 'no_content_id': 0}
+    chunk_mappings = {'mappings': column_mappings}
+
+    def transform(chunk, is_first):
+        if is_first:
+            chunk_mappings['mappings'] = resolve_date_detection(column_mappings, chunk)
+        # The first chunk runs with the template mappings so its notes are shown once
+        mappings = column_mappings if is_first else chunk_mappings['mappings']
+        transformed_df, revenue_filtered, removed = transform_for_load(
+            chunk, mappings, filename=info['name'], show_messages=is_first, **load_args
+        )
+        filtered['revenue'] += revenue_filtered
+        filtered['no_content_id'] += removed
+        return transformed_df
+
+    def chunk_progress(chunk_num, rows_loaded):
+        batch_status.text(f"  └─ Chunk {chunk_num}: {rows_loaded:,} rows loaded so far")
+
+    chunks = read_upload_chunks(info['file'], info['name'], chunk_rows, info['max_rows'], dtypes=info['dtypes'])
+    report = sf_conn.load_stream_to_platform_viewership(
+        transform_chunks(chunks, transform), progress_callback=chunk_progress, return_report=True
+    )
+    return report, filtered['revenue'], filtered['no_content_id']
+
+
+def load_files_concurrently(sf_conn, load_jobs, max_files, batch_status):
+    """
+    Load several transformed files into platform_viewership at the same time
+
+    Each file is loaded on its own worker thread, which borrows its own pooled Snowflake session.
+    Streamlit elements can only be updated from the script thread, so workers record
+    their batch progress and this thread renders it while waiting.
+
+    Args:
+        sf_conn: SnowflakeConnection
+        load_jobs: List of (file info dict, transformed DataFrame)
+        max_files: Maximum number of files loading at once
+        batch_status: st.empty() placeholder for progress text
+
+    Returns:
+        List of (file info, transformed DataFrame, verification report or None, exception or None)
+        in load_jobs order
+    """
+    from concurrent.futures import ThreadPoolExecutor, wait
+
+    progress = {}
+
+    def load_one(info, transformed_df):
+        def record_progress(batch_num, total_batches, rows_in_batch):
+            progress[info['name']] = (batch_num, total_batches)
+        return sf_conn.load_to_platform_viewership(transformed_df, progress_callback=record_progress, return_report=True)
+
+    with ThreadPoolExecutor(max_workers=max_files) as executor:
+        futures = [executor.submit(load_one, info, transformed_df) for info, transformed_df in load_jobs]
+        pending = set(futures)
+        while pending:
+            _, pending = wait(pending, timeout=0.5)
+            if progress:
+                batch_status.text("  └─ " + " | ".join(
+                    f"{name}: batch {done}/{total}" for name, (done, total) in list(progress.items())
+                ))
+
+    batch_status.text("")
+    results = []
+    for (info, transformed_df), future in zip(load_jobs, futures):
+        error = future.exception()
+        results.append((info, transformed_df, future.result() if error is None else None, error))
+    return results
+
+
+def run_inline(fn, *args):
+    """Run fn now and return its outcome as a completed Future (serial stand-in for executor.submit)"""
+    from concurrent.futures import Future
+
+    future = Future()
+    try:
+        future.set_result(fn(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
 def get_quarterly_batches(df, column_mappings, data_type, month, quarter):
     """
     If data_type is Revenue/Viewership_Revenue, no month is selected, and Date is not in the file,
@@ -3260,7 +3461,8 @@ def get_quarterly_batches(df, column_mappings, data_type, month, quarter):
     return batches
 
 
-def apply_column_mappings(df, column_mappings, platform, channel, territory, domain, filename=None, year=None, quarter=None, month=None, partner=None):
+def apply_column_mappings(df, column_mappings, platform, channel, territory, domain, filename=None, year=None, quarter=None, month=None, partner=None, show_messages=True,
+                          max_workers=None, timings=None, log_timings=False):
     """
     Apply column mappings to transform uploaded data
 
@@ -3275,10 +3477,21 @@ def apply_column_mappings(df, column_mappings, platform, channel, territory, dom
         year: Year value to use (if provided)
         quarter: Quarter value to use (if provided)
         month: Month value to use (if provided)
+        partner: Partner value to use (if provided)
+        show_messages: Show the informational notes (set False for later chunks of a streamed file)
+        max_workers: Threads the per-column work is spread across (None = COLUMN_MAPPING_WORKERS
+            from config, 1 = serial)
+        timings: Optional dict filled with the seconds spent per target column (targets
+            sharing a source column's transformations each include the shared time)
+        log_timings: Print the per-column timings (the load path sets this; previews
+            re-run on every Streamlit rerun and stay quiet)
 
     Returns:
         Transformed dataframe with standardized column names
     """
+    from concurrent.futures import ThreadPoolExecutor
+    import time
+
     transformed_data = {}
 
     # Get the number of rows for broadcasting scalar values
@@ -3287,6 +3500,46 @@ def apply_column_mappings(df, column_mappings, platform, channel, territory, dom
     # Create a mapping of normalized column names to original names (whitespace + case insensitive matching)
     normalized_to_original = {col.strip().lower(): col for col in df.columns}
 
+    def find_source_column(source_col):
+        """Actual name of a mapped source column in df (None when absent)"""
+        if not source_col:
+            return None
+        # Try exact match first
+        if source_col in df.columns:
+            return source_col
+        # Then try normalized match (stripped whitespace + lowercase)
+        return normalized_to_original.get(source_col.strip().lower())
+
+    # Run all configured transformations up front, so targets transforming the same
+    # source column (e.g. the Dual Format Channel/Partner/Territory templates) share
+    # their common work
+    planned = {}
+    for target_col, mapping_value in column_mappings.items():
+        if (target_col != 'Platform' and isinstance(mapping_value, dict) and 'hardcoded_value' not in mapping_value
+                and mapping_value.get('transformation')):
+            actual_col_name = find_source_column(mapping_value.get('source_column'))
+            if actual_col_name:
+                planned[target_col] = (actual_col_name, mapping_value['transformation'])
+
+    # Per-column work runs on a thread pool when max_workers > 1: one task per source
+    # column with planned transformations, then one task per mapped column. Workers
+    # never touch Streamlit; their notes are shown here, in mapping order.
+    if max_workers is None:
+        max_workers = get_config().COLUMN_MAPPING_WORKERS
+    executor = ThreadPoolExecutor(max_workers=max_workers) if max_workers > 1 else None
+    submit = executor.submit if executor else run_inline
+
+    def transform_group(group):
+        started = time.perf_counter()
+        return apply_transformations(df, group), time.perf_counter() - started
+
+    planned_groups = {}
+    for target_col, (actual_col_name, config) in planned.items():
+        planned_groups.setdefault(actual_col_name, {})[target_col] = (actual_col_name, config)
+    # Submitted before any column task, so a column task waiting on its group never
+    # waits on work that has not started
+    group_futures = {col: submit(transform_group, group) for col, group in planned_groups.items()}
+
     # Always use the platform from the parameter
     transformed_data['PLATFORM'] = [platform] * num_rows
 
@@ -3324,171 +3577,227 @@ def apply_column_mappings(df, column_mappings, platform, channel, territory, dom
         'TERRITORY': 'PLATFORM_TERRITORY',   # For optional column mapping
     }
 
-    # Apply mappings from configuration
-    for target_col, mapping_value in column_mappings.items():
-        if target_col == 'Platform':
-            # Skip Platform from mappings, we already set it
-            continue
-
-        # Handle both old and new mapping formats
-        # Old format: {"Partner": "source_column_name"}
-        # New format: {"Partner": {"source_column": "name", "transformation": {...}}}
-        # Hardcoded format: {"Territory": {"hardcoded_value": "United States"}}
-
-        source_col = None
-        transformation_config = None
-        hardcoded_value = None
-        unit = 'hours'
-
-        if isinstance(mapping_value, dict):
-            # New dict format - check for hardcoded_value first
-            if 'hardcoded_value' in mapping_value:
-                hardcoded_value = mapping_value['hardcoded_value']
-                # Unwrap nested hardcoded_value dicts (happens when config is resaved)
-                while isinstance(hardcoded_value, dict) and 'hardcoded_value' in hardcoded_value:
-                    hardcoded_value = hardcoded_value['hardcoded_value']
-            elif 'source_column' in mapping_value:
-                source_col = mapping_value['source_column']
-                transformation_config = mapping_value.get('transformation')
-                unit = mapping_value.get('unit', 'hours')
-        else:
-            # Old format (backwards compatible) - simple string mapping
-            # Special case: Partner, Channel, Territory in legacy format should be hardcoded values
-            if target_col in ['Partner', 'Channel', 'Territory']:
-                hardcoded_value = mapping_value
-            else:
-                source_col = mapping_value
-                unit = column_mappings.get('_total_watch_time_unit', 'hours')
+    def map_column(target_col, actual_col_name, transformation_config, unit):
+        """
+        Transform one mapped source column
+
+        Returns:
+            Tuple of (output columns, notes as (level, message), seconds spent excluding
+            the shared transformation of its source column)
+        """
+        planned_result = None
+        if target_col in planned:
+            planned_result = group_futures[actual_col_name].result()[0]
+        started = time.perf_counter()
+        outputs = {}
+        notes = []
+
+        # Get source data
+        source_data = df[actual_col_name]
+        original_data = df[actual_col_name].copy()  # Keep a copy of original
+
+        # Special handling for Date column: Auto-detect format if no transformation configured
+        if target_col == 'Date' and not transformation_config:
+            from src.transformations import detect_column_date_format
+            detected_format = detect_column_date_format(source_data, filename, actual_col_name)
+            if detected_format:
+                # Create a parse_date transformation with the detected format
+                transformation_config = {
+                    'type': 'parse_date',
+                    'params': {
+                        'input_format': detected_format,
+                        'output_format': '%Y-%m-%d'
+                    }
+                }
+                # Show user-friendly format name based on detected format
+                if '%d' in detected_format and detected_format.index('%d') < detected_format.index('%m'):
+                    format_name = 'DD/MM/YYYY'
+                elif '%m' in detected_format and detected_format.index('%m') < detected_format.index('%d'):
+                    format_name = 'MM/DD/YYYY'
+                else:
+                    format_name = detected_format  # Fallback to showing the actual format
+
+                notes.append(('info', f"📅 Auto-detected date format: **{format_name}** (e.g., {source_data.dropna().iloc[0] if len(source_data.dropna()) > 0 else 'N/A'})"))
+
+        # Apply transformation if configured
+        has_transformation = False
+        if transformation_config:
+            try:
+                if planned_result is not None and target_col in planned_result['errors']:
+                    raise planned_result['errors'][target_col]
+                if planned_result is not None and target_col in planned_result['columns']:
+                    source_data = planned_result['columns'][target_col]
+                else:
+                    source_data = apply_transformation(source_data, transformation_config)
+                has_transformation = True
+            except Exception as e:
+                notes.append(('warning', f"Transformation error for {target_col}: {str(e)}"))
 
-        # Skip metadata keys
-        if target_col == '_total_watch_time_unit':
-            continue
+        # Handle Total Watch Time with unit conversion
+        if target_col == 'Total Watch Time':
+            # Convert to numeric, removing commas if present
+            numeric_data = pd.to_numeric(source_data.astype(str).str.replace(',', ''), errors='coerce')
 
-        # Handle hardcoded values FIRST
-        if hardcoded_value is not None:
-            # Apply hardcoded value to all rows
+            if unit == 'minutes':
+                outputs['TOT_MOV'] = numeric_data
+            else:
+                outputs['TOT_HOV'] = numeric_data
+        else:
+            # Check if this column has a special mapping
             if target_col in column_name_mapping:
                 std_col_name = column_name_mapping[target_col]
             else:
+                # Convert target column name to uppercase with underscores
                 std_col_name = target_col.upper().replace(' ', '_')
 
-            # Broadcast scalar value to match dataframe length
-            transformed_data[std_col_name] = [hardcoded_value] * num_rows
-            st.info(f"ℹ️ Using hardcoded value for {target_col}: '{hardcoded_value}'")
-            continue  # Skip to next column
-
-        # Process if source column exists (with whitespace and case-insensitive matching)
-        actual_col_name = None
-        if source_col:
-            # Try exact match first
-            if source_col in df.columns:
-                actual_col_name = source_col
-            # Then try normalized match (stripped whitespace + lowercase)
-            elif source_col.strip().lower() in normalized_to_original:
-                actual_col_name = normalized_to_original[source_col.strip().lower()]
-
-        if actual_col_name:
-            # Get source data
-            source_data = df[actual_col_name]
-            original_data = df[actual_col_name].copy()  # Keep a copy of original
-
-            # Special handling for Date column: Auto-detect format if no transformation configured
-            if target_col == 'Date' and not transformation_config:
-                from src.transformations import detect_date_format
-                detected_format = detect_date_format(source_data)
-                if detected_format:
-                    # Create a parse_date transformation with the detected format
-                    transformation_config = {
-                        'type': 'parse_date',
-                        'params': {
-                            'input_format': detected_format,
-                            'output_format': '%Y-%m-%d'
-                        }
-                    }
-                    # Show user-friendly format name based on detected format
-                    if '%d' in detected_format and detected_format.index('%d') < detected_format.index('%m'):
-                        format_name = 'DD/MM/YYYY'
-                    elif '%m' in detected_format and detected_format.index('%m') < detected_format.index('%d'):
-                        format_name = 'MM/DD/YYYY'
-                    else:
-                        format_name = detected_format  # Fallback to showing the actual format
+            # If transformation was applied, store both original and transformed
+            if has_transformation and target_col in ['Channel', 'Partner', 'Territory', 'Content Name']:
+                # Store original in PLATFORM_* column
+                outputs[std_col_name] = original_data
+                # Store transformed in new column without PLATFORM_ prefix
+                if target_col == 'Content Name':
+                    outputs['CONTENT'] = source_data
+                else:
+                    outputs[target_col.upper()] = source_data
+            else:
+                # No transformation, just store as usual
+                outputs[std_col_name] = source_data
 
-                    st.info(f"📅 Auto-detected date format: **{format_name}** (e.g., {source_data.dropna().iloc[0] if len(source_data.dropna()) > 0 else 'N/A'})")
+        return outputs, notes, time.perf_counter() - started
 
-            # Apply transformation if configured
-            has_transformation = False
-            if transformation_config:
-                try:
-                    source_data = apply_transformation(source_data, transformation_config)
-                    has_transformation = True
-                except Exception as e:
-                    st.warning(f"Transformation error for {target_col}: {str(e)}")
+    def show_notes(notes):
+        for level, message in notes:
+            if level == 'warning':
+                st.warning(message)
+            elif show_messages:
+                st.info(message)
 
-            # Handle Total Watch Time with unit conversion
-            if target_col == 'Total Watch Time':
-                # Convert to numeric, removing commas if present
-                numeric_data = pd.to_numeric(source_data.astype(str).str.replace(',', ''), errors='coerce')
+    # (target column, future of map_column's result) in mapping order
+    column_parts = []
+    try:
+        # Apply mappings from configuration
+        for target_col, mapping_value in column_mappings.items():
+            if target_col == 'Platform':
+                # Skip Platform from mappings, we already set it
+                continue
 
-                if unit == 'minutes':
-                    transformed_data['TOT_MOV'] = numeric_data
-                else:
-                    transformed_data['TOT_HOV'] = numeric_data
+            # Handle both old and new mapping formats
+            # Old format: {"Partner": "source_column_name"}
+            # New format: {"Partner": {"source_column": "name", "transformation": {...}}}
+            # Hardcoded format: {"Territory": {"hardcoded_value": "United States"}}
+
+            source_col = None
+            transformation_config = None
+            hardcoded_value = None
+            unit = 'hours'
+
+            if isinstance(mapping_value, dict):
+                # New dict format - check for hardcoded_value first
+                if 'hardcoded_value' in mapping_value:
+                    hardcoded_value = mapping_value['hardcoded_value']
+                    # Unwrap nested hardcoded_value dicts (happens when config is resaved)
+                    while isinstance(hardcoded_value, dict) and 'hardcoded_value' in hardcoded_value:
+                        hardcoded_value = hardcoded_value['hardcoded_value']
+                elif 'source_column' in mapping_value:
+                    source_col = mapping_value['source_column']
+                    transformation_config = mapping_value.get('transformation')
+                    unit = mapping_value.get('unit', 'hours')
             else:
-                # Check if this column has a special mapping
+                # Old format (backwards compatible) - simple string mapping
+                # Special case: Partner, Channel, Territory in legacy format should be hardcoded values
+                if target_col in ['Partner', 'Channel', 'Territory']:
+                    hardcoded_value = mapping_value
+                else:
+                    source_col = mapping_value
+                    unit = column_mappings.get('_total_watch_time_unit', 'hours')
+
+            # Skip metadata keys
+            if target_col == '_total_watch_time_unit':
+                continue
+
+            # Handle hardcoded values FIRST
+            if hardcoded_value is not None:
+                # Apply hardcoded value to all rows
                 if target_col in column_name_mapping:
                     std_col_name = column_name_mapping[target_col]
                 else:
-                    # Convert target column name to uppercase with underscores
                     std_col_name = target_col.upper().replace(' ', '_')
 
-                # If transformation was applied, store both original and transformed
-                if has_transformation and target_col in ['Channel', 'Partner', 'Territory', 'Content Name']:
-                    # Store original in PLATFORM_* column
-                    transformed_data[std_col_name] = original_data
-                    # Store transformed in new column without PLATFORM_ prefix
-                    if target_col == 'Content Name':
-                        transformed_data['CONTENT'] = source_data
-                    else:
-                        transformed_data[target_col.upper()] = source_data
-                else:
-                    # No transformation, just store as usual
-                    transformed_data[std_col_name] = source_data
-        elif source_col and source_col != "":
-            # Special case: Date column missing from file but year+month provided — synthesize from UI selections
-            if target_col == 'Date' and year and month:
-                month_map = {"January": "01", "February": "02", "March": "03", "April": "04",
-                             "May": "05", "June": "06", "July": "07", "August": "08",
-                             "September": "09", "October": "10", "November": "11", "December": "12"}
-                month_num = month_map.get(month, "01")
-                synthesized_date = f"{year}-{month_num}-01"
-                transformed_data['DATE'] = [synthesized_date] * num_rows
-                transformed_data['YEAR_MONTH_DAY'] = [f"{year}{month_num}01"] * num_rows
-                continue
-
-            # Column not found - this is a configuration error
-            # Show clear error message instead of silently treating as hardcoded value
+                # Broadcast scalar value to match dataframe length
+                column_parts.append((target_col, run_inline(lambda: (
+                    {std_col_name: [hardcoded_value] * num_rows},
+                    [('info', f"ℹ️ Using hardcoded value for {target_col}: '{hardcoded_value}'")],
+                    0.0
+                ))))
+                continue  # Skip to next column
+
+            # Process if source column exists (with whitespace and case-insensitive matching)
+            actual_col_name = find_source_column(source_col)
+
+            if actual_col_name:
+                column_parts.append((target_col, submit(map_column, target_col, actual_col_name, transformation_config, unit)))
+            elif source_col and source_col != "":
+                # Special case: Date column missing from file but year+month provided — synthesize from UI selections
+                if target_col == 'Date' and year and month:
+                    month_map = {"January": "01", "February": "02", "March": "03", "April": "04",
+                                 "May": "05", "June": "06", "July": "07", "August": "08",
+                                 "September": "09", "October": "10", "November": "11", "December": "12"}
+                    month_num = month_map.get(month, "01")
+                    synthesized_date = f"{year}-{month_num}-01"
+                    column_parts.append((target_col, run_inline(lambda: ({
+                        'DATE': [synthesized_date] * num_rows,
+                        'YEAR_MONTH_DAY': [f"{year}{month_num}01"] * num_rows,
+                    }, [], 0.0))))
+                    continue
 
-            # Show available columns to help user debug
-            available_cols = list(df.columns)
+                # Column not found - this is a configuration error
+                # Show clear error message instead of silently treating as hardcoded value
 
-            # Try to find similar column names (fuzzy matching)
-            similar_cols = [col for col in available_cols if source_col.lower() in col.lower() or col.lower() in source_col.lower()]
+                # Show available columns to help user debug
+                available_cols = list(df.columns)
 
-            error_msg = f"**Configuration Error:** Column '{source_col}' not found in uploaded file for {target_col}.\n\n"
-            error_msg += f"**Available columns in your file:**\n{', '.join(available_cols)}"
+                # Try to find similar column names (fuzzy matching)
+                similar_cols = [col for col in available_cols if source_col.lower() in col.lower() or col.lower() in source_col.lower()]
 
-            if similar_cols:
-                error_msg += f"\n\n**Did you mean one of these?** {', '.join(similar_cols)}"
+                error_msg = f"**Configuration Error:** Column '{source_col}' not found in uploaded file for {target_col}.\n\n"
+                error_msg += f"**Available columns in your file:**\n{', '.join(available_cols)}"
 
-            if target_col in ['Channel', 'Partner', 'Territory']:
-                error_msg += f"\n\n**To fix this, you have two options:**\n"
-                error_msg += f"1. Upload a file that has a '{source_col}' column, OR\n"
-                error_msg += f"2. Edit the template and select **'✏️ Custom (enter manually)'** to set a hardcoded value"
-            else:
-                error_msg += f"\n\n**To fix this:** Edit the template and map '{target_col}' to the correct column name from your file."
+                if similar_cols:
+                    error_msg += f"\n\n**Did you mean one of these?** {', '.join(similar_cols)}"
 
-            st.error(error_msg)
-            st.stop()
+                if target_col in ['Channel', 'Partner', 'Territory']:
+                    error_msg += f"\n\n**To fix this, you have two options:**\n"
+                    error_msg += f"1. Upload a file that has a '{source_col}' column, OR\n"
+                    error_msg += f"2. Edit the template and select **'✏️ Custom (enter manually)'** to set a hardcoded value"
+                else:
+                    error_msg += f"\n\n**To fix this:** Edit the template and map '{target_col}' to the correct column name from your file."
+
+                # Notes of the columns mapped so far come first, as in serial execution
+                for _, future in column_parts:
+                    show_notes(future.result()[1])
+                st.error(error_msg)
+                st.stop()
+
+        # Assemble in mapping order, so the columns come out as in serial execution
+        column_timings = {}
+        for target_col, future in column_parts:
+            outputs, notes, seconds = future.result()
+            transformed_data.update(outputs)
+            show_notes(notes)
+            if target_col in planned:
+                seconds += group_futures[planned[target_col][0]].result()[1]
+            column_timings[target_col] = seconds
+    finally:
+        if executor:
+            executor.shutdown(wait=True)
+
+    if timings is not None:
+        timings.update(column_timings)
+    if log_timings:
+        print(f"[DEBUG] Column mapping timings ({num_rows:,} rows, {max_workers} worker(s)): " + ", ".join(
+            f"{target_col} {seconds:.3f}s" for target_col, seconds
+            in sorted(column_timings.items(), key=lambda item: -item[1])
+        ))
 
     # Create dataframe from transformed data
     result_df = pd.DataFrame(transformed_data)
@@ -23,6 +23,78 @@ class Config:
     # Lambda invocation flag - set to False to disable Lambda calls
     ENABLE_LAMBDA = False  # TODO: Set to True when ready to enable Lambda
 
+    # Render INSERT VALUES with the column-wise encoders (src/sql_encoders.py)
+    # instead of the row-at-a-time renderer. Output is identical (tests/test_sql_encoders.py);
+    # see find_renderer_mismatches() to verify on a real file before enabling.
+    USE_COLUMN_ENCODERS = False
+
+    # How load_to_platform_viewership ships rows: 'values' (multi-row INSERT batches),
+    # 'copy' (gzipped CSV files PUT to the table stage, then COPY INTO) or
+    # 'arrow' (Parquet files typed from the DDL template; requires pyarrow)
+    LOAD_MODE = 'values'
+
+    # Independent Snowflake sessions a 'values' load spreads its batches across
+    # (1 = serial, committing each batch on the pooled session, resumable via the load manifest).
+    # Above 1, each load logs in that many extra sessions outside SESSION_POOL_SIZE and the
+    # upload is all-or-nothing instead of resumable.
+    LOAD_WORKERS = 1
+
+    # Files the Load Data tab loads at the same time (each on its own pooled session)
+    FILE_LOAD_WORKERS = 2
+
+    # Threads apply_column_mappings spreads its per-column work across (1 = serial).
+    # Only the Arrow/pandas kernels release the GIL, so raise this on multi-core hosts
+    # for templates dominated by vectorized date, time and string transformations.
+    COLUMN_MAPPING_WORKERS = 1
+
+    # Snowflake sessions shared by all app users (src/snowflake_utils.py SnowflakeSessionPool).
+    # Every SnowflakeConnection call borrows one, so concurrent users do not block each other.
+    # Idle sessions are closed after SESSION_IDLE_TIMEOUT seconds and pinged before reuse
+    # once idle for SESSION_KEEPALIVE_INTERVAL seconds.
+    SESSION_POOL_SIZE = 8
+    SESSION_IDLE_TIMEOUT = 600
+    SESSION_KEEPALIVE_INTERVAL = 300
+
+    # Seconds after the last successful Snowflake query before is_connected() probes
+    # with SELECT 1 again (until then, reruns trust the recent success)
+    LIVENESS_PROBE_INTERVAL = 60
+
+    # Keep parsed template lookups in memory (src/template_cache.py). Each lookup still
+    # checks MAX(updated_date) and COUNT(*) of the configs table, so edits from other
+    # sessions are seen immediately.
+    TEMPLATE_CACHE = True
+
+    # Load each file into a temporary table and move it into platform_viewership
+    # with one INSERT ... SELECT, so an upload lands completely or not at all
+    ATOMIC_LOAD = False
+
+    # Statement limits used to size INSERT ... VALUES batches (src/batch_sizer.py).
+    # Rows per batch stay under both; within them the size adapts to measured speed.
+    MAX_STATEMENT_EXPRESSIONS = 200000
+    MAX_STATEMENT_BYTES = 8 * 1024 * 1024
+
+    # Uploads at least this large are read, transformed and loaded chunk by chunk
+    # (src/upload_pipeline.py) instead of being held in memory as one DataFrame.
+    # Excel and wide-format files are always read whole.
+    STREAM_UPLOAD_MIN_BYTES = 50 * 1024 * 1024
+    STREAM_CHUNK_ROWS = 50000
+
+    # Worker processes the Load Data tab scans a multi-file upload with
+    # (src/upload_pipeline.py survey_uploads; 1 = one file after another in the script thread)
+    SURVEY_WORKERS = 4
+
+    # Re-uploads of the same PLATFORM + FILENAME replace only the rows that changed,
+    # matched by the ROW_HASH fingerprint stored with every row (src/row_delta.py).
+    # Requires the ROW_HASH column: run sql/templates/ALTER_ADD_ROW_HASH.sql first.
+    DELTA_LOAD = False
+
+    # Where committed batches of serial (per-batch commit) loads are recorded so a retry
+    # of an interrupted upload resumes after them (src/load_manifest.py):
+    # 'local' (JSON files in LOAD_MANIFEST_DIR), 'table' (load_manifests control table)
+    # or None to always reload from scratch
+    LOAD_MANIFEST_STORE = 'local'
+    LOAD_MANIFEST_DIR = os.path.join(os.path.expanduser('~'), '.viewership_uploader', 'load_manifests')
+
 
 class DevelopmentConfig(Config):
     """Development environment configuration"""
@@ -44,8 +44,15 @@ st.subheader("Filters")
 
 col1, col2, col3, col4, col5 = st.columns(5)
 
+
+def run_query(sql):
+    """Run a read-only query on a session borrowed from the connection's pool"""
+    with conn.session() as session:
+        session.cursor.execute(sql)
+        return session.cursor.fetchall()
+
+
 # Determine table names based on environment
-cursor = conn.cursor
 if env_name == "PRODUCTION":
     staging_table = "NOSEY_PROD.PUBLIC.platform_viewership"
     final_table = "STAGING_ASSETS.PUBLIC.EPISODE_DETAILS"
@@ -56,8 +63,7 @@ else:
 with col1:
     # Get available platforms
     try:
-        cursor.execute(f"SELECT DISTINCT platform FROM {staging_table} WHERE platform IS NOT NULL ORDER BY platform")
-        platforms = [row[0] for row in cursor.fetchall()]
+        platforms = [row[0] for row in run_query(f"SELECT DISTINCT platform FROM {staging_table} WHERE platform IS NOT NULL ORDER BY platform")]
         platform = st.selectbox("Platform", options=["All"] + platforms)
     except Exception as e:
         st.error(f"Error loading platforms: {str(e)}")
@@ -66,8 +72,7 @@ with col1:
 with col2:
     # Get available partners
     try:
-        cursor.execute(f"SELECT DISTINCT partner FROM {staging_table} WHERE partner IS NOT NULL ORDER BY partner")
-        partners = [row[0] for row in cursor.fetchall()]
+        partners = [row[0] for row in run_query(f"SELECT DISTINCT partner FROM {staging_table} WHERE partner IS NOT NULL ORDER BY partner")]
         partner = st.selectbox("Partner", options=["All"] + partners)
     except Exception as e:
         st.error(f"Error loading partners: {str(e)}")
@@ -76,8 +81,7 @@ with col2:
 with col3:
     # Get available channels
     try:
-        cursor.execute(f"SELECT DISTINCT channel FROM {staging_table} WHERE channel IS NOT NULL ORDER BY channel")
-        channels = [row[0] for row in cursor.fetchall()]
+        channels = [row[0] for row in run_query(f"SELECT DISTINCT channel FROM {staging_table} WHERE channel IS NOT NULL ORDER BY channel")]
         channel = st.selectbox("Channel", options=["All"] + channels)
     except Exception as e:
         st.error(f"Error loading channels: {str(e)}")
@@ -86,8 +90,7 @@ with col3:
 with col4:
     # Get available years
     try:
-        cursor.execute(f"SELECT DISTINCT year FROM {staging_table} WHERE year IS NOT NULL ORDER BY year DESC")
-        years = [row[0] for row in cursor.fetchall()]
+        years = [row[0] for row in run_query(f"SELECT DISTINCT year FROM {staging_table} WHERE year IS NOT NULL ORDER BY year DESC")]
         year = st.selectbox("Year", options=["All"] + [str(y) for y in years])
     except Exception as e:
         st.error(f"Error loading years: {str(e)}")
@@ -96,8 +99,7 @@ with col4:
 with col5:
     # Get available quarters
     try:
-        cursor.execute(f"SELECT DISTINCT quarter FROM {staging_table} WHERE quarter IS NOT NULL ORDER BY quarter")
-        quarters = [row[0] for row in cursor.fetchall()]
+        quarters = [row[0] for row in run_query(f"SELECT DISTINCT quarter FROM {staging_table} WHERE quarter IS NOT NULL ORDER BY quarter")]
         quarter = st.selectbox("Quarter", options=["All"] + [str(q) for q in quarters])
     except Exception as e:
         st.error(f"Error loading quarters: {str(e)}")
@@ -142,8 +144,7 @@ if st.button("🔎 Check for Discrepancies", type="primary"):
                 ORDER BY platform, partner, channel, year, quarter, month
             """
 
-            cursor.execute(staging_query)
-            staging_results = cursor.fetchall()
+            staging_results = run_query(staging_query)
             staging_df = pd.DataFrame(
                 staging_results,
                 columns=['platform', 'partner', 'channel', 'year', 'quarter', 'month', 'record_count', 'staging_tot_hov']
@@ -166,8 +167,7 @@ if st.button("🔎 Check for Discrepancies", type="primary"):
                 ORDER BY platform, partner, channel, year, quarter, month
             """
 
-            cursor.execute(final_query)
-            final_results = cursor.fetchall()
+            final_results = run_query(final_query)
             final_df = pd.DataFrame(
                 final_results,
                 columns=['platform', 'partner', 'channel', 'year', 'quarter', 'month', 'record_count', 'final_hours']
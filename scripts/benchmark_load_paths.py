@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Benchmark the platform_viewership load paths on the files in sample_data/
+
+Each sample CSV is read the way the Load Data tab reads it (header detection,
+empty-row removal, wide-to-long transformation), shaped into platform_viewership
+columns, repeated up to --rows rows and then prepared by each load path:
+
+    values  multi-row INSERT ... VALUES statements (16k rows per statement)
+    copy    gzipped CSV files for PUT + COPY INTO
+    arrow   Arrow tables typed from the DDL template, written as Parquet
+
+By default only the client-side work is measured (time, peak Python memory and
+payload size). With --live the rows are also loaded into the configured
+platform_viewership table under a throwaway FILENAME and deleted afterwards.
+
+Usage:
+    python scripts/benchmark_load_paths.py [--rows 200000] [--modes values,copy,arrow] [--live]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+
+# Add parent directory to path to import config and src
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd
+
+from src.logo_detection import detect_header_row
+from src.sql_encoders import render_rows
+from src.stage_loader import write_batch_file, write_parquet_file
+from src.viewership_schema import to_arrow_table
+from src.wide_format_handler import detect_and_transform
+
+VALUES_BATCH_SIZE = 16000
+FILE_BATCH_SIZE = 250000
+
+# Target columns assigned to source columns, by kind, in order
+STRING_COLUMNS = ['PLATFORM_CONTENT_NAME', 'PLATFORM_SERIES', 'PLATFORM_CONTENT_ID', 'PLATFORM_CHANNEL_NAME',
+                  'PLATFORM_TERRITORY', 'PLATFORM_PARTNER_NAME', 'DEVICE_TYPE', 'COUNTRY', 'CITY',
+                  'LANGUAGE', 'REF_ID', 'SERIES_CODE']
+NUMERIC_COLUMNS = ['TOT_HOV', 'TOT_MOV', 'REVENUE', 'DURATION', 'AVG_DURATION_PER_SESSION',
+                   'AVG_DURATION_PER_VIEWER', 'AVG_SESSION_COUNT', 'CHANNEL_ADPOOL_REVENUE']
+
+
+def read_sample(path):
+    """Read a sample CSV the way the Load Data tab does"""
+    encoding = None
+    with open(path, 'rb') as f:
+        if f.read(2) in (b'\xff\xfe', b'\xfe\xff'):
+            encoding = 'utf-16'
+    sep = '\t' if encoding == 'utf-16' else ','
+
+    df_peek = pd.read_csv(path, header=None, nrows=15, encoding=encoding, sep=sep)
+    header_row = detect_header_row(df_peek)
+    df = pd.read_csv(path, header=header_row, encoding=encoding, sep=sep)
+    df.columns = df.columns.astype(str).str.strip()
+    df = df.dropna(how='all')
+    with open(path, 'rb') as f:
+        df, _, _ = detect_and_transform(df, file_buffer=f, file_type='csv')
+    return df
+
+
+def shape_for_viewership(df, filename):
+    """
+    Give a sample file platform_viewership columns while keeping its value mix:
+    the first date-like column becomes DATE, numeric columns become float metrics
+    and everything else becomes text columns.
+    """
+    shaped = {'PLATFORM': ['Benchmark'] * len(df), 'FILENAME': [filename] * len(df)}
+    strings, numerics = iter(STRING_COLUMNS), iter(NUMERIC_COLUMNS)
+    for col in df.columns:
+        values = df[col]
+        if 'DATE' not in shaped and 'date' in col.lower():
+            parsed = pd.to_datetime(values, errors='coerce', format='mixed')
+            if parsed.notna().mean() > 0.9:
+                shaped['DATE'] = parsed.dt.strftime('%Y-%m-%d').where(parsed.notna(), None)
+                continue
+        numeric = pd.to_numeric(values.astype(str).str.replace(r'[$,]', '', regex=True), errors='coerce')
+        if numeric.notna().sum() >= values.notna().sum() * 0.9 and values.notna().any():
+            target = next(numerics, None)
+            if target:
+                shaped[target] = numeric
+            continue
+        target = next(strings, None)
+        if target:
+            shaped[target] = values.where(values.notna(), None)
+    return pd.DataFrame(shaped)
+
+
+def repeat_to(df, rows):
+    """Repeat a frame until it has at least `rows` rows"""
+    copies = max(1, -(-rows // max(len(df), 1)))
+    return pd.concat([df] * copies, ignore_index=True).iloc[:rows]
+
+
+def prepare_values(df, tmp_dir):
+    size = 0
+    column_names = ', '.join(df.columns)
+    for i in range(0, len(df), VALUES_BATCH_SIZE):
+        sql = f"INSERT INTO platform_viewership ({column_names}) VALUES {', '.join(render_rows(df.iloc[i:i + VALUES_BATCH_SIZE]))}"
+        size += len(sql.encode('utf-8'))
+    return size
+
+
+def prepare_copy(df, tmp_dir):
+    size = 0
+    for n, i in enumerate(range(0, len(df), FILE_BATCH_SIZE)):
+        path = write_batch_file(df.iloc[i:i + FILE_BATCH_SIZE], tmp_dir, f"batch_{n:05d}.csv.gz")
+        size += os.path.getsize(path)
+    return size
+
+
+def prepare_arrow(df, tmp_dir):
+    size = 0
+    for n, i in enumerate(range(0, len(df), FILE_BATCH_SIZE)):
+        path = write_parquet_file(to_arrow_table(df.iloc[i:i + FILE_BATCH_SIZE]), tmp_dir, f"batch_{n:05d}.parquet")
+        size += os.path.getsize(path)
+    return size
+
+
+PREPARERS = {'values': prepare_values, 'copy': prepare_copy, 'arrow': prepare_arrow}
+
+
+def measure(mode, df):
+    """Time one load path's client-side work and record peak traced memory"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tracemalloc.start()
+        start = time.perf_counter()
+        size = PREPARERS[mode](df, tmp_dir)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return elapsed, peak, size
+
+
+def measure_live(sf_conn, mode, df):
+    """Load into platform_viewership with one path, then delete the benchmark rows"""
+    filename = f"benchmark_{mode}_{uuid.uuid4().hex[:8]}"
+    df = df.assign(FILENAME=filename)
+    start = time.perf_counter()
+    try:
+        loaded = sf_conn.load_to_platform_viewership(df, load_mode=mode)
+        return time.perf_counter() - start, loaded
+    finally:
+        with sf_conn.session() as session:
+            session.cursor.execute(
+                f"DELETE FROM {sf_conn.database}.{sf_conn.schema}.platform_viewership "
+                f"WHERE PLATFORM = 'Benchmark' AND FILENAME = '{filename}'"
+            )
+            session.conn.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200000, help='Rows per sample file after repetition')
+    parser.add_argument('--modes', default='values,copy,arrow', help='Comma-separated load paths to compare')
+    parser.add_argument('--live', action='store_true', help='Also load into Snowflake (rows are deleted afterwards)')
+    args = parser.parse_args()
+    modes = [m.strip() for m in args.modes.split(',') if m.strip()]
+
+    sf_conn = None
+    if args.live:
+        from src.snowflake_utils import SnowflakeConnection
+        sf_conn = SnowflakeConnection()
+
+    paths = sorted(glob.glob(os.path.join(ROOT, 'sample_data', '**', '*.csv'), recursive=True))
+    for path in paths:
+        name = os.path.relpath(path, os.path.join(ROOT, 'sample_data'))
+        try:
+            df = shape_for_viewership(read_sample(path), os.path.basename(path))
+        except Exception as e:
+            print(f"\n{name}: skipped ({e})")
+            continue
+        if df.empty:
+            print(f"\n{name}: skipped (no rows)")
+            continue
+        df = repeat_to(df, args.rows)
+
+        print(f"\n{name}: {len(df):,} rows x {len(df.columns)} columns")
+        for mode in modes:
+            elapsed, peak, size = measure(mode, df)
+            line = f"  {mode:<7} prepare {elapsed:7.2f}s  peak {peak / 1e6:8.1f} MB  payload {size / 1e6:8.1f} MB"
+            if sf_conn:
+                load_elapsed, loaded = measure_live(sf_conn, mode, df)
+                line += f"  load {load_elapsed:7.2f}s ({loaded:,} rows)"
+            print(line)
+
+    if sf_conn:
+        sf_conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark surveying a multi-file upload one file at a time and in worker processes
+
+The files matching --pattern in sample_data/ (by default the six-file Roku
+Oct-Dec drop) are surveyed the way the Load Data tab does it: with
+survey_uploads() using one worker (in order, in this process) and using
+--workers processes. Both runs must produce the same surveys; the script
+reports the time until each file's summary is available.
+
+Usage:
+    python scripts/benchmark_survey_uploads.py [--workers 4] [--pattern 'viewership/Roku * Oct-Dec.csv']
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import os
+import sys
+import time
+
+# Add parent directory to path to import config and src
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.upload_pipeline import survey_uploads
+
+
+def run(files, workers):
+    """(index -> survey or error, index -> seconds until ready, total seconds)"""
+    results, ready = {}, {}
+    start = time.perf_counter()
+    # The wide-format handler reports its steps with print()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for idx, survey, error in survey_uploads(files, max_workers=workers):
+            results[idx] = survey if error is None else error
+            ready[idx] = time.perf_counter() - start
+    return results, ready, time.perf_counter() - start
+
+
+def same_survey(a, b):
+    if isinstance(a, Exception) or isinstance(b, Exception):
+        return type(a) is type(b) and str(a) == str(b)
+    return (a['preview'].equals(b['preview']) and list(a['preview'].dtypes) == list(b['preview'].dtypes)
+            and {k: v for k, v in a.items() if k != 'preview'} == {k: v for k, v in b.items() if k != 'preview'})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=4, help='Worker processes for the parallel run')
+    parser.add_argument('--pattern', default=os.path.join('viewership', 'Roku * Oct-Dec.csv'),
+                        help='Glob under sample_data/ selecting the uploaded files')
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(ROOT, 'sample_data', args.pattern)))
+    if not paths:
+        print(f"No files match {args.pattern}")
+        sys.exit(1)
+    files = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            files.append((io.BytesIO(f.read()), os.path.basename(path)))
+    print(f"{len(files)} files, {os.cpu_count()} CPU(s)")
+
+    serial, serial_ready, serial_time = run(files, 1)
+    parallel, parallel_ready, parallel_time = run(files, args.workers)
+
+    mismatches = 0
+    for idx, (_, name) in enumerate(files):
+        identical = same_survey(serial[idx], parallel[idx])
+        mismatches += not identical
+        print(f"  {name[:44]:<44} ready after serial {serial_ready[idx]:6.2f}s  "
+              f"parallel {parallel_ready[idx]:6.2f}s{'' if identical else '  MISMATCH'}")
+    print(f"  {'all files':<44} serial {serial_time:6.2f}s  parallel {parallel_time:6.2f}s  "
+          f"x{serial_time / max(parallel_time, 1e-9):5.1f}")
+
+    if mismatches:
+        print(f"\n{mismatches} file(s) produced different surveys")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
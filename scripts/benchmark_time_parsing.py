@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark parse_time (TimeFormatTransformation) on the Roku watch-time columns
+
+The STREAMING_HOURS_SUM column of each Roku sample in sample_data/viewership/ is
+repeated up to --rows rows and rendered the ways watch time arrives in uploads:
+as text numbers ('9241.15'), as 'h:mm:ss' and as 'mm:ss'. Each rendering is parsed
+row by row with apply() and with the vectorized apply_series(), for both output
+units. Both results must be identical; the script reports the time of each and
+the speed-up.
+
+Usage:
+    python scripts/benchmark_time_parsing.py [--rows 1000000]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+# Add parent directory to path to import config and src
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import pandas as pd
+
+from benchmark_load_paths import read_sample, repeat_to
+from src.transformations import TimeFormatTransformation
+
+WATCH_TIME_COLUMN = 'STREAMING_HOURS_SUM'
+
+
+def renderings(hours: pd.Series) -> dict:
+    """Watch-time values as text in the formats parse_time accepts"""
+    seconds = (hours.fillna(0) * 3600).round().astype(np.int64)
+    h, m, s = seconds // 3600, seconds // 60 % 60, seconds % 60
+    text = hours.astype(str).where(hours.notna(), '')
+    return {
+        'number': text,
+        'h:mm:ss': h.astype(str) + ':' + m.astype(str).str.zfill(2) + ':' + s.astype(str).str.zfill(2),
+        'mm:ss': (seconds // 60).astype(str) + ':' + s.astype(str).str.zfill(2),
+    }
+
+
+def measure(series: pd.Series, transform: TimeFormatTransformation):
+    start = time.perf_counter()
+    expected = series.apply(transform.apply)
+    row_wise_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = transform.apply_series(series)
+    vectorized_time = time.perf_counter() - start
+
+    return row_wise_time, vectorized_time, expected.equals(actual)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000000, help='Rows per sample file after repetition')
+    args = parser.parse_args()
+
+    mismatches = 0
+    paths = sorted(glob.glob(os.path.join(ROOT, 'sample_data', 'viewership', 'Roku*.csv')))
+    for path in paths:
+        name = os.path.basename(path)
+        try:
+            df = read_sample(path)
+        except Exception as e:
+            print(f"\n{name}: skipped ({e})")
+            continue
+        if WATCH_TIME_COLUMN not in df.columns:
+            print(f"\n{name}: skipped (no {WATCH_TIME_COLUMN} column)")
+            continue
+
+        hours = pd.to_numeric(repeat_to(df, args.rows)[WATCH_TIME_COLUMN], errors='coerce')
+        print(f"\n{name}: {len(hours):,} rows")
+        for label, series in renderings(hours).items():
+            for unit in ('hours', 'minutes'):
+                row_wise_time, vectorized_time, identical = measure(series, TimeFormatTransformation(unit))
+                mismatches += not identical
+                print(f"  {label:<8} -> {unit:<8} row-wise {row_wise_time:6.2f}s  vectorized {vectorized_time:6.2f}s  "
+                      f"x{row_wise_time / max(vectorized_time, 1e-9):5.1f}{'' if identical else '  MISMATCH'}")
+
+    if mismatches:
+        print(f"\n{mismatches} case(s) produced different results")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
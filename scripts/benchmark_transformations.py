@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark compiled transformation plans against row-wise execution
+
+Columns of the sample CSVs in sample_data/ are repeated up to --rows rows and
+transformed twice: row by row with preview_transformation_step (how
+apply_transformation used to run) and with the compiled plan that
+apply_transformation now uses. Both results must be identical; the script
+reports the time of each and the speed-up.
+
+Usage:
+    python scripts/benchmark_transformations.py [--rows 1000000]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+# Add parent directory to path to import config and src
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd
+
+from benchmark_load_paths import read_sample, repeat_to
+from src.transformation_plan import arrow_available, compile_transformation
+from src.transformations import TRANSFORMATION_TEMPLATES, preview_transformation_step
+
+# Text columns / numeric-looking columns benchmarked per file
+TEXT_COLUMNS_PER_FILE = 2
+NUMERIC_COLUMNS_PER_FILE = 1
+
+DUAL_FORMAT_TEMPLATES = [name for name in TRANSFORMATION_TEMPLATES if 'Dual Format' in name]
+
+
+def row_wise(series, config):
+    """Reference result: every step run per value"""
+    steps = config['steps'] if config.get('type') == 'chain' else [config]
+
+    def apply_steps(value):
+        for step in steps:
+            value = preview_transformation_step(value, step)
+        return value
+    return series.apply(apply_steps)
+
+
+def text_cases(series):
+    """Configs exercising the string steps on a text column"""
+    common = series.dropna().astype(str).str.strip().value_counts().index[:5].tolist()
+    return {
+        'trim_ends': {'type': 'trim_ends'},
+        'split+extract_index+remove_prefix': {'type': 'chain', 'steps': [
+            {'type': 'split', 'params': {'delimiter': ' '}},
+            {'type': 'extract_index', 'params': {'index': 1}},
+            {'type': 'remove_prefix', 'params': {'prefix': 'S'}},
+        ]},
+        'split_extract': {'type': 'split_extract', 'params': {'delimiter': '-', 'index': 0}},
+        'value_map': {'type': 'value_map', 'params': {'mapping': {v: v.upper() for v in common}, 'default': 'OTHER'}},
+    }
+
+
+def combined_column(df, text_columns):
+    """'Channel: ..  Platform: ..  Delivery Region: ..' values built from the file's text"""
+    values = [df[col].astype(str).str.slice(0, 20) for col in (text_columns * 3)[:3]]
+    return 'Channel: ' + values[0] + '  Platform: ' + values[1] + '  Delivery Region: ' + values[2]
+
+
+def measure(series, config):
+    start = time.perf_counter()
+    expected = row_wise(series, config)
+    row_wise_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = compile_transformation(config).run(series)
+    plan_time = time.perf_counter() - start
+
+    return row_wise_time, plan_time, expected.equals(actual)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000000, help='Rows per sample file after repetition')
+    args = parser.parse_args()
+
+    if not arrow_available():
+        print("pyarrow is not installed: plans run row-wise and no speed-up is expected")
+
+    mismatches = 0
+    paths = sorted(glob.glob(os.path.join(ROOT, 'sample_data', '**', '*.csv'), recursive=True))
+    for path in paths:
+        name = os.path.relpath(path, os.path.join(ROOT, 'sample_data'))
+        try:
+            df = read_sample(path)
+        except Exception as e:
+            print(f"\n{name}: skipped ({e})")
+            continue
+        if df.empty:
+            print(f"\n{name}: skipped (no rows)")
+            continue
+        df = repeat_to(df, args.rows)
+
+        text_columns = [col for col in df.columns if df[col].dtype == object][:TEXT_COLUMNS_PER_FILE]
+        numeric_columns = [col for col in df.columns if col not in text_columns][:NUMERIC_COLUMNS_PER_FILE]
+
+        cases = []
+        for col in text_columns:
+            cases += [(col, label, df[col], config) for label, config in text_cases(df[col]).items()]
+        for col in numeric_columns:
+            cases.append((col, 'clean_numeric', df[col], {'type': 'clean_numeric', 'params': {'decimal_places': 2}}))
+        if text_columns:
+            combined = combined_column(df, text_columns)
+            cases += [('<combined>', template, combined, TRANSFORMATION_TEMPLATES[template])
+                      for template in DUAL_FORMAT_TEMPLATES]
+
+        print(f"\n{name}: {len(df):,} rows")
+        for col, label, series, config in cases:
+            row_wise_time, plan_time, identical = measure(series, config)
+            mismatches += not identical
+            print(f"  {str(col)[:24]:<24} {label[:40]:<40} row-wise {row_wise_time:6.2f}s  "
+                  f"plan {plan_time:6.2f}s  x{row_wise_time / max(plan_time, 1e-9):5.1f}"
+                  f"{'' if identical else '  MISMATCH'}")
+
+    if mismatches:
+        print(f"\n{mismatches} case(s) produced different results")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
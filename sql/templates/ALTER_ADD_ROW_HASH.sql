@@ -0,0 +1,29 @@
+-- ==============================================================================
+-- ALTER TABLE: Add ROW_HASH column for delta re-uploads
+-- ==============================================================================
+-- The Streamlit loader stores a fingerprint of every row in ROW_HASH when
+-- DELTA_LOAD is enabled in config.py. A corrected version of a file then only
+-- deletes and inserts the rows whose fingerprints changed.
+-- ==============================================================================
+
+-- IMPORTANT: Must add to BOTH upload_db AND test_staging databases
+-- MOVE_STREAMLIT_DATA_TO_STAGING copies every upload_db column to staging
+
+-- 1. Add to upload_db (where Streamlit loads data)
+ALTER TABLE {{UPLOAD_DB}}.public.platform_viewership
+ADD COLUMN IF NOT EXISTS ROW_HASH VARCHAR(16);
+
+-- 2. Add to test_staging (where Lambda processes data)
+ALTER TABLE {{STAGING_DB}}.public.platform_viewership
+ADD COLUMN IF NOT EXISTS ROW_HASH VARCHAR(16);
+
+-- For production database (uncomment when ready to deploy to prod)
+-- ALTER TABLE upload_db_prod.public.platform_viewership
+-- ADD COLUMN IF NOT EXISTS ROW_HASH VARCHAR(16);
+
+-- Verify the column was added
+SELECT COLUMN_NAME, DATA_TYPE
+FROM {{UPLOAD_DB}}.INFORMATION_SCHEMA.COLUMNS
+WHERE TABLE_SCHEMA = 'PUBLIC'
+  AND TABLE_NAME = 'PLATFORM_VIEWERSHIP'
+  AND COLUMN_NAME = 'ROW_HASH';
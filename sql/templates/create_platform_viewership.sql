@@ -87,6 +87,7 @@ CREATE TABLE IF NOT EXISTS {{UPLOAD_DB}}.public.platform_viewership (
     -- Metadata columns
     FILENAME VARCHAR(500),
     LOAD_TIMESTAMP TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
+    ROW_HASH VARCHAR(16),  -- Row fingerprint written by delta loads (DELTA_LOAD in config.py)
 
     -- Processing tracking columns (used by Lambda post-processing)
     PROCESSED BOOLEAN,  -- NULL = not processed, TRUE = processed
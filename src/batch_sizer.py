@@ -0,0 +1,125 @@
+"""
+Batch Sizer
+Chooses how many rows go into each INSERT ... VALUES statement.
+
+Snowflake rejects statements with more than ~200k expressions and very large
+statement texts, so the row count per batch is capped from the column count and
+the rendered bytes per row. Within those caps the size is tuned from the measured
+execute time of previous batches (hill climbing on rows per second). Every turn-around
+halves the step, so the size settles instead of overshooting and backing off forever.
+"""
+
+import math
+from typing import List, Optional
+
+# Snowflake's limit on expressions in a single statement
+SNOWFLAKE_MAX_EXPRESSIONS = 200000
+
+
+class AdaptiveBatchSizer:
+    """Size INSERT batches from column count, statement bytes and observed throughput"""
+
+    # Multiplier applied when probing a larger or smaller batch size
+    STEP = 1.5
+
+    # Each turn-around halves the step's distance from 1; below this the size is settled
+    MIN_STEP = 1.05
+
+    def __init__(self, num_columns: int, max_expressions: int = SNOWFLAKE_MAX_EXPRESSIONS,
+                 max_statement_bytes: int = 8 * 1024 * 1024, initial_rows: int = 16000,
+                 min_rows: int = 500, headroom: float = 0.8):
+        """
+        Args:
+            num_columns: Columns per row (each rendered value is one expression)
+            max_expressions: Expression limit of one statement
+            max_statement_bytes: Ceiling on the rendered statement size
+            initial_rows: Size of the first batch, before anything is measured
+            min_rows: Smallest batch the tuner will try
+            headroom: Fraction of the expression limit actually used
+        """
+        self.num_columns = max(1, num_columns)
+        self.max_statement_bytes = max_statement_bytes
+        self.min_rows = max(1, min_rows)
+        # Each value is an expression, and so is each row tuple
+        self.max_rows = max(self.min_rows, int(max_expressions * headroom) // (self.num_columns + 1))
+
+        self.bytes_per_row: Optional[float] = None
+        self._last_throughput: Optional[float] = None
+        self._direction = 1
+        self._step = self.STEP
+        self.rows = self._clamp(initial_rows)
+
+    def _clamp(self, rows: float) -> int:
+        """Keep a size within the expression cap, the byte ceiling and the minimum"""
+        cap = self.max_rows
+        if self.bytes_per_row:
+            cap = min(cap, int(self.max_statement_bytes / self.bytes_per_row))
+        return int(max(self.min_rows, min(cap, rows)))
+
+    @property
+    def settled(self) -> bool:
+        """True once tuning has stopped (the size only follows the byte ceiling from then on)"""
+        return self._step < self.MIN_STEP
+
+    def next_size(self) -> int:
+        """Rows to put in the next batch"""
+        return self.rows
+
+    def estimate_batches(self, remaining_rows: int) -> int:
+        """Batches still needed at the current size"""
+        return math.ceil(remaining_rows / self.rows) if remaining_rows > 0 else 0
+
+    def split_rendered(self, values_list: List[str]) -> List[List[str]]:
+        """
+        Split rendered VALUES tuples into chunks that fit the byte ceiling
+
+        Args:
+            values_list: Rendered "(...)" tuples for one batch
+
+        Returns:
+            One or more lists of tuples; a single list when the batch already fits
+        """
+        chunks, current, size = [], [], 0
+        for values in values_list:
+            length = len(values) + 2
+            if current and size + length > self.max_statement_bytes:
+                chunks.append(current)
+                current, size = [], 0
+            current.append(values)
+            size += length
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def record(self, rows: int, statement_bytes: int, seconds: float):
+        """
+        Feed back one executed batch and pick the next size
+
+        Args:
+            rows: Rows in the batch
+            statement_bytes: Rendered size of the statement(s)
+            seconds: Time spent rendering and executing the batch
+        """
+        if rows <= 0:
+            return
+        observed = statement_bytes / rows
+        self.bytes_per_row = observed if self.bytes_per_row is None else 0.5 * (self.bytes_per_row + observed)
+
+        if self.settled:
+            self.rows = self._clamp(self.rows)
+            return
+
+        throughput = rows / seconds if seconds > 0 else None
+        if throughput is not None and self._last_throughput is not None and throughput < self._last_throughput:
+            # The last move made things slower: turn around with a smaller step
+            self._direction = -self._direction
+            self._step = 1 + (self._step - 1) / 2
+        if throughput is not None:
+            self._last_throughput = throughput
+
+        step = self._step if self._direction > 0 else 1 / self._step
+        new_rows = self._clamp(self.rows * step)
+        if new_rows == self.rows:
+            # Pinned at a cap: the best size within the limits, stop probing
+            self._step = 1.0
+        self.rows = new_rows
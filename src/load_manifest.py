@@ -0,0 +1,208 @@
+"""
+Load Manifest
+Records which batches of an upload have been committed, so a retry can resume.
+
+A manifest belongs to one upload slice (target table + PLATFORM + FILENAME). Each
+committed batch is recorded with its row range, a content hash and the Snowflake
+query ID that wrote it. When the same file is loaded again after a failure, the
+batches whose hashes still match are skipped and loading continues from the first
+missing row. Manifests are kept in a local JSON directory or in a small control
+table, and are removed once the upload completes.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+
+def batch_hash(batch: pd.DataFrame) -> str:
+    """
+    Content hash of a batch (column names and values, independent of the index)
+
+    Args:
+        batch: Rows of one batch
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256('\x1f'.join(map(str, batch.columns)).encode('utf-8'))
+    if len(batch):
+        digest.update(pd.util.hash_pandas_object(batch, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def manifest_key(table_name: str, platform, filename) -> str:
+    """Stable identifier of the upload slice a manifest belongs to"""
+    return hashlib.sha1(f"{table_name}|{platform}|{filename}".encode('utf-8')).hexdigest()
+
+
+class LocalManifestStore:
+    """Keep manifests as JSON files in a local directory"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def load(self, key: str) -> Optional[Dict]:
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            # A truncated manifest cannot be trusted; start over
+            return None
+
+    def save(self, key: str, data: Dict):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self._path(key) + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self._path(key))
+
+    def delete(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+class TableManifestStore:
+    """Keep manifests in a Snowflake control table (survives app restarts)"""
+
+    def __init__(self, conn, table_name: str):
+        """
+        Args:
+            conn: Snowflake connection used for the control table
+            table_name: Fully qualified control table name
+        """
+        self.conn = conn
+        self.cursor = conn.cursor()
+        self.table_name = table_name
+        self.cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table_name} (
+                manifest_key VARCHAR(64) PRIMARY KEY,
+                manifest VARIANT NOT NULL,
+                updated_date TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
+            )
+        """)
+        self.conn.commit()
+
+    def load(self, key: str) -> Optional[Dict]:
+        self.cursor.execute(f"SELECT manifest FROM {self.table_name} WHERE manifest_key = %s", (key,))
+        row = self.cursor.fetchone()
+        if not row:
+            return None
+        return json.loads(row[0]) if isinstance(row[0], str) else row[0]
+
+    def save(self, key: str, data: Dict):
+        self.cursor.execute(f"""
+            MERGE INTO {self.table_name} t
+            USING (SELECT %s AS manifest_key, PARSE_JSON(%s) AS manifest) s
+            ON t.manifest_key = s.manifest_key
+            WHEN MATCHED THEN UPDATE SET manifest = s.manifest, updated_date = CURRENT_TIMESTAMP()
+            WHEN NOT MATCHED THEN INSERT (manifest_key, manifest) VALUES (s.manifest_key, s.manifest)
+        """, (key, json.dumps(data)))
+        self.conn.commit()
+
+    def delete(self, key: str):
+        self.cursor.execute(f"DELETE FROM {self.table_name} WHERE manifest_key = %s", (key,))
+        self.conn.commit()
+
+
+class LoadManifest:
+    """Committed batches of one upload slice"""
+
+    def __init__(self, store, table_name: str, platform, filename, columns: List[str]):
+        """
+        Open the manifest of an upload slice, keeping previously recorded batches
+        only when they were written with the same columns
+
+        Args:
+            store: LocalManifestStore or TableManifestStore
+            table_name: Fully qualified target table
+            platform: PLATFORM of the upload
+            filename: FILENAME of the upload
+            columns: Columns being loaded
+        """
+        self.store = store
+        self.key = manifest_key(table_name, platform, filename)
+        self.data = {
+            'table': table_name,
+            'platform': str(platform),
+            'filename': str(filename),
+            'columns': list(columns),
+            'created': datetime.now().isoformat(),
+            'batches': [],
+        }
+
+        existing = store.load(self.key)
+        if existing and existing.get('columns') == self.data['columns']:
+            self.data = existing
+
+    @property
+    def batches(self) -> List[Dict]:
+        return self.data['batches']
+
+    @property
+    def committed_rows(self) -> int:
+        """Rows covered by the recorded batches"""
+        return sum(batch['rows'] for batch in self.batches)
+
+    def matched_rows(self, df: pd.DataFrame, offset: int = 0) -> Optional[int]:
+        """
+        Rows at the start of df that recorded batches cover with matching content
+
+        Args:
+            df: Rows being loaded (a whole upload, or one chunk of it)
+            offset: Position of df's first row within the upload
+
+        Returns:
+            Number of leading rows of df already committed, or None when a recorded
+            batch inside df's range no longer matches (the file changed)
+        """
+        end = offset + len(df)
+        matched = 0
+        for batch in self.batches:
+            start = batch['start']
+            if start + batch['rows'] <= offset or start >= end:
+                continue
+            if start < offset or start + batch['rows'] > end:
+                # A batch straddling df's boundaries was cut differently
+                return None
+            if batch_hash(df.iloc[start - offset:start - offset + batch['rows']]) != batch['hash']:
+                return None
+            matched = start - offset + batch['rows']
+        return matched
+
+    def record(self, batch: pd.DataFrame, query_id: Optional[str] = None):
+        """
+        Record a committed batch (it starts where the previous one ended)
+
+        Args:
+            batch: Rows of the batch
+            query_id: Snowflake query ID of the statement that wrote it
+        """
+        self.batches.append({
+            'start': self.committed_rows,
+            'rows': len(batch),
+            'hash': batch_hash(batch),
+            'query_id': query_id,
+            'committed_at': datetime.now().isoformat(),
+        })
+        self.store.save(self.key, self.data)
+
+    def reset(self):
+        """Forget recorded batches (the slice is being reloaded from scratch)"""
+        self.data['batches'] = []
+        self.store.delete(self.key)
+
+    def complete(self):
+        """The upload finished; nothing is left to resume"""
+        self.store.delete(self.key)
@@ -0,0 +1,293 @@
+"""
+Load Verification
+Checks that the platform_viewership slice written by an upload matches what was sent.
+
+The slice is the unprocessed rows for the upload's PLATFORM and FILENAME (the loader
+clears stale rows for that pair first, so the slice is exactly this upload). Row count,
+metric sums and a content checksum computed from the DataFrame are compared with the
+same aggregates computed by Snowflake over the slice.
+
+The content checksum is the sum over rows of MD5_NUMBER_LOWER64 of the row's text
+columns, so a changed, swapped or truncated value changes it (not only a change in
+total length), and chunks of one upload combine by addition.
+"""
+
+import hashlib
+import math
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from src.sql_encoders import encode_columns
+
+# Metric columns whose sums are compared
+SUM_COLUMNS = ['TOT_HOV', 'TOT_MOV', 'REVENUE']
+
+# Columns hashed into the content checksum, as the text Snowflake stores for them
+CHECKSUM_COLUMNS = ['PLATFORM_CONTENT_ID', 'PLATFORM_CONTENT_NAME', 'PLATFORM_SERIES']
+
+# Checks run against the slice when the upload has the columns they need; the
+# report lists the ones that did not run under 'skipped'
+SLICE_CHECKS = (['record_count'] + [f"{col}_sum" for col in SUM_COLUMNS]
+                + ['date_count', 'date_days', 'content_checksum'])
+
+# Joins the checksum columns of a row before hashing (NULL hashes as '')
+CHECKSUM_SEPARATOR = '|'
+
+# Selects an upload's rows; bind slice_params() for the two placeholders so quotes
+# in a PLATFORM or FILENAME (O'Brien_Q3.csv) cannot break the statement
+SLICE_CONDITION = "PLATFORM = %s AND FILENAME = %s"
+
+# Relative tolerance for float sums (server and client add in different orders)
+SUM_TOLERANCE = 1e-6
+
+
+def _clean_revenue(values: pd.Series) -> pd.Series:
+    """Revenue as the encoders render it: currency formatting stripped, unparseable -> NULL"""
+    as_text = values.where(values.map(lambda v: not isinstance(v, str)),
+                           values.astype(str).str.replace(r'[$, ]', '', regex=True).str.strip())
+    return pd.to_numeric(as_text, errors='coerce')
+
+
+def _stored_text(literals: np.ndarray) -> pd.Series:
+    """Text a VARCHAR column holds for each SQL literal ('' for NULL, as COALESCE(col, '') reads it)"""
+    text = pd.Series(literals, dtype=object)
+    quoted = text.str.startswith("'")
+    text[quoted] = text[quoted].str.slice(1, -1).str.replace("''", "'", regex=False)
+    return text.mask(text.eq('NULL'), '')
+
+
+def _row_checksum(text: str) -> int:
+    """Snowflake MD5_NUMBER_LOWER64: the last 8 bytes of the MD5 digest, unsigned big endian"""
+    return int.from_bytes(hashlib.md5(text.encode('utf-8')).digest()[8:], 'big')
+
+
+def content_checksum(df: pd.DataFrame, text_cols: List[str]) -> int:
+    """
+    Sum of the per-row MD5_NUMBER_LOWER64 of the text columns joined by CHECKSUM_SEPARATOR
+
+    Values are hashed as the text the load writes for them (the encoders' literals), so
+    numeric content IDs are checked as the digits Snowflake stores.
+    """
+    texts = [_stored_text(literals) for literals in encode_columns(df[text_cols])]
+    rows = texts[0]
+    for text in texts[1:]:
+        rows = rows + CHECKSUM_SEPARATOR + text
+    return sum(map(_row_checksum, rows))
+
+
+def checksum_expression(text_cols: List[str]) -> str:
+    """Snowflake expression matching content_checksum() over a slice"""
+    joined = f" || '{CHECKSUM_SEPARATOR}' || ".join(f"COALESCE({col}, '')" for col in text_cols)
+    return f"COALESCE(SUM(MD5_NUMBER_LOWER64({joined})), 0)"
+
+
+def expected_totals(df: pd.DataFrame) -> Dict:
+    """
+    Compute the client-side side of the verification from the transformed DataFrame
+
+    Args:
+        df: DataFrame exactly as passed to load_to_platform_viewership
+
+    Returns:
+        Dictionary with 'record_count', one '<COLUMN>_sum' per metric column present,
+        'date_days' / 'date_count' when DATE is present and 'content_checksum' when any
+        checksum column is present
+    """
+    totals = {'record_count': len(df)}
+
+    for col in SUM_COLUMNS:
+        if col in df.columns:
+            values = _clean_revenue(df[col]) if col == 'REVENUE' else pd.to_numeric(df[col], errors='coerce')
+            totals[f"{col}_sum"] = float(values.sum())
+
+    if 'DATE' in df.columns:
+        # Use the literals the encoders produce, so the dates match what was written
+        literals = pd.Series(encode_columns(df[['DATE']])[0])
+        dates = pd.to_datetime(literals.str.strip("'").where(literals != 'NULL'), format='%Y-%m-%d', errors='coerce')
+        days = (dates - pd.Timestamp('1970-01-01')).dt.days
+        totals['date_count'] = int(days.notna().sum())
+        totals['date_days'] = int(days.sum())
+
+    text_cols = [col for col in CHECKSUM_COLUMNS if col in df.columns]
+    if text_cols:
+        totals['content_checksum'] = content_checksum(df, text_cols)
+
+    return totals
+
+
+def slice_params(platform, filename) -> tuple:
+    """Bound parameters for SLICE_CONDITION"""
+    return (str(platform), str(filename))
+
+
+def verification_query(full_table_name: str, expected: Dict, columns: List[str],
+                       slice_filter: str = "PROCESSED IS NULL") -> str:
+    """
+    Build the aggregate query matching the keys of expected_totals()
+
+    Args:
+        full_table_name: Fully qualified platform_viewership table name
+        expected: Output of expected_totals()
+        columns: Columns of the uploaded DataFrame
+        slice_filter: Condition selecting the upload's rows within PLATFORM + FILENAME
+
+    Returns:
+        SQL returning one row with one column per expected key, in the same order;
+        execute it with slice_params(platform, filename)
+    """
+    selects = []
+    for key in expected:
+        if key == 'record_count':
+            selects.append("COUNT(*)")
+        elif key.endswith('_sum'):
+            selects.append(f"COALESCE(SUM({key[:-4]}), 0)")
+        elif key == 'date_count':
+            selects.append("COUNT(DATE)")
+        elif key == 'date_days':
+            selects.append("COALESCE(SUM(DATEDIFF('day', '1970-01-01'::DATE, DATE)), 0)")
+        elif key == 'content_checksum':
+            selects.append(checksum_expression([col for col in CHECKSUM_COLUMNS if col in columns]))
+
+    return f"""
+        SELECT {', '.join(selects)}
+        FROM {full_table_name}
+        WHERE {SLICE_CONDITION} AND {slice_filter}
+    """
+
+
+def _matches(expected, actual) -> bool:
+    if actual is None:
+        return expected in (0, 0.0)
+    if isinstance(expected, float):
+        return math.isclose(float(actual), expected, rel_tol=SUM_TOLERANCE, abs_tol=0.01)
+    return int(actual) == expected
+
+
+def merge_totals(totals: Dict, more: Dict) -> Dict:
+    """
+    Combine the expected_totals() of two chunks of the same upload
+
+    Keys missing from either side are dropped, since they no longer describe the
+    whole upload (the report then lists those checks as skipped).
+    """
+    if totals is None:
+        return dict(more)
+    return {key: totals[key] + more[key] for key in totals if key in more}
+
+
+def build_report(expected: Dict, rows_loaded: int, platform=None, filename=None, actual: List = None) -> Dict:
+    """
+    Assemble the verification report
+
+    Args:
+        expected: Output of expected_totals() (or merged totals of all chunks)
+        rows_loaded: Rows the loader reports as written
+        platform: PLATFORM of the upload (None when absent)
+        filename: FILENAME of the upload (None when absent)
+        actual: Row returned by verification_query(), or None when no scoped check ran
+
+    Returns:
+        {
+            'verified': True when every check passed,
+            'scoped': True when the checks ran against the PLATFORM/FILENAME slice,
+            'platform', 'filename': slice identifiers (None when absent),
+            'rows_loaded': rows reported by the loader,
+            'record_count': rows in the slice (rows_loaded when not scoped),
+            'tot_hov': hours of viewership (TOT_HOV, or TOT_MOV / 60),
+            'checks': [{'name', 'expected', 'actual', 'ok'}, ...],
+            'skipped': names of SLICE_CHECKS that did not run (missing columns, or
+                every one of them when not scoped)
+        }
+    """
+    sent = expected['record_count']
+    checks = [{'name': 'rows_loaded', 'expected': sent, 'actual': rows_loaded, 'ok': rows_loaded == sent}]
+    if actual is not None:
+        for key, value in zip(expected, actual):
+            checks.append({
+                'name': key,
+                'expected': expected[key],
+                'actual': value.item() if isinstance(value, np.generic) else value,
+                'ok': _matches(expected[key], value),
+            })
+
+    if 'TOT_HOV_sum' in expected:
+        tot_hov = expected['TOT_HOV_sum']
+    elif 'TOT_MOV_sum' in expected:
+        tot_hov = expected['TOT_MOV_sum'] / 60.0
+    else:
+        tot_hov = 0.0
+
+    record_count = actual[0] if actual is not None else rows_loaded
+    return {
+        'verified': all(check['ok'] for check in checks),
+        'scoped': actual is not None,
+        'platform': platform,
+        'filename': filename,
+        'rows_loaded': rows_loaded,
+        'record_count': int(record_count),
+        'tot_hov': float(tot_hov),
+        'skipped': [name for name in SLICE_CHECKS if actual is None or name not in expected],
+        'checks': checks,
+    }
+
+
+def verify_totals(cursor, full_table_name: str, expected: Dict, columns: List[str],
+                  platform, filename, rows_loaded: int, slice_filter: str = "PROCESSED IS NULL") -> Dict:
+    """
+    Verify an upload's slice against totals computed on the client
+
+    Args:
+        cursor: Cursor that can see the written rows (same transaction, or after commit)
+        full_table_name: Fully qualified platform_viewership table name
+        expected: Output of expected_totals() (or merged totals of all chunks)
+        columns: Columns of the uploaded data
+        platform: PLATFORM of the upload (None = no scoped check possible)
+        filename: FILENAME of the upload (None = no scoped check possible)
+        rows_loaded: Rows the loader reports as written
+        slice_filter: Condition selecting the upload's rows within PLATFORM + FILENAME
+
+    Returns:
+        Verification report (see build_report)
+    """
+    if platform is None or filename is None:
+        return build_report(expected, rows_loaded)
+
+    cursor.execute(verification_query(full_table_name, expected, columns, slice_filter),
+                   slice_params(platform, filename))
+    actual = cursor.fetchone()
+    report = build_report(expected, rows_loaded, platform, filename, list(actual))
+
+    failed = [check['name'] for check in report['checks'] if not check['ok']]
+    if failed:
+        print(f"[DEBUG] Verification FAILED for {filename}: {failed} - {report['checks']}")
+    else:
+        print(f"[DEBUG] Verification passed for {filename}: {report['record_count']} rows"
+              + (f" (skipped: {', '.join(report['skipped'])})" if report['skipped'] else ""))
+    return report
+
+
+def upload_scope(df: pd.DataFrame):
+    """(PLATFORM, FILENAME) of an upload, or (None, None) when the columns are absent"""
+    if 'PLATFORM' not in df.columns or 'FILENAME' not in df.columns:
+        return None, None
+    return df['PLATFORM'].iloc[0], df['FILENAME'].iloc[0]
+
+
+def verify_upload(cursor, df: pd.DataFrame, full_table_name: str, rows_loaded: int) -> Dict:
+    """
+    Verify the slice an upload wrote and build its report
+
+    Args:
+        cursor: Cursor that can see the written rows (same transaction, or after commit)
+        df: Uploaded DataFrame
+        full_table_name: Fully qualified platform_viewership table name
+        rows_loaded: Rows the loader reports as written
+
+    Returns:
+        Verification report (see build_report)
+    """
+    platform, filename = upload_scope(df)
+    return verify_totals(cursor, full_table_name, expected_totals(df), df.columns.tolist(),
+                         platform, filename, rows_loaded)
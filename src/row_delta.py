@@ -0,0 +1,77 @@
+"""
+Row Delta
+Row fingerprints for delta re-uploads of platform_viewership files.
+
+Each transformed row is hashed from the SQL literals the loader writes for it, so a
+row hashes the same whenever it would be stored the same. The hash is stored in the
+ROW_HASH column. When a corrected version of a file is uploaded, its hashes are
+compared with the ones already stored for the same PLATFORM + FILENAME, and only
+the difference is deleted and inserted.
+"""
+
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from src.sql_encoders import encode_columns
+
+# Column holding each row's fingerprint
+ROW_HASH_COLUMN = 'ROW_HASH'
+
+
+def row_hashes(df: pd.DataFrame) -> pd.Series:
+    """
+    Fingerprint every row of a transformed DataFrame
+
+    Args:
+        df: Rows as they will be loaded (an existing ROW_HASH column is ignored)
+
+    Returns:
+        Series of 16-character hex strings aligned with df's index
+    """
+    columns = [col for col in df.columns if col != ROW_HASH_COLUMN]
+    literals = pd.DataFrame(
+        dict(zip(columns, encode_columns(df[columns]))) if columns else {},
+        index=df.index
+    )
+    hashed = pd.util.hash_pandas_object(literals, index=False).to_numpy(dtype=np.uint64)
+    return pd.Series([f"{value:016x}" for value in hashed], index=df.index, dtype=object)
+
+
+def plan_delta(hashes: pd.Series, existing: Dict[str, int]) -> Dict:
+    """
+    Work out which rows to delete and insert
+
+    Fingerprints are compared as multisets. When the number of copies of a row
+    changes, all stored copies are deleted and the new copies inserted, because
+    individual identical rows cannot be told apart in the table.
+
+    Args:
+        hashes: Output of row_hashes() for the new version of the file
+        existing: ROW_HASH -> number of stored rows for the previous version
+
+    Returns:
+        {
+            'insert_mask': boolean array selecting the rows of the new file to insert,
+            'delete_hashes': stored fingerprints whose rows must be deleted,
+            'deleted_rows': number of stored rows those fingerprints cover,
+            'unchanged_rows': rows of the new file that are already stored
+        }
+    """
+    new_counts = hashes.value_counts()
+    old_counts = pd.Series(existing, dtype='int64')
+    all_hashes = new_counts.index.union(old_counts.index)
+    new_counts = new_counts.reindex(all_hashes, fill_value=0)
+    old_counts = old_counts.reindex(all_hashes, fill_value=0)
+
+    changed = new_counts != old_counts
+    delete_hashes: List[str] = list(all_hashes[changed & (old_counts > 0)])
+    insert_mask = hashes.isin(set(all_hashes[changed])).to_numpy()
+
+    return {
+        'insert_mask': insert_mask,
+        'delete_hashes': delete_hashes,
+        'deleted_rows': int(old_counts[changed].sum()),
+        'unchanged_rows': int(new_counts[~changed].sum()),
+    }
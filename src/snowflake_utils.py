@@ -1,59 +1,407 @@
 import snowflake.connector
 import streamlit as st
+import functools
 import json
+import os
+import queue
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
 from typing import Dict, List, Optional
 import uuid
 from datetime import datetime
 import pandas as pd
-from config import load_snowflake_config
+from config import load_snowflake_config, get_config
+from src.batch_sizer import AdaptiveBatchSizer
+from src.load_manifest import LoadManifest, LocalManifestStore, TableManifestStore
+from src.row_delta import ROW_HASH_COLUMN, plan_delta, row_hashes
+from src.load_verification import (SLICE_CONDITION, expected_totals, merge_totals, slice_params, upload_scope,
+                                   verify_totals, verify_upload)
+from src.sql_encoders import render_rows, render_rows_rowwise
+from src.template_cache import TemplateCache, template_key
+from src.stage_loader import PARQUET_FILE_FORMAT, TableStage, write_batch_file, write_parquet_file
+from src.viewership_schema import to_arrow_table
+
+# Ways load_to_platform_viewership can ship rows to Snowflake
+LOAD_MODES = ('values', 'copy', 'arrow')
+
+# Rows per staged file in 'copy' and 'arrow' modes
+COPY_BATCH_SIZE = 250000
+
+# Fingerprints per DELETE statement in delta loads
+DELTA_DELETE_BATCH_SIZE = 10000
+
+
+class _TrackedCursor:
+    """
+    Cursor that reports whether each statement completed
+
+    Callers that catch query errors and return a fallback still leave the with-block
+    normally, so the pool learns about failures here rather than from the checkout.
+    """
+
+    def __init__(self, cursor, on_result):
+        self._cursor = cursor
+        self._on_result = on_result
+
+    def _run(self, method, *args, **kwargs):
+        try:
+            result = getattr(self._cursor, method)(*args, **kwargs)
+        except Exception:
+            self._on_result(False)
+            raise
+        self._on_result(True)
+        return self if result is self._cursor else result
+
+    def execute(self, *args, **kwargs):
+        return self._run('execute', *args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        return self._run('executemany', *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class PooledSession:
+    """A pooled Snowflake connection with the cursor used on it"""
+
+    def __init__(self, conn, on_result=None):
+        self.conn = conn
+        self.cursor = conn.cursor() if on_result is None else _TrackedCursor(conn.cursor(), on_result)
+        self.last_used = time.monotonic()
+
+    def close(self):
+        """Close the cursor and connection, ignoring errors"""
+        for closeable in (self.cursor, self.conn):
+            try:
+                closeable.close()
+            except Exception:
+                pass
+
+
+class SnowflakeSessionPool:
+    """
+    Thread-safe pool of Snowflake sessions
+
+    Each checkout gets a session nobody else is using. At most max_size sessions exist
+    at once; further checkouts wait for one to be returned. Sessions idle for longer than
+    idle_timeout are closed, and a session idle for longer than keepalive_interval is
+    pinged before it is handed out (and replaced if the ping fails).
+    """
+
+    def __init__(self, connect, max_size: int = 8, idle_timeout: float = 600.0,
+                 keepalive_interval: float = 300.0, checkout_timeout: float = 120.0):
+        """
+        Args:
+            connect: Callable returning a new, ready-to-use snowflake.connector connection
+            max_size: Maximum number of sessions open at once
+            idle_timeout: Seconds an unused session is kept before it is closed
+            keepalive_interval: Idle seconds after which a session is pinged on checkout
+            checkout_timeout: Seconds to wait for a free session before giving up
+        """
+        self._connect = connect
+        self.max_size = max(1, max_size)
+        self.idle_timeout = idle_timeout
+        self.keepalive_interval = keepalive_interval
+        self.checkout_timeout = checkout_timeout
+
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._idle: List[PooledSession] = []
+        self._in_use = 0
+        self._closed = False
+        # monotonic() time a statement on a pooled cursor last completed
+        # (cleared when one fails)
+        self.last_success: Optional[float] = None
+
+    def _evict_idle(self) -> List[PooledSession]:
+        """Remove sessions idle past idle_timeout (caller holds the lock and closes them)"""
+        cutoff = time.monotonic() - self.idle_timeout
+        expired = [session for session in self._idle if session.last_used < cutoff]
+        if expired:
+            self._idle = [session for session in self._idle if session.last_used >= cutoff]
+        return expired
+
+    @staticmethod
+    def _alive(session: PooledSession) -> bool:
+        try:
+            session.cursor.execute("SELECT 1")
+            session.cursor.fetchone()
+            return True
+        except Exception:
+            return False
+
+    def _take(self) -> PooledSession:
+        """Most recently used healthy idle session, or a new one"""
+        while True:
+            with self._lock:
+                if self._closed:
+                    raise Exception("Snowflake session pool is closed")
+                expired = self._evict_idle()
+                session = self._idle.pop() if self._idle else None
+            for stale in expired:
+                stale.close()
+            if expired:
+                print(f"[DEBUG] Session pool evicted {len(expired)} idle session(s)")
+
+            if session is None:
+                return PooledSession(self._connect(), self._record_result)
+            if time.monotonic() - session.last_used < self.keepalive_interval or self._alive(session):
+                return session
+            session.close()
+
+    def _record_result(self, succeeded: bool):
+        """Called by the pooled cursors after every statement"""
+        self.last_success = time.monotonic() if succeeded else None
+
+    def _give_back(self, session: PooledSession, healthy: bool):
+        """Return a session to the pool, or close it if it cannot be reused"""
+        try:
+            healthy = healthy and not session.conn.is_closed()
+        except Exception:
+            healthy = False
+
+        with self._lock:
+            keep = healthy and not self._closed
+            if keep:
+                session.last_used = time.monotonic()
+                self._idle.append(session)
+            expired = self._evict_idle()
+        if not keep:
+            session.close()
+        for stale in expired:
+            stale.close()
+
+    @contextmanager
+    def checkout(self):
+        """
+        Borrow a session for the duration of a with-block
+
+        An exception inside the block rolls back whatever the session left open before
+        it is returned.
+
+        Yields:
+            PooledSession
+        """
+        if not self._slots.acquire(timeout=self.checkout_timeout):
+            raise Exception(f"No Snowflake session became available within {self.checkout_timeout:.0f}s "
+                            f"(pool size {self.max_size})")
+        try:
+            session = self._take()
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._in_use += 1
+        healthy = True
+        try:
+            yield session
+        except BaseException:
+            try:
+                session.conn.rollback()
+            except Exception:
+                healthy = False
+            raise
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._give_back(session, healthy)
+            self._slots.release()
+
+    def idle_sessions_closed(self) -> bool:
+        """True when an idle session's connection was closed underneath the pool (local check)"""
+        with self._lock:
+            idle = list(self._idle)
+        for session in idle:
+            try:
+                if session.conn.is_closed():
+                    return True
+            except Exception:
+                return True
+        return False
+
+    def reset(self):
+        """Close all idle sessions so the next checkout opens a fresh one"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self.last_success = None
+        for session in idle:
+            session.close()
+
+    def stats(self) -> Dict:
+        """Current pool usage: {'in_use', 'idle', 'max_size'}"""
+        with self._lock:
+            return {'in_use': self._in_use, 'idle': len(self._idle), 'max_size': self.max_size}
+
+    def close(self):
+        """Close idle sessions; sessions still checked out are closed when returned"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for session in idle:
+            session.close()
+
+
+def _pooled(method):
+    """Run a SnowflakeConnection method on a session borrowed from its pool"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.session():
+            return method(self, *args, **kwargs)
+    return wrapper
 
 class SnowflakeConnection:
-    """Handle Snowflake database operations"""
+    """
+    Handle Snowflake database operations
+
+    One instance is shared by every Streamlit user. Each method call borrows its own
+    session from a SnowflakeSessionPool, so concurrent callers never share a cursor;
+    self.conn and self.cursor refer to the session borrowed by the calling thread.
+    """
 
     def __init__(self):
         """Initialize Snowflake connection using environment-aware config"""
         try:
             sf_config = load_snowflake_config()
-            self.conn = snowflake.connector.connect(**sf_config)
-            self.cursor = self.conn.cursor()
             self.database = sf_config['database']  # Store database name
             self.schema = sf_config['schema']  # Store schema name
-
-            # Explicitly set the database and schema context
-            self.cursor.execute(f"USE DATABASE {self.database}")
-            self.cursor.execute(f"USE SCHEMA {self.schema}")
-
-            # Verify the context is set correctly
-            self.cursor.execute("SELECT CURRENT_DATABASE(), CURRENT_SCHEMA()")
-            current_db, current_schema = self.cursor.fetchone()
-            print(f"[DEBUG] Connected to Snowflake - Database: {current_db}, Schema: {current_schema}")
-
-            if current_db != self.database.upper():
-                raise Exception(f"Database context mismatch! Expected {self.database}, got {current_db}")
-
-            self._ensure_table_exists()
+            self._sf_config = sf_config  # Kept for opening extra load sessions from worker threads
+            self._local = threading.local()
+
+            config = get_config()
+            self._pool = SnowflakeSessionPool(
+                self._connect_pooled,
+                max_size=config.SESSION_POOL_SIZE,
+                idle_timeout=config.SESSION_IDLE_TIMEOUT,
+                keepalive_interval=config.SESSION_KEEPALIVE_INTERVAL,
+            )
+            self._template_cache = TemplateCache() if config.TEMPLATE_CACHE else None
+
+            with self.session() as session:
+                # Verify the context is set correctly
+                session.cursor.execute("SELECT CURRENT_DATABASE(), CURRENT_SCHEMA()")
+                current_db, current_schema = session.cursor.fetchone()
+                print(f"[DEBUG] Connected to Snowflake - Database: {current_db}, Schema: {current_schema}")
+
+                if current_db != self.database.upper():
+                    raise Exception(f"Database context mismatch! Expected {self.database}, got {current_db}")
+
+                self._ensure_table_exists()
         except KeyError as e:
             raise Exception(f"Missing Snowflake configuration: {str(e)}")
         except Exception as e:
             raise Exception(f"Failed to connect to Snowflake: {str(e)}")
 
+    def _connect_pooled(self):
+        """Open a session for the pool, with the database and schema context set"""
+        conn = snowflake.connector.connect(**self._sf_config, client_session_keep_alive=True)
+        cursor = conn.cursor()
+        try:
+            # Explicitly set the database and schema context
+            cursor.execute(f"USE DATABASE {self.database}")
+            cursor.execute(f"USE SCHEMA {self.schema}")
+        finally:
+            cursor.close()
+        return conn
+
+    @contextmanager
+    def session(self):
+        """
+        Borrow a pooled session for the calling thread
+
+        Nested calls on the same thread reuse the session already borrowed, so a method
+        and the helpers it calls share one connection (and one transaction).
+
+        Yields:
+            PooledSession with .conn and .cursor
+        """
+        held = getattr(self._local, 'session', None)
+        if held is not None:
+            yield held
+            return
+
+        with self._pool.checkout() as session:
+            self._local.session = session
+            try:
+                yield session
+            finally:
+                self._local.session = None
+
+    def _borrowed(self) -> PooledSession:
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            raise Exception("No Snowflake session borrowed on this thread; use 'with sf_conn.session() as session:'")
+        return session
+
+    @property
+    def conn(self):
+        """Connection of the session borrowed by the calling thread"""
+        return self._borrowed().conn
+
+    @property
+    def cursor(self):
+        """Cursor of the session borrowed by the calling thread"""
+        return self._borrowed().cursor
+
     def is_connected(self) -> bool:
         """
         Check if the connection is still alive and valid.
 
+        A query that succeeded within LIVENESS_PROBE_INTERVAL seconds proves the
+        connection is alive, so no round trip is made unless the pool has been idle
+        that long (or a pooled connection was closed). A failed probe drops the pooled
+        sessions and retries once on a fresh one, so a dropped connection is replaced
+        transparently.
+
         Returns:
-            True if connection is alive, False otherwise
+            True if connection is alive (or was re-established), False otherwise
         """
+        last_success = self._pool.last_success
+        if (last_success is not None
+                and time.monotonic() - last_success < get_config().LIVENESS_PROBE_INTERVAL
+                and not self._pool.idle_sessions_closed()):
+            return True
+
+        if self._probe():
+            return True
+        print("[DEBUG] Snowflake liveness probe failed, reconnecting")
+        self._pool.reset()
+        return self._probe()
+
+    def _probe(self) -> bool:
+        """Run SELECT 1 on a pooled session"""
         try:
-            if self.conn is None or self.cursor is None:
-                return False
-            # Simple query to check if connection is alive
-            self.cursor.execute("SELECT 1")
-            self.cursor.fetchone()
+            with self.session() as session:
+                # Simple query to check if connection is alive
+                session.cursor.execute("SELECT 1")
+                session.cursor.fetchone()
             return True
         except Exception:
             return False
 
+    def _open_session(self):
+        """
+        Open an independent Snowflake session for loading
+
+        The session does not autocommit, so every statement it runs stays pending
+        until the caller commits or rolls it back.
+
+        Returns:
+            snowflake.connector connection
+        """
+        conn = snowflake.connector.connect(**self._sf_config, autocommit=False)
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f"USE DATABASE {self.database}")
+            cursor.execute(f"USE SCHEMA {self.schema}")
+        finally:
+            cursor.close()
+        return conn
+
     def _ensure_table_exists(self):
         """Create the viewership_file_formats table if it doesn't exist"""
         # File formats table lives in the configured database
@@ -90,6 +438,7 @@ class SnowflakeConnection:
             # Table might already exist
             pass
 
+    @_pooled
     def insert_config(self, config_data: Dict) -> str:
         """
         Insert a new configuration into the database
@@ -163,6 +512,7 @@ class SnowflakeConnection:
 
             self.cursor.execute(insert_sql, values)
             self.conn.commit()
+            self._invalidate_templates()
             print(f"[DEBUG] INSERT successful! Config ID: {config_id}")
             return config_id
         except snowflake.connector.errors.IntegrityError as e:
@@ -177,6 +527,7 @@ class SnowflakeConnection:
             self.conn.rollback()
             raise Exception(f"Error inserting configuration: {str(e)}")
 
+    @_pooled
     def update_config(self, config_id: str, config_data: Dict):
         """
         Update an existing configuration
@@ -236,6 +587,7 @@ class SnowflakeConnection:
         try:
             self.cursor.execute(update_sql, values)
             self.conn.commit()
+            self._invalidate_templates()
 
             if self.cursor.rowcount == 0:
                 raise Exception(f"No configuration found with ID: {config_id}")
@@ -243,6 +595,7 @@ class SnowflakeConnection:
             self.conn.rollback()
             raise Exception(f"Error updating configuration: {str(e)}")
 
+    @_pooled
     def delete_config(self, config_id: str):
         """
         Delete a configuration
@@ -255,6 +608,7 @@ class SnowflakeConnection:
         try:
             self.cursor.execute(delete_sql, (config_id,))
             self.conn.commit()
+            self._invalidate_templates()
 
             if self.cursor.rowcount == 0:
                 raise Exception(f"No configuration found with ID: {config_id}")
@@ -262,6 +616,19 @@ class SnowflakeConnection:
             self.conn.rollback()
             raise Exception(f"Error deleting configuration: {str(e)}")
 
+    def _invalidate_templates(self):
+        """Forget cached template lookups after a config was written"""
+        if self._template_cache is not None:
+            self._template_cache.invalidate()
+
+    def _templates_version(self):
+        """Version of the configs table: changes whenever a config is written or deleted"""
+        self.cursor.execute(
+            "SELECT MAX(updated_date), COUNT(*) FROM dictionary.public.viewership_file_formats"
+        )
+        return tuple(self.cursor.fetchone())
+
+    @_pooled
     def get_config_by_id(self, config_id: str) -> Optional[Dict]:
         """
         Retrieve a configuration by its ID
@@ -310,116 +677,105 @@ class SnowflakeConnection:
         except Exception as e:
             raise Exception(f"Error retrieving configuration: {str(e)}")
 
+    @_pooled
     def get_config_by_platform_partner(self, platform: str, partner: str, territory: str = None) -> Optional[Dict]:
         """
         Retrieve a configuration by platform, partner, and optionally territory
 
+        The exact partner match (within the territory, when given) and the DEFAULT
+        partner fallback are ranked in a single query. SAMPLE_DATA is not fetched;
+        use get_config_sample_data() when it is needed. Results are served from the
+        template cache while the table version is unchanged.
+
         Args:
             platform: The platform name
             partner: The partner name
             territory: Optional territory name for more specific matching
 
         Returns:
-            Dictionary containing configuration details or None if not found
+            Dictionary containing configuration details (without SAMPLE_DATA) or None if not found
         """
-        # Build query with optional territory filtering
+        # Exact partner matches are filtered by territory; the DEFAULT fallback is not
+        partner_match = "LOWER(partner) = LOWER(%s)"
+        params = [platform, partner]
         if territory:
-            select_sql = f"""
-            SELECT
-                config_id,
-                platform,
-                partner,
-                channel,
-                territory,
-                column_mappings,
-                validation_rules,
-                filename_pattern,
-                source_columns,
-                target_table,
-                created_date,
-                updated_date,
-                created_by,
-                custom_sanitization_procedure,
-                custom_territory_procedure,
-                custom_channel_procedure,
-                custom_date_procedure,
-                custom_normalizers,
-                domain,
-                sample_data,
-                data_type,
-                territories
-            FROM dictionary.public.viewership_file_formats
-            WHERE LOWER(platform) = LOWER(%s)
-              AND LOWER(partner) = LOWER(%s)
-              AND (
-                territories IS NULL
-                OR ARRAY_SIZE(territories) = 0
-                OR CONTAINS(LOWER(territories::STRING), LOWER(%s))
-              )
-            ORDER BY updated_date DESC NULLS LAST, created_date DESC
-            """
-            params = (platform, partner, territory)
+            partner_match += """
+                AND (
+                    territories IS NULL
+                    OR ARRAY_SIZE(territories) = 0
+                    OR CONTAINS(LOWER(territories::STRING), LOWER(%s))
+                )"""
+            params.append(territory)
+
+        if partner and partner.upper() != 'DEFAULT':
+            candidates = f"({partner_match}) OR LOWER(partner) = 'default'"
         else:
-            select_sql = f"""
-            SELECT
-                config_id,
-                platform,
-                partner,
-                channel,
-                territory,
-                column_mappings,
-                validation_rules,
-                filename_pattern,
-                source_columns,
-                target_table,
-                created_date,
-                updated_date,
-                created_by,
-                custom_sanitization_procedure,
-                custom_territory_procedure,
-                custom_channel_procedure,
-                custom_date_procedure,
-                custom_normalizers,
-                domain,
-                sample_data,
-                data_type,
-                territories
-            FROM dictionary.public.viewership_file_formats
-            WHERE LOWER(platform) = LOWER(%s) AND LOWER(partner) = LOWER(%s)
-            ORDER BY updated_date DESC NULLS LAST, created_date DESC
-            """
-            params = (platform, partner)
+            candidates = partner_match
+        params.append(partner)
 
-        default_sql = """
+        # sample_data is replaced by NULL so the row keeps _row_to_dict's layout
+        select_sql = f"""
             SELECT
                 config_id, platform, partner, channel, territory, column_mappings,
                 validation_rules, filename_pattern, source_columns, target_table,
                 created_date, updated_date, created_by, custom_sanitization_procedure,
                 custom_territory_procedure, custom_channel_procedure, custom_date_procedure,
-                custom_normalizers, domain, sample_data, data_type, territories
+                custom_normalizers, domain, NULL AS sample_data, data_type, territories
             FROM dictionary.public.viewership_file_formats
-            WHERE LOWER(platform) = LOWER(%s) AND LOWER(partner) = 'default'
-            ORDER BY updated_date DESC NULLS LAST, created_date DESC
+            WHERE LOWER(platform) = LOWER(%s)
+              AND ({candidates})
+            ORDER BY
+                CASE WHEN LOWER(partner) = LOWER(%s) THEN 0 ELSE 1 END,
+                updated_date DESC NULLS LAST,
+                created_date DESC
+            LIMIT 1
             """
 
         try:
-            self.cursor.execute(select_sql, params)
+            cache_key = template_key(platform, partner, territory)
+            if self._template_cache is not None:
+                version = self._templates_version()
+                found, config = self._template_cache.get(cache_key, version)
+                if found:
+                    return config
+
+            self.cursor.execute(select_sql, tuple(params))
             row = self.cursor.fetchone()
-
+            config = None
             if row:
-                return self._row_to_dict(row)
+                config = self._row_to_dict(row)
+                del config['SAMPLE_DATA']
 
-            # Fall back to DEFAULT partner if no exact match found
-            if partner and partner.upper() != 'DEFAULT':
-                self.cursor.execute(default_sql, (platform,))
-                row = self.cursor.fetchone()
-                if row:
-                    return self._row_to_dict(row)
-
-            return None
+            if self._template_cache is not None:
+                self._template_cache.put(cache_key, version, config)
+            return config
         except Exception as e:
             raise Exception(f"Error retrieving configuration: {str(e)}")
 
+    @_pooled
+    def get_config_sample_data(self, config_id: str) -> List[Dict]:
+        """
+        Retrieve the sample rows stored with a configuration
+
+        Args:
+            config_id: The configuration ID
+
+        Returns:
+            List of sample row dictionaries (empty when none were stored)
+        """
+        try:
+            self.cursor.execute(
+                "SELECT sample_data FROM dictionary.public.viewership_file_formats WHERE config_id = %s",
+                (config_id,)
+            )
+            row = self.cursor.fetchone()
+            if not row or not row[0]:
+                return []
+            return json.loads(row[0]) if isinstance(row[0], str) else row[0]
+        except Exception as e:
+            raise Exception(f"Error retrieving sample data: {str(e)}")
+
+    @_pooled
     def get_platforms(self) -> List[str]:
         """
         Retrieve list of platforms from dictionary.public.platforms
@@ -443,6 +799,7 @@ class SnowflakeConnection:
             print(f"Warning: Could not fetch platforms from dictionary.public.platforms: {str(e)}")
             return []
 
+    @_pooled
     def get_channels(self) -> List[str]:
         """
         Retrieve list of channels from dictionary.public.channels
@@ -465,6 +822,7 @@ class SnowflakeConnection:
             print(f"Warning: Could not fetch channels from dictionary.public.channels: {str(e)}")
             return []
 
+    @_pooled
     def get_territories(self) -> List[str]:
         """
         Retrieve list of territories from dictionary.public.territories
@@ -487,6 +845,7 @@ class SnowflakeConnection:
             print(f"Warning: Could not fetch territories from dictionary.public.territories: {str(e)}")
             return []
 
+    @_pooled
     def get_partners(self) -> List[str]:
         """
         Retrieve list of partners from dictionary.public.partners
@@ -509,6 +868,7 @@ class SnowflakeConnection:
             print(f"Warning: Could not fetch partners from dictionary.public.partners: {str(e)}")
             return []
 
+    @_pooled
     def check_duplicate_config(self, platform: str, partner: str, channel: Optional[str] = None, territory: Optional[str] = None) -> Optional[Dict]:
         """
         Check if exact configuration already exists (matches UNIQUE constraint)
@@ -575,6 +935,7 @@ class SnowflakeConnection:
         except Exception as e:
             raise Exception(f"Error checking for duplicate config: {str(e)}")
 
+    @_pooled
     def search_configs(self, platform: Optional[str] = None, partner: Optional[str] = None) -> List[Dict]:
         """
         Search for configurations by platform and/or partner
@@ -635,6 +996,7 @@ class SnowflakeConnection:
         except Exception as e:
             raise Exception(f"Error searching configurations: {str(e)}")
 
+    @_pooled
     def get_platforms(self) -> List[str]:
         """
         Retrieve list of platforms from dictionary.public.platforms
@@ -658,6 +1020,7 @@ class SnowflakeConnection:
             print(f"Error fetching platforms: {str(e)}")
             return []
 
+    @_pooled
     def get_all_configs(self) -> List[Dict]:
         """
         Retrieve all configurations
@@ -727,187 +1090,756 @@ class SnowflakeConnection:
             'TERRITORIES': json.loads(row[21]) if row[21] and isinstance(row[21], str) else (row[21] or [])
         }
 
-    def load_to_platform_viewership(self, df, progress_callback=None) -> int:
+    @_pooled
+    def load_to_platform_viewership(self, df, progress_callback=None, use_column_encoders: Optional[bool] = None,
+                                    load_mode: Optional[str] = None, stage=None, max_workers: Optional[int] = None,
+                                    atomic: Optional[bool] = None, return_report: bool = False,
+                                    delta: Optional[bool] = None):
         """
         Load data into the platform_viewership table
 
         Args:
             df: Pandas DataFrame with transformed data
             progress_callback: Optional callback function(batch_num, total_batches, rows_in_batch)
+            use_column_encoders: Render values with the column-wise encoders instead of the
+                row-at-a-time renderer (None = USE_COLUMN_ENCODERS from config)
+            load_mode: 'values' for multi-row INSERT ... VALUES batches, 'copy' to stage gzipped
+                CSV batches and COPY INTO, 'arrow' to stage Parquet files built from Arrow tables
+                typed by the DDL template (None = LOAD_MODE from config)
+            stage: Optional stage for 'copy'/'arrow' mode (defaults to the table stage; pass a
+                src.stage_loader.LocalStage to load against a local directory)
+            max_workers: Number of independent sessions 'values' batches are spread across
+                (None = LOAD_WORKERS from config). With more than one worker nothing is
+                committed until every batch succeeds and the upload is not resumable; the
+                batch sessions are opened outside the session pool.
+            atomic: Load every batch into a session-scoped temporary table first, then move
+                the rows into platform_viewership with one INSERT ... SELECT in a single
+                transaction (None = ATOMIC_LOAD from config). Batches are not committed
+                individually and max_workers is ignored.
+            return_report: Return the verification report instead of the row count
+            delta: Fingerprint every row (ROW_HASH) and, when the same PLATFORM + FILENAME was
+                loaded before, delete and insert only the rows that changed, in one
+                transaction (None = DELTA_LOAD from config). max_workers and atomic are ignored.
 
         Returns:
-            Number of rows inserted
+            Number of rows inserted, or with return_report the verification report from
+            src.load_verification (row count, TOT_HOV/REVENUE sums and MD5 checksum of the
+            PLATFORM/FILENAME slice compared with the DataFrame; 'record_count' and
+            'tot_hov' are ready for the Lambda payload). Delta loads return the rows
+            inserted, and their report has an extra 'delta' entry.
         """
         if df.empty:
             raise Exception("No data to load")
 
-        try:
-            # Get column names from dataframe
-            columns = df.columns.tolist()
-
-            # Create placeholder string for SQL
-            placeholders = ', '.join(['%s'] * len(columns))
-            column_names = ', '.join(columns)
+        config = get_config()
+        if use_column_encoders is None:
+            use_column_encoders = config.USE_COLUMN_ENCODERS
+        load_mode = load_mode or config.LOAD_MODE
+        if load_mode not in LOAD_MODES:
+            raise Exception(f"Unknown load mode '{load_mode}'. Expected one of: {', '.join(LOAD_MODES)}")
+        if max_workers is None:
+            max_workers = config.LOAD_WORKERS
+        if atomic is None:
+            atomic = config.ATOMIC_LOAD
+        if delta is None:
+            delta = config.DELTA_LOAD
+
+        if delta:
+            try:
+                full_table_name = f"{self.database}.{self.schema}.platform_viewership"
+                report = self._load_delta(df, full_table_name, load_mode, use_column_encoders, progress_callback, stage)
+                return report if return_report else report['delta']['inserted']
+            except Exception as e:
+                try:
+                    self.conn.rollback()
+                except Exception:
+                    pass
+                raise Exception(f"Error loading data to platform_viewership: {str(e)}")
+
+        if atomic:
+            try:
+                full_table_name = f"{self.database}.{self.schema}.platform_viewership"
+                report = self._load_atomic(df, full_table_name, load_mode, use_column_encoders, progress_callback, stage)
+                return report if return_report else report['rows_loaded']
+            except Exception as e:
+                try:
+                    self.conn.rollback()
+                except Exception:
+                    pass
+                raise Exception(f"Error loading data to platform_viewership: {str(e)}")
+
+        if load_mode == 'values' and max_workers > 1:
+            try:
+                full_table_name = f"{self.database}.{self.schema}.platform_viewership"
+                report = self._insert_values_parallel(df, full_table_name, use_column_encoders, progress_callback, max_workers)
+                return report if return_report else report['rows_loaded']
+            except Exception as e:
+                raise Exception(f"Error loading data to platform_viewership: {str(e)}")
 
+        try:
             # Create INSERT statement with full database path
             full_table_name = f"{self.database}.{self.schema}.platform_viewership"
-            print(f"[DEBUG] Inserting into table: {full_table_name}")
+            print(f"[DEBUG] Inserting into table: {full_table_name} (mode={load_mode})")
+
+            # A retry of an interrupted upload continues after the batches it already committed
+            platform_val, filename_val = upload_scope(df)
+            manifest = self._open_manifest(full_table_name, platform_val, filename_val, df.columns.tolist())
+            resume_rows = self._resume_offset(manifest, df, full_table_name, platform_val, filename_val)
 
             # Delete any unprocessed rows for the same platform+filename to prevent
             # stale rows from failed uploads accumulating and breaking Lambda count checks
-            if 'PLATFORM' in df.columns and 'FILENAME' in df.columns:
-                platform_val = df['PLATFORM'].iloc[0]
-                filename_val = df['FILENAME'].iloc[0]
-                delete_sql = f"DELETE FROM {full_table_name} WHERE PLATFORM = '{platform_val}' AND FILENAME = '{filename_val}' AND PROCESSED IS NULL"
-                self.cursor.execute(delete_sql)
+            if platform_val is not None and not resume_rows:
+                delete_sql = f"DELETE FROM {full_table_name} WHERE {SLICE_CONDITION} AND PROCESSED IS NULL"
+                self.cursor.execute(delete_sql, slice_params(platform_val, filename_val))
                 self.conn.commit()
+                if manifest:
+                    manifest.reset()
                 print(f"[DEBUG] Cleared stale unprocessed rows for platform={platform_val}, filename={filename_val}")
-            insert_sql = f"""
-            INSERT INTO {full_table_name} ({column_names})
-            VALUES ({placeholders})
-            """
 
-            # Convert dataframe to list of tuples
-            rows = [tuple(row) for row in df.values]
-            print(f"[DEBUG] Total rows to insert: {len(rows)}")
+            print(f"[DEBUG] Total rows to insert: {len(df) - resume_rows} ({'column encoders' if use_column_encoders else 'row renderer'})")
 
-            # Batch insert in chunks to avoid Snowflake expression limit
-            # Snowflake limit is 200k expressions. With ~12 columns, we can do ~16k rows per batch safely
-            batch_size = 16000
-            total_inserted = 0
-            total_batches = (len(rows) + batch_size - 1) // batch_size
-
-            for i in range(0, len(rows), batch_size):
-                batch = rows[i:i + batch_size]
-
-                # Build VALUES clause for batch
-                values_list = []
-                for row in batch:
-                    # Convert each value to string representation for SQL
-                    formatted_values = []
-                    for idx, val in enumerate(row):
-                        col_name = columns[idx]
-
-                        if val is None or (isinstance(val, float) and pd.isna(val)):
-                            formatted_values.append('NULL')
-                        elif col_name == 'DATE':
-                            # Handle date column specially - convert to YYYY-MM-DD format
-                            if isinstance(val, str):
-                                try:
-                                    # Try common formats first, then fall back to general parsing
-                                    parsed_date = None
-
-                                    # Try YYYYMMDD format (common in exports)
-                                    if len(val) == 8 and val.isdigit():
-                                        parsed_date = pd.to_datetime(val, format='%Y%m%d', errors='coerce')
-
-                                    # If specific format didn't work, use general parsing (handles most formats)
-                                    if parsed_date is None or pd.isna(parsed_date):
-                                        parsed_date = pd.to_datetime(val)
-
-                                    formatted_values.append(f"'{parsed_date.strftime('%Y-%m-%d')}'")
-                                except:
-                                    # If all parsing fails, pass as-is and let Snowflake handle it
-                                    formatted_values.append(f"'{val}'")
-                            elif isinstance(val, (int, float)) and not pd.isna(val):
-                                # Handle numeric dates (e.g., 20250701 as integer)
-                                try:
-                                    val_str = str(int(val))  # Convert to string, remove decimals
-                                    if len(val_str) == 8:
-                                        # YYYYMMDD format as integer
-                                        parsed_date = pd.to_datetime(val_str, format='%Y%m%d', errors='coerce')
-                                        formatted_values.append(f"'{parsed_date.strftime('%Y-%m-%d')}'")
-                                    else:
-                                        # Try general parsing
-                                        parsed_date = pd.to_datetime(val)
-                                        formatted_values.append(f"'{parsed_date.strftime('%Y-%m-%d')}'")
-                                except:
-                                    formatted_values.append(f"'{str(val)}'")
-                            elif isinstance(val, pd.Timestamp):
-                                formatted_values.append(f"'{val.strftime('%Y-%m-%d')}'")
-                            else:
-                                formatted_values.append(f"'{str(val)}'")
-                        elif col_name in ['END_TIME', 'START_TIME', 'LOAD_TIMESTAMP']:
-                            # Handle timestamp columns - convert to YYYY-MM-DD HH:MM:SS format
-                            if isinstance(val, str):
-                                try:
-                                    # Try to parse the timestamp with dayfirst=True for DD-MM-YYYY formats
-                                    parsed_ts = pd.to_datetime(val, dayfirst=True)
-                                    formatted_values.append(f"'{parsed_ts.strftime('%Y-%m-%d %H:%M:%S')}'")
-                                except:
-                                    # If parsing fails, try without dayfirst
-                                    try:
-                                        parsed_ts = pd.to_datetime(val)
-                                        formatted_values.append(f"'{parsed_ts.strftime('%Y-%m-%d %H:%M:%S')}'")
-                                    except:
-                                        # Last resort: pass as-is and let Snowflake handle it
-                                        formatted_values.append(f"'{val}'")
-                            elif isinstance(val, pd.Timestamp):
-                                formatted_values.append(f"'{val.strftime('%Y-%m-%d %H:%M:%S')}'")
-                            else:
-                                formatted_values.append(f"'{str(val)}'")
-                        elif col_name == 'REVENUE':
-                            # Handle revenue - strip currency formatting ($, commas, spaces)
-                            if isinstance(val, str):
-                                # Remove $, spaces, and commas
-                                cleaned_val = val.replace('$', '').replace(',', '').replace(' ', '').strip()
-                                # Handle special cases like "-" or empty
-                                if cleaned_val == '-' or cleaned_val == '':
-                                    formatted_values.append('NULL')
-                                else:
-                                    try:
-                                        # Try to convert to float to validate
-                                        float_val = float(cleaned_val)
-                                        formatted_values.append(str(float_val))
-                                    except:
-                                        # If still not a number, set to NULL
-                                        formatted_values.append('NULL')
-                            else:
-                                # Already numeric
-                                formatted_values.append(str(val))
-                        elif isinstance(val, str):
-                            # Escape single quotes
-                            escaped_val = val.replace("'", "''")
-                            formatted_values.append(f"'{escaped_val}'")
-                        else:
-                            formatted_values.append(str(val))
-                    values_list.append(f"({', '.join(formatted_values)})")
+            total_inserted = resume_rows + self._load_batches(
+                df.iloc[resume_rows:], full_table_name, load_mode, use_column_encoders, progress_callback, stage,
+                batch_committed=manifest.record if manifest else None
+            )
+            if manifest:
+                manifest.complete()
+
+            # Verify the slice this upload wrote (not the whole table)
+            report = verify_upload(self.cursor, df, full_table_name, total_inserted)
+            return report if return_report else total_inserted
+
+        except Exception as e:
+            self.conn.rollback()
+            raise Exception(f"Error loading data to platform_viewership: {str(e)}")
+
+    def _insert_values_batches(self, df, full_table_name: str, use_column_encoders: bool, progress_callback=None,
+                               commit: bool = True, batch_committed=None) -> int:
+        """
+        Insert rows with multi-row INSERT ... VALUES statements, committing each batch
+        unless commit is False. batch_committed(batch, query_id) is called after each commit.
 
+        Returns:
+            Number of rows inserted
+        """
+        render = render_rows if use_column_encoders else render_rows_rowwise
+        column_names = ', '.join(df.columns.tolist())
+        total_rows = len(df)
+
+        # Batch size follows the column count (Snowflake's expression limit), the rendered
+        # statement size and the measured speed of earlier batches
+        sizer = self._batch_sizer(len(df.columns))
+        total_inserted = 0
+        batch_num = 0
+        position = 0
+
+        while position < total_rows:
+            started = time.perf_counter()
+            batch = df.iloc[position:position + sizer.next_size()]
+            position += len(batch)
+            batch_num += 1
+
+            # Build VALUES clause for batch, split further if it exceeds the statement size ceiling
+            statement_bytes = 0
+            for values_list in sizer.split_rendered(render(batch)):
                 # Create multi-row INSERT statement with full database path
                 batch_insert_sql = f"""
-                INSERT INTO {full_table_name} ({column_names})
-                VALUES {', '.join(values_list)}
-                """
-
+            INSERT INTO {full_table_name} ({column_names})
+            VALUES {', '.join(values_list)}
+            """
+                statement_bytes += len(batch_insert_sql)
                 self.cursor.execute(batch_insert_sql)
+            if commit:
                 self.conn.commit()
-                total_inserted += len(batch)
+                if batch_committed:
+                    batch_committed(batch, self.cursor.sfqid)
+            total_inserted += len(batch)
+
+            sizer.record(len(batch), statement_bytes, time.perf_counter() - started)
+            total_batches = batch_num + sizer.estimate_batches(total_rows - position)
+
+            print(f"[DEBUG] Batch {batch_num}/{total_batches} {'committed' if commit else 'inserted'}: {len(batch)} rows into {full_table_name} (next batch: {sizer.next_size()} rows)")
+
+            # Call progress callback if provided (total_batches is re-estimated as the size adapts)
+            if progress_callback:
+                progress_callback(batch_num, total_batches, len(batch))
+
+        return total_inserted
 
-                print(f"[DEBUG] Batch {(i // batch_size) + 1}/{total_batches} committed: {len(batch)} rows into {full_table_name}")
+    def _batch_sizer(self, num_columns: int) -> AdaptiveBatchSizer:
+        """Batch sizer for INSERT ... VALUES loads, using the statement limits from config"""
+        config = get_config()
+        return AdaptiveBatchSizer(
+            num_columns,
+            max_expressions=config.MAX_STATEMENT_EXPRESSIONS,
+            max_statement_bytes=config.MAX_STATEMENT_BYTES,
+        )
+
+    def _load_atomic(self, df, full_table_name: str, load_mode: str, use_column_encoders: bool,
+                     progress_callback=None, stage=None) -> Dict:
+        """
+        Load all batches into a temporary table, then move them into the target table
+        in one transaction
+
+        Stale unprocessed rows for the same platform+filename are deleted inside that
+        transaction, so readers see either the previous upload or the new one, never a mix.
+        The upload is verified before the commit; a failed check rolls everything back.
+
+        Returns:
+            Verification report
+        """
+        load_table = self._create_load_table(full_table_name)
+        print(f"[DEBUG] Loading {len(df)} rows into temporary table {load_table} (mode={load_mode})")
+        try:
+            staged = self._load_batches(df, load_table, load_mode, use_column_encoders, progress_callback, stage, commit=False)
+            if staged != len(df):
+                raise Exception(f"Temporary table received {staged} of {len(df)} rows")
+
+            platform_val, filename_val = upload_scope(df)
+            return self._move_load_table(load_table, full_table_name, df.columns.tolist(), staged,
+                                         expected_totals(df), platform_val, filename_val)
+        except Exception:
+            # Roll back before the DROP below, which would otherwise commit the open transaction
+            self.conn.rollback()
+            raise
+        finally:
+            self._drop_load_table(load_table)
+
+    def _load_delta(self, df, full_table_name: str, load_mode: str, use_column_encoders: bool,
+                    progress_callback=None, stage=None) -> Dict:
+        """
+        Replace only the changed rows of an upload slice, in one transaction
+
+        Fingerprints stored for the slice (processed or not) are compared with the new
+        rows' fingerprints. Stored rows without a fingerprint that are still unprocessed
+        are stale and deleted, as in a normal load. The whole fingerprinted slice is
+        verified against the DataFrame before the commit.
+
+        Returns:
+            Verification report with 'delta': {'inserted', 'deleted', 'unchanged'};
+            'record_count' and 'tot_hov' describe the unprocessed rows the Lambda will pick up
+        """
+        platform_val, filename_val = upload_scope(df)
+        if platform_val is None or filename_val is None:
+            raise Exception("Delta loads need PLATFORM and FILENAME columns")
+
+        hashes = row_hashes(df)
+        df = df.assign(**{ROW_HASH_COLUMN: hashes})
+        columns = df.columns.tolist()
+        params = slice_params(platform_val, filename_val)
+
+        self.cursor.execute("BEGIN")
+        try:
+            self.cursor.execute(
+                f"DELETE FROM {full_table_name} WHERE {SLICE_CONDITION} AND PROCESSED IS NULL AND {ROW_HASH_COLUMN} IS NULL",
+                params
+            )
+
+            self.cursor.execute(
+                f"SELECT {ROW_HASH_COLUMN}, COUNT(*) FROM {full_table_name} WHERE {SLICE_CONDITION} AND {ROW_HASH_COLUMN} IS NOT NULL GROUP BY {ROW_HASH_COLUMN}",
+                params
+            )
+            plan = plan_delta(hashes, {row[0]: row[1] for row in self.cursor.fetchall()})
+            print(f"[DEBUG] Delta for {filename_val}: {int(plan['insert_mask'].sum())} rows to insert, "
+                  f"{plan['deleted_rows']} to delete, {plan['unchanged_rows']} unchanged")
+
+            delete_hashes = plan['delete_hashes']
+            for i in range(0, len(delete_hashes), DELTA_DELETE_BATCH_SIZE):
+                hash_list = ', '.join(f"'{h}'" for h in delete_hashes[i:i + DELTA_DELETE_BATCH_SIZE])
+                self.cursor.execute(
+                    f"DELETE FROM {full_table_name} WHERE {SLICE_CONDITION} AND {ROW_HASH_COLUMN} IN ({hash_list})", params
+                )
+
+            inserted = 0
+            to_insert = df[plan['insert_mask']]
+            if not to_insert.empty:
+                inserted = self._load_batches(to_insert, full_table_name, load_mode, use_column_encoders,
+                                              progress_callback, stage, commit=False)
+                if inserted != len(to_insert):
+                    raise Exception(f"Inserted {inserted} of {len(to_insert)} changed rows")
+
+            report = verify_totals(self.cursor, full_table_name, expected_totals(df), columns, platform_val,
+                                   filename_val, plan['unchanged_rows'] + inserted, f"{ROW_HASH_COLUMN} IS NOT NULL")
+            if not report['verified']:
+                failed = ', '.join(check['name'] for check in report['checks'] if not check['ok'])
+                raise Exception(f"Verification failed ({failed}); nothing was committed")
+
+            # The Lambda processes the unprocessed rows, i.e. the changed ones
+            hov_sql = "SUM(TOT_HOV)" if 'TOT_HOV' in columns else ("SUM(TOT_MOV) / 60" if 'TOT_MOV' in columns else "0")
+            self.cursor.execute(
+                f"SELECT COUNT(*), COALESCE({hov_sql}, 0) FROM {full_table_name} WHERE {SLICE_CONDITION} AND PROCESSED IS NULL",
+                params
+            )
+            unprocessed, unprocessed_hov = self.cursor.fetchone()
+
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+
+        report['record_count'] = int(unprocessed)
+        report['tot_hov'] = float(unprocessed_hov)
+        report['delta'] = {'inserted': inserted, 'deleted': plan['deleted_rows'], 'unchanged': plan['unchanged_rows']}
+        print(f"[DEBUG] Delta committed for {filename_val}: {report['delta']}")
+        return report
+
+    def _load_batches(self, df, table_name: str, load_mode: str, use_column_encoders: bool,
+                      progress_callback=None, stage=None, commit: bool = True, batch_committed=None) -> int:
+        """Send a DataFrame to a table with the serial path of the given load mode"""
+        if load_mode == 'copy':
+            return self._copy_batches(df, table_name, use_column_encoders, progress_callback, stage,
+                                      commit=commit, batch_committed=batch_committed)
+        if load_mode == 'arrow':
+            return self._copy_arrow_batches(df, table_name, progress_callback, stage,
+                                            commit=commit, batch_committed=batch_committed)
+        return self._insert_values_batches(df, table_name, use_column_encoders, progress_callback,
+                                           commit=commit, batch_committed=batch_committed)
+
+    def _open_manifest(self, full_table_name: str, platform_val, filename_val, columns: List[str]) -> Optional[LoadManifest]:
+        """
+        Open the load manifest of an upload slice (None when manifests are disabled,
+        the upload has no PLATFORM/FILENAME, or the store is unavailable)
+        """
+        config = get_config()
+        if not config.LOAD_MANIFEST_STORE or platform_val is None or filename_val is None:
+            return None
+        try:
+            if config.LOAD_MANIFEST_STORE == 'table':
+                store = TableManifestStore(self.conn, f"{self.database}.{self.schema}.load_manifests")
+            else:
+                store = LocalManifestStore(config.LOAD_MANIFEST_DIR)
+            return LoadManifest(store, full_table_name, platform_val, filename_val, columns)
+        except Exception as e:
+            print(f"[DEBUG] Load manifest unavailable, upload will not be resumable: {str(e)}")
+            return None
+
+    def _resume_offset(self, manifest: Optional[LoadManifest], df, full_table_name: str,
+                       platform_val, filename_val) -> int:
+        """
+        Rows at the start of df that an interrupted upload already committed
+
+        Resuming requires every recorded batch within df to still match its hash and the
+        unprocessed slice in Snowflake to hold exactly the recorded rows. Otherwise 0 is
+        returned and the caller reloads the slice from scratch.
+        """
+        if manifest is None or not manifest.batches:
+            return 0
+
+        committed = manifest.committed_rows
+        matched = manifest.matched_rows(df)
+        if matched is None or matched != min(committed, len(df)):
+            print(f"[DEBUG] {filename_val} changed since the interrupted upload - reloading from scratch")
+            return 0
+
+        self.cursor.execute(
+            f"SELECT COUNT(*) FROM {full_table_name} WHERE {SLICE_CONDITION} AND PROCESSED IS NULL",
+            slice_params(platform_val, filename_val)
+        )
+        in_table = self.cursor.fetchone()[0]
+        if in_table != committed:
+            print(f"[DEBUG] Slice holds {in_table} rows but the manifest recorded {committed} - reloading from scratch")
+            return 0
+
+        print(f"[DEBUG] Resuming {filename_val}: {len(manifest.batches)} batches ({committed} rows) already committed")
+        return matched
+
+    def _create_load_table(self, full_table_name: str) -> str:
+        """Create a session-scoped temporary copy of the target table's structure"""
+        load_table = f"{self.database}.{self.schema}.platform_viewership_load_{uuid.uuid4().hex[:12]}"
+        self.cursor.execute(f"CREATE TEMPORARY TABLE {load_table} LIKE {full_table_name}")
+        return load_table
+
+    def _drop_load_table(self, load_table: str):
+        """Drop a temporary load table, ignoring errors"""
+        try:
+            self.cursor.execute(f"DROP TABLE IF EXISTS {load_table}")
+        except Exception:
+            pass
+
+    def _move_load_table(self, load_table: str, full_table_name: str, columns: List[str], staged: int,
+                         expected: Dict, platform_val, filename_val) -> Dict:
+        """
+        Replace the upload's unprocessed slice with the temporary table's rows, verify
+        and commit, all in one transaction
+
+        Returns:
+            Verification report
+        """
+        column_names = ', '.join(columns)
+        self.cursor.execute("BEGIN")
+        if platform_val is not None and filename_val is not None:
+            self.cursor.execute(
+                f"DELETE FROM {full_table_name} WHERE {SLICE_CONDITION} AND PROCESSED IS NULL",
+                slice_params(platform_val, filename_val)
+            )
+        self.cursor.execute(f"INSERT INTO {full_table_name} ({column_names}) SELECT {column_names} FROM {load_table}")
+        moved = self.cursor.rowcount
+        if moved is not None and moved != staged:
+            raise Exception(f"Moved {moved} of {staged} rows into {full_table_name}")
+        report = verify_totals(self.cursor, full_table_name, expected, columns, platform_val, filename_val, staged)
+        if not report['verified']:
+            failed = ', '.join(check['name'] for check in report['checks'] if not check['ok'])
+            raise Exception(f"Verification failed ({failed}); nothing was committed")
+        self.conn.commit()
+        print(f"[DEBUG] Committed {staged} rows into {full_table_name} in one transaction")
+        return report
+
+    @_pooled
+    def load_stream_to_platform_viewership(self, chunks, progress_callback=None,
+                                           use_column_encoders: Optional[bool] = None,
+                                           load_mode: Optional[str] = None, atomic: Optional[bool] = None,
+                                           return_report: bool = False):
+        """
+        Load transformed DataFrame chunks into the platform_viewership table as they arrive
+
+        Only one chunk is held at a time, so peak memory follows the chunk size rather
+        than the file size. All chunks must belong to the same upload (same PLATFORM and
+        FILENAME). Verification totals are accumulated per chunk and checked at the end.
+
+        Args:
+            chunks: Iterable of transformed DataFrames (see src.upload_pipeline)
+            progress_callback: Optional callback function(chunk_num, rows_loaded_so_far)
+            use_column_encoders: See load_to_platform_viewership
+            load_mode: See load_to_platform_viewership ('values', 'copy' or 'arrow')
+            atomic: See load_to_platform_viewership (None = ATOMIC_LOAD from config)
+            return_report: Return the verification report instead of the row count
+
+        Returns:
+            Number of rows inserted, or the verification report
+        """
+        config = get_config()
+        if use_column_encoders is None:
+            use_column_encoders = config.USE_COLUMN_ENCODERS
+        load_mode = load_mode or config.LOAD_MODE
+        if load_mode not in LOAD_MODES:
+            raise Exception(f"Unknown load mode '{load_mode}'. Expected one of: {', '.join(LOAD_MODES)}")
+        if atomic is None:
+            atomic = config.ATOMIC_LOAD
+
+        full_table_name = f"{self.database}.{self.schema}.platform_viewership"
+        target_table = full_table_name
+        load_table = None
+        manifest = None
+        resume_rows = 0
+        columns = None
+        platform_val = filename_val = None
+        expected = None
+        total_loaded = 0
+        position = 0
+        chunk_num = 0
+
+        try:
+            for chunk in chunks:
+                if chunk.empty:
+                    continue
+
+                if columns is None:
+                    columns = chunk.columns.tolist()
+                    platform_val, filename_val = upload_scope(chunk)
+                    if atomic:
+                        load_table = self._create_load_table(full_table_name)
+                        target_table = load_table
+                    else:
+                        manifest = self._open_manifest(full_table_name, platform_val, filename_val, columns)
+                        resume_rows = self._resume_offset(manifest, chunk, full_table_name, platform_val, filename_val)
+                        if resume_rows:
+                            resume_rows = manifest.committed_rows
+                        elif platform_val is not None:
+                            # Same stale-row cleanup as load_to_platform_viewership
+                            self.cursor.execute(
+                                f"DELETE FROM {full_table_name} WHERE {SLICE_CONDITION} AND PROCESSED IS NULL",
+                                slice_params(platform_val, filename_val)
+                            )
+                            self.conn.commit()
+                            if manifest:
+                                manifest.reset()
+                    print(f"[DEBUG] Streaming into {target_table} (mode={load_mode}, atomic={atomic})")
+                elif chunk.columns.tolist() != columns:
+                    raise Exception(f"Chunk {chunk_num + 1} has different columns than the first chunk")
+
+                # Skip the rows an interrupted upload already committed
+                skip = 0
+                if position < resume_rows:
+                    skip = manifest.matched_rows(chunk, position)
+                    if skip is None or skip != min(len(chunk), resume_rows - position):
+                        manifest.reset()
+                        raise Exception(f"{filename_val} changed since the interrupted upload; "
+                                        "upload it again to load it from the start")
+
+                chunk_num += 1
+                total_loaded += skip + self._load_batches(
+                    chunk.iloc[skip:], target_table, load_mode, use_column_encoders, commit=not atomic,
+                    batch_committed=manifest.record if manifest else None
+                )
+                position += len(chunk)
+                expected = merge_totals(expected, expected_totals(chunk))
+                print(f"[DEBUG] Chunk {chunk_num} loaded: {len(chunk)} rows ({total_loaded} total)")
 
-                # Call progress callback if provided
                 if progress_callback:
-                    batch_num = (i // batch_size) + 1
-                    progress_callback(batch_num, total_batches, len(batch))
+                    progress_callback(chunk_num, total_loaded)
 
-            # Verify data was inserted
-            verify_sql = f"SELECT COUNT(*) FROM {full_table_name}"
-            self.cursor.execute(verify_sql)
-            total_count = self.cursor.fetchone()[0]
-            print(f"[DEBUG] Verification - Total rows in {full_table_name}: {total_count}")
+            if columns is None:
+                raise Exception("No data to load")
 
-            return total_inserted
+            if atomic:
+                report = self._move_load_table(load_table, full_table_name, columns, total_loaded,
+                                               expected, platform_val, filename_val)
+            else:
+                if manifest:
+                    manifest.complete()
+                report = verify_totals(self.cursor, full_table_name, expected, columns,
+                                       platform_val, filename_val, total_loaded)
+            return report if return_report else total_loaded
 
         except Exception as e:
             self.conn.rollback()
             raise Exception(f"Error loading data to platform_viewership: {str(e)}")
+        finally:
+            if load_table:
+                self._drop_load_table(load_table)
+
+    def _insert_values_parallel(self, df, full_table_name: str, use_column_encoders: bool,
+                                progress_callback=None, max_workers: int = 4) -> Dict:
+        """
+        Insert INSERT ... VALUES batches concurrently over independent sessions
+
+        Every batch stays uncommitted until all batches have succeeded; then each
+        session commits. Any failure rolls back every session. The session borrowed
+        by the calling thread clears stale rows and verifies the load; only the batch
+        sessions are opened here. The progress callback runs on the calling thread,
+        with batch_num counting completed batches.
+
+        Returns:
+            Verification report
+        """
+        render = render_rows if use_column_encoders else render_rows_rowwise
+        column_names = ', '.join(df.columns.tolist())
+        total_rows = len(df)
+
+        # Sized like the serial path; each completed batch feeds its timing back to the sizer
+        sizer = self._batch_sizer(len(df.columns))
+        num_sessions = max(1, min(max_workers, sizer.estimate_batches(total_rows)))
+
+        control = self.conn
+        stale_delete = f"DELETE FROM {full_table_name} WHERE {SLICE_CONDITION} AND PROCESSED IS NULL"
+        sessions = []
+        try:
+            # Clear stale unprocessed rows up front, committed on its own as in the serial path
+            if 'PLATFORM' in df.columns and 'FILENAME' in df.columns:
+                platform_val = df['PLATFORM'].iloc[0]
+                filename_val = df['FILENAME'].iloc[0]
+                stale_params = slice_params(platform_val, filename_val)
+                control.cursor().execute(stale_delete, stale_params)
+                control.commit()
+                print(f"[DEBUG] Cleared stale unprocessed rows for platform={platform_val}, filename={filename_val}")
+            else:
+                stale_params = None
+
+            sessions = [self._open_session() for _ in range(num_sessions)]
+            idle = queue.Queue()
+            for session in sessions:
+                idle.put(session)
+
+            print(f"[DEBUG] Inserting {total_rows} rows into {full_table_name} over {num_sessions} sessions")
+
+            def insert_batch(batch):
+                started = time.perf_counter()
+                statements = [
+                    f"""
+                INSERT INTO {full_table_name} ({column_names})
+                VALUES {', '.join(values_list)}
+                """
+                    for values_list in sizer.split_rendered(render(batch))
+                ]
+                session = idle.get()
+                try:
+                    cursor = session.cursor()
+                    try:
+                        for sql in statements:
+                            cursor.execute(sql)
+                    finally:
+                        cursor.close()
+                finally:
+                    idle.put(session)
+                return len(batch), sum(len(sql) for sql in statements), time.perf_counter() - started
+
+            total_inserted = 0
+            completed = 0
+            try:
+                with ThreadPoolExecutor(max_workers=num_sessions) as executor:
+                    # Keep one batch in flight per session; each new batch uses the latest size
+                    position = 0
+                    in_flight = set()
+
+                    def fill():
+                        nonlocal position
+                        while position < total_rows and len(in_flight) < num_sessions:
+                            batch = df.iloc[position:position + sizer.next_size()]
+                            position += len(batch)
+                            in_flight.add(executor.submit(insert_batch, batch))
+
+                    fill()
+                    try:
+                        while in_flight:
+                            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                            for future in done:
+                                rows, statement_bytes, seconds = future.result()
+                                sizer.record(rows, statement_bytes, seconds)
+                                total_inserted += rows
+                                completed += 1
+                                total_batches = completed + len(in_flight) + sizer.estimate_batches(total_rows - position)
+                                print(f"[DEBUG] Batch {completed}/{total_batches} inserted (pending commit): {rows} rows")
+                                if progress_callback:
+                                    progress_callback(completed, total_batches, rows)
+                            fill()
+                    except Exception:
+                        for future in in_flight:
+                            future.cancel()
+                        raise
+            except Exception:
+                for session in sessions:
+                    try:
+                        session.rollback()
+                    except Exception:
+                        pass
+                raise
+
+            committed = 0
+            try:
+                for session in sessions:
+                    session.commit()
+                    committed += 1
+            except Exception:
+                # Some sessions already committed; remove what they wrote
+                for session in sessions[committed:]:
+                    try:
+                        session.rollback()
+                    except Exception:
+                        pass
+                if committed and stale_params:
+                    control.cursor().execute(stale_delete, stale_params)
+                    control.commit()
+                raise
+
+            print(f"[DEBUG] Committed {total_inserted} rows into {full_table_name} across {num_sessions} sessions")
+            cursor = control.cursor()
+            try:
+                return verify_upload(cursor, df, full_table_name, total_inserted)
+            finally:
+                cursor.close()
+        finally:
+            for conn in sessions:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+    def _copy_batches(self, df, full_table_name: str, use_column_encoders: bool, progress_callback=None, stage=None,
+                      commit: bool = True, batch_committed=None) -> int:
+        """
+        Write each batch to a gzipped CSV file, PUT it on a stage and COPY INTO the table,
+        committing each batch unless commit is False. batch_committed(batch, query_id) is
+        called after each commit.
+
+        Returns:
+            Number of rows loaded, summed from the COPY INTO results
+        """
+        columns = df.columns.tolist()
+        stage = stage or TableStage(self.cursor, full_table_name)
+        total_rows = len(df)
+
+        # No expression limit applies to staged files, so batches are much larger
+        batch_size = COPY_BATCH_SIZE
+        total_loaded = 0
+        total_batches = (total_rows + batch_size - 1) // batch_size
+
+        with tempfile.TemporaryDirectory(prefix='platform_viewership_') as tmp_dir:
+            try:
+                for i in range(0, total_rows, batch_size):
+                    batch = df.iloc[i:i + batch_size]
+                    batch_num = (i // batch_size) + 1
+                    file_name = f"batch_{batch_num:05d}.csv.gz"
+
+                    path = write_batch_file(batch, tmp_dir, file_name, use_column_encoders)
+                    stage.put(path)
+                    os.remove(path)
+
+                    rows_loaded = stage.copy_into(columns, file_name)
+                    if rows_loaded != len(batch):
+                        raise Exception(f"COPY INTO loaded {rows_loaded} of {len(batch)} rows from {file_name}")
+                    if commit:
+                        self.conn.commit()
+                        if batch_committed:
+                            batch_committed(batch, getattr(self.cursor, 'sfqid', None))
+                    total_loaded += rows_loaded
+
+                    print(f"[DEBUG] Batch {batch_num}/{total_batches} copied: {rows_loaded} rows into {full_table_name}")
+
+                    if progress_callback:
+                        progress_callback(batch_num, total_batches, rows_loaded)
+            except Exception:
+                try:
+                    stage.remove()
+                except Exception:
+                    pass
+                raise
+
+        return total_loaded
+
+    def _copy_arrow_batches(self, df, full_table_name: str, progress_callback=None, stage=None,
+                            commit: bool = True, batch_committed=None) -> int:
+        """
+        Convert each batch to an Arrow table typed from the DDL template, stage it as
+        Parquet and COPY INTO the table, committing each batch unless commit is False.
+        batch_committed(batch, query_id) is called after each commit.
+
+        Returns:
+            Number of rows loaded, summed from the COPY INTO results
+        """
+        columns = df.columns.tolist()
+        stage = stage or TableStage(self.cursor, full_table_name)
+        total_rows = len(df)
+
+        batch_size = COPY_BATCH_SIZE
+        total_loaded = 0
+        total_batches = (total_rows + batch_size - 1) // batch_size
+
+        with tempfile.TemporaryDirectory(prefix='platform_viewership_') as tmp_dir:
+            try:
+                for i in range(0, total_rows, batch_size):
+                    batch = df.iloc[i:i + batch_size]
+                    batch_num = (i // batch_size) + 1
+                    file_name = f"batch_{batch_num:05d}.parquet"
+
+                    path = write_parquet_file(to_arrow_table(batch), tmp_dir, file_name)
+                    stage.put(path)
+                    os.remove(path)
+
+                    rows_loaded = stage.copy_into(columns, file_name, PARQUET_FILE_FORMAT)
+                    if rows_loaded != len(batch):
+                        raise Exception(f"COPY INTO loaded {rows_loaded} of {len(batch)} rows from {file_name}")
+                    if commit:
+                        self.conn.commit()
+                        if batch_committed:
+                            batch_committed(batch, getattr(self.cursor, 'sfqid', None))
+                    total_loaded += rows_loaded
+
+                    print(f"[DEBUG] Batch {batch_num}/{total_batches} copied (arrow): {rows_loaded} rows into {full_table_name}")
+
+                    if progress_callback:
+                        progress_callback(batch_num, total_batches, rows_loaded)
+            except Exception:
+                try:
+                    stage.remove()
+                except Exception:
+                    pass
+                raise
+
+        return total_loaded
 
     def close(self):
-        """Close the database connection"""
-        if self.cursor:
-            self.cursor.close()
-        if self.conn:
-            self.conn.close()
+        """Close the pooled database sessions"""
+        self._pool.close()
 
     def __enter__(self):
         """Context manager entry"""
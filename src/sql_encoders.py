@@ -0,0 +1,536 @@
+"""
+SQL Literal Encoders
+Convert whole DataFrame columns to SQL literal text for platform_viewership loads.
+
+Each target column type (date, timestamp, currency, string, numeric, null) has an
+encoder that renders an entire pandas column in one pass. Values the vectorized
+paths can't prove identical to the row-at-a-time renderer fall back to
+render_literal(), so both paths always produce the same SQL.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Target columns with special literal handling
+DATE_COLUMNS = ['DATE']
+TIMESTAMP_COLUMNS = ['END_TIME', 'START_TIME', 'LOAD_TIMESTAMP']
+CURRENCY_COLUMNS = ['REVENUE']
+
+# Value kinds used to route each cell to a vectorized path
+_NULL, _STR, _INT, _FLOAT, _TIMESTAMP, _OTHER = range(6)
+
+_TYPE_KINDS = {
+    str: _STR,
+    int: _INT,
+    float: _FLOAT,
+    np.float64: _FLOAT,
+    type(None): _NULL,
+    pd.Timestamp: _TIMESTAMP,
+}
+
+_ISO_DATE_PATTERN = r'[0-9]{4}-[0-9]{2}-[0-9]{2}'
+_COMPACT_DATE_PATTERN = r'[0-9]{8}'
+
+
+def render_literal(val, col_name: str) -> str:
+    """
+    Render a single value as a SQL literal (row-at-a-time reference renderer)
+
+    Args:
+        val: Cell value as produced by DataFrame.values
+        col_name: Target column name
+
+    Returns:
+        SQL literal text
+    """
+    if val is None or (isinstance(val, float) and pd.isna(val)):
+        return 'NULL'
+    elif col_name == 'DATE':
+        # Handle date column specially - convert to YYYY-MM-DD format
+        if isinstance(val, str):
+            try:
+                # Try common formats first, then fall back to general parsing
+                parsed_date = None
+
+                # Try YYYYMMDD format (common in exports)
+                if len(val) == 8 and val.isdigit():
+                    parsed_date = pd.to_datetime(val, format='%Y%m%d', errors='coerce')
+
+                # If specific format didn't work, use general parsing (handles most formats)
+                if parsed_date is None or pd.isna(parsed_date):
+                    parsed_date = pd.to_datetime(val)
+
+                return f"'{parsed_date.strftime('%Y-%m-%d')}'"
+            except:
+                # If all parsing fails, pass as-is and let Snowflake handle it
+                return f"'{val}'"
+        elif isinstance(val, (int, float)) and not pd.isna(val):
+            # Handle numeric dates (e.g., 20250701 as integer)
+            try:
+                val_str = str(int(val))  # Convert to string, remove decimals
+                if len(val_str) == 8:
+                    # YYYYMMDD format as integer
+                    parsed_date = pd.to_datetime(val_str, format='%Y%m%d', errors='coerce')
+                    return f"'{parsed_date.strftime('%Y-%m-%d')}'"
+                else:
+                    # Try general parsing
+                    parsed_date = pd.to_datetime(val)
+                    return f"'{parsed_date.strftime('%Y-%m-%d')}'"
+            except:
+                return f"'{str(val)}'"
+        elif isinstance(val, pd.Timestamp):
+            return f"'{val.strftime('%Y-%m-%d')}'"
+        else:
+            return f"'{str(val)}'"
+    elif col_name in TIMESTAMP_COLUMNS:
+        # Handle timestamp columns - convert to YYYY-MM-DD HH:MM:SS format
+        if isinstance(val, str):
+            try:
+                # Try to parse the timestamp with dayfirst=True for DD-MM-YYYY formats
+                parsed_ts = pd.to_datetime(val, dayfirst=True)
+                return f"'{parsed_ts.strftime('%Y-%m-%d %H:%M:%S')}'"
+            except:
+                # If parsing fails, try without dayfirst
+                try:
+                    parsed_ts = pd.to_datetime(val)
+                    return f"'{parsed_ts.strftime('%Y-%m-%d %H:%M:%S')}'"
+                except:
+                    # Last resort: pass as-is and let Snowflake handle it
+                    return f"'{val}'"
+        elif isinstance(val, pd.Timestamp):
+            return f"'{val.strftime('%Y-%m-%d %H:%M:%S')}'"
+        else:
+            return f"'{str(val)}'"
+    elif col_name == 'REVENUE':
+        # Handle revenue - strip currency formatting ($, commas, spaces)
+        if isinstance(val, str):
+            # Remove $, spaces, and commas
+            cleaned_val = val.replace('$', '').replace(',', '').replace(' ', '').strip()
+            # Handle special cases like "-" or empty
+            if cleaned_val == '-' or cleaned_val == '':
+                return 'NULL'
+            try:
+                # Try to convert to float to validate
+                return str(float(cleaned_val))
+            except:
+                # If still not a number, set to NULL
+                return 'NULL'
+        # Already numeric
+        return str(val)
+    elif isinstance(val, str):
+        # Escape single quotes
+        escaped_val = val.replace("'", "''")
+        return f"'{escaped_val}'"
+    return str(val)
+
+
+def _is_legacy_null(val) -> bool:
+    """True for the values render_literal() renders as NULL regardless of column"""
+    return val is None or (isinstance(val, float) and pd.isna(val))
+
+
+def _value_kinds(values: pd.Series) -> np.ndarray:
+    """
+    Classify every cell of a column by the Python type DataFrame.values would yield
+
+    Returns:
+        Array of kind codes (_NULL, _STR, _INT, _FLOAT, _TIMESTAMP, _OTHER)
+    """
+    dtype = values.dtype
+    nulls = values.isna().to_numpy()
+
+    if dtype.kind == 'f' and dtype.itemsize == 8:
+        return np.where(nulls, _NULL, _FLOAT)
+    if dtype.kind in 'iu':
+        return np.full(len(values), _INT)
+    if dtype.kind == 'M':
+        # NaT is neither None nor a float, so it goes through the reference renderer
+        return np.where(nulls, _OTHER, _TIMESTAMP)
+    if dtype != object:
+        return np.full(len(values), _OTHER)
+
+    if pd.api.types.infer_dtype(values, skipna=True) == 'string':
+        kinds = np.full(len(values), _STR)
+        for pos in np.flatnonzero(nulls):
+            kinds[pos] = _NULL if _is_legacy_null(values.iat[pos]) else _OTHER
+        return kinds
+
+    kinds = values.map(type).map(_TYPE_KINDS).fillna(_OTHER).to_numpy(dtype=int)
+    kinds[(kinds == _FLOAT) & nulls] = _NULL
+    return kinds
+
+
+def _render_residue(values: pd.Series, column: str) -> np.ndarray:
+    """Render values one at a time, reusing results for repeated values"""
+    # Same Python scalars DataFrame.values yields for an object array
+    values = values.to_numpy(dtype=object)
+    cache = {}
+    rendered = []
+    try:
+        for val in values:
+            # Key on type too: 1, 1.0 and True hash alike but render differently
+            key = (type(val), val)
+            if key not in cache:
+                cache[key] = render_literal(val, column)
+            rendered.append(cache[key])
+    except TypeError:
+        # Unhashable values (e.g. lists) can't be memoized
+        rendered = [render_literal(val, column) for val in values]
+    return np.array(rendered, dtype=object)
+
+
+def _quote(text: pd.Series) -> pd.Series:
+    """Wrap already-escaped text in single quotes"""
+    return "'" + text + "'"
+
+
+class ColumnEncoder:
+    """Base encoder: renders a whole column the way generic string/numeric columns are rendered"""
+
+    name = 'string'
+
+    def encode(self, values: pd.Series, column: str) -> np.ndarray:
+        """
+        Encode an entire column to SQL literal text
+
+        Args:
+            values: Column values
+            column: Target column name
+
+        Returns:
+            Object array of SQL literal strings, one per row
+        """
+        values = values.reset_index(drop=True)
+        if not isinstance(values.dtype, np.dtype):
+            # Extension dtypes (string, category, tz-aware) surface as Python objects
+            values = values.astype(object)
+        kinds = _value_kinds(values)
+        out = np.empty(len(values), dtype=object)
+        out[kinds == _NULL] = 'NULL'
+
+        handlers = {
+            _STR: self._encode_str,
+            _INT: self._encode_int,
+            _FLOAT: self._encode_float,
+            _TIMESTAMP: self._encode_timestamp,
+        }
+        residue = kinds == _OTHER
+        for kind, handler in handlers.items():
+            mask = kinds == kind
+            if not mask.any():
+                continue
+            encoded = handler(values[mask])
+            if encoded is None:
+                residue |= mask
+                continue
+            encoded = np.asarray(encoded, dtype=object)
+            unresolved = pd.isna(encoded)
+            positions = np.flatnonzero(mask)
+            out[positions[~unresolved]] = encoded[~unresolved]
+            residue[positions[unresolved]] = True
+
+        if residue.any():
+            out[residue] = _render_residue(values[residue], column)
+        return out
+
+    def _encode_str(self, values: pd.Series) -> Optional[pd.Series]:
+        return _quote(values.str.replace("'", "''", regex=False))
+
+    def _encode_int(self, values: pd.Series) -> Optional[pd.Series]:
+        return values.astype(str)
+
+    def _encode_float(self, values: pd.Series) -> Optional[pd.Series]:
+        return values.astype(str)
+
+    def _encode_timestamp(self, values: pd.Series) -> Optional[pd.Series]:
+        return None
+
+
+class StringEncoder(ColumnEncoder):
+    """Text columns: quote and escape strings, render anything else as-is"""
+
+    name = 'string'
+
+
+class NumericEncoder(ColumnEncoder):
+    """Numeric columns: plain str() of each number"""
+
+    name = 'numeric'
+
+
+class NullEncoder(ColumnEncoder):
+    """Columns with no values at all"""
+
+    name = 'null'
+
+    def encode(self, values: pd.Series, column: str) -> np.ndarray:
+        return np.full(len(values), 'NULL', dtype=object)
+
+
+class DateEncoder(ColumnEncoder):
+    """DATE column: normalize to 'YYYY-MM-DD'"""
+
+    name = 'date'
+
+    def _encode_str(self, values: pd.Series) -> Optional[pd.Series]:
+        result = pd.Series(None, index=values.index, dtype=object)
+
+        # Already ISO: parsing and re-formatting is the identity for valid dates
+        iso = values.str.fullmatch(_ISO_DATE_PATTERN)
+        if iso.any():
+            parsed = pd.to_datetime(values[iso], format='%Y-%m-%d', errors='coerce')
+            valid = parsed.notna()
+            result[valid[valid].index] = _quote(values[valid[valid].index])
+
+        # Compact YYYYMMDD exports
+        compact = values.str.fullmatch(_COMPACT_DATE_PATTERN)
+        if compact.any():
+            parsed = pd.to_datetime(values[compact], format='%Y%m%d', errors='coerce')
+            valid = parsed[parsed.notna()]
+            result[valid.index] = _quote(valid.dt.strftime('%Y-%m-%d'))
+
+        return result
+
+    def _encode_whole_number(self, whole: pd.Series, original_text: pd.Series) -> pd.Series:
+        """Render integer-valued dates; only 8-digit values are resolved here"""
+        result = pd.Series(None, index=whole.index, dtype=object)
+        digits = whole.astype(str)
+        eight = digits.str.len() == 8
+        if eight.any():
+            parsed = pd.to_datetime(digits[eight], format='%Y%m%d', errors='coerce')
+            valid = parsed.notna()
+            # Invalid 8-digit values fail strftime() and are passed through unchanged
+            result[eight[eight].index] = np.where(
+                valid,
+                _quote(parsed.dt.strftime('%Y-%m-%d').fillna('')),
+                _quote(original_text[eight])
+            )
+        return result
+
+    def _encode_int(self, values: pd.Series) -> Optional[pd.Series]:
+        try:
+            whole = values.astype('int64')
+        except (OverflowError, TypeError, ValueError):
+            return None
+        return self._encode_whole_number(whole, values.astype(str))
+
+    def _encode_float(self, values: pd.Series) -> Optional[pd.Series]:
+        values = values.astype(float)
+        result = pd.Series(None, index=values.index, dtype=object)
+        in_range = np.isfinite(values) & (values.abs() < 1e15)
+        if in_range.any():
+            finite = values[in_range]
+            result[finite.index] = self._encode_whole_number(finite.astype('int64'), finite.astype(str))
+        return result
+
+    def _encode_timestamp(self, values: pd.Series) -> Optional[pd.Series]:
+        if values.dtype.kind != 'M':
+            return None
+        return _quote(values.dt.strftime('%Y-%m-%d'))
+
+
+class TimestampEncoder(ColumnEncoder):
+    """START_TIME / END_TIME / LOAD_TIMESTAMP: normalize to 'YYYY-MM-DD HH:MM:SS'"""
+
+    name = 'timestamp'
+
+    def _encode_str(self, values: pd.Series) -> Optional[pd.Series]:
+        # Day-first parsing depends on each value's guessed format, so strings are
+        # rendered per distinct value by the reference renderer
+        return None
+
+    def _encode_int(self, values: pd.Series) -> Optional[pd.Series]:
+        return _quote(values.astype(str))
+
+    def _encode_float(self, values: pd.Series) -> Optional[pd.Series]:
+        return _quote(values.astype(str))
+
+    def _encode_timestamp(self, values: pd.Series) -> Optional[pd.Series]:
+        if values.dtype.kind != 'M':
+            return None
+        return _quote(values.dt.strftime('%Y-%m-%d %H:%M:%S'))
+
+
+class CurrencyEncoder(ColumnEncoder):
+    """REVENUE column: strip $, commas and spaces and render as a float"""
+
+    name = 'currency'
+
+    def _encode_str(self, values: pd.Series) -> Optional[pd.Series]:
+        cleaned = (
+            values.str.replace('$', '', regex=False)
+            .str.replace(',', '', regex=False)
+            .str.replace(' ', '', regex=False)
+            .str.strip()
+        )
+        result = pd.Series(None, index=values.index, dtype=object)
+        result[cleaned.isin(['-', ''])] = 'NULL'
+
+        numeric = pd.to_numeric(cleaned, errors='coerce').notna()
+        if numeric.any():
+            try:
+                # float() semantics for the values pandas recognises as numbers
+                floats = cleaned[numeric].astype(float)
+                result[floats.index] = floats.astype(str)
+            except ValueError:
+                pass
+        return result
+
+
+ENCODERS: Dict[str, ColumnEncoder] = {
+    encoder.name: encoder
+    for encoder in [StringEncoder(), NumericEncoder(), NullEncoder(), DateEncoder(),
+                    TimestampEncoder(), CurrencyEncoder()]
+}
+
+
+def select_encoder(column: str, values: pd.Series) -> ColumnEncoder:
+    """
+    Choose the encoder for a target column
+
+    Args:
+        column: Target column name
+        values: Column values
+
+    Returns:
+        ColumnEncoder instance
+    """
+    if column in DATE_COLUMNS:
+        return ENCODERS['date']
+    if column in TIMESTAMP_COLUMNS:
+        return ENCODERS['timestamp']
+    if column in CURRENCY_COLUMNS:
+        return ENCODERS['currency']
+    if len(values) and values.isna().all() and values.map(_is_legacy_null).all():
+        return ENCODERS['null']
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        return ENCODERS['numeric']
+    return ENCODERS['string']
+
+
+def _renders_as_objects(df: pd.DataFrame) -> bool:
+    """
+    True when DataFrame.values yields an object array (Python scalars per cell).
+
+    Frames made only of numpy numeric/datetime columns yield numpy scalars instead,
+    which the reference renderer formats differently, so they are rendered row by row.
+    """
+    return any(
+        dtype == object or not isinstance(dtype, np.dtype)
+        for dtype in df.dtypes
+    )
+
+
+def render_rows_rowwise(df: pd.DataFrame) -> List[str]:
+    """
+    Render each DataFrame row as a '(v1, v2, ...)' VALUES tuple, one cell at a time
+
+    Args:
+        df: DataFrame whose columns are platform_viewership column names
+
+    Returns:
+        List of row literal strings
+    """
+    columns = df.columns.tolist()
+    values_list = []
+    for row in df.values:
+        formatted_values = [render_literal(val, columns[idx]) for idx, val in enumerate(row)]
+        values_list.append(f"({', '.join(formatted_values)})")
+    return values_list
+
+
+def encode_columns(df: pd.DataFrame) -> List[np.ndarray]:
+    """
+    Encode every column of a DataFrame to SQL literal text
+
+    Args:
+        df: DataFrame whose columns are platform_viewership column names
+
+    Returns:
+        List of literal arrays, one per column, in column order
+    """
+    return [
+        select_encoder(column, df.iloc[:, idx]).encode(df.iloc[:, idx], column)
+        for idx, column in enumerate(df.columns)
+    ]
+
+
+def render_rows(df: pd.DataFrame) -> List[str]:
+    """
+    Render each DataFrame row as a '(v1, v2, ...)' VALUES tuple using column encoders
+
+    Output is identical to render_rows_rowwise().
+
+    Args:
+        df: DataFrame whose columns are platform_viewership column names
+
+    Returns:
+        List of row literal strings
+    """
+    if df.empty:
+        return []
+    if not _renders_as_objects(df):
+        return render_rows_rowwise(df)
+    encoded = encode_columns(df)
+    return [f"({', '.join(cells)})" for cells in zip(*encoded)]
+
+
+def render_csv(df: pd.DataFrame, use_column_encoders: bool = True, null_marker: str = '\\N') -> str:
+    """
+    Render a DataFrame as CSV text whose fields are the SQL literals of the VALUES path
+
+    Strings stay wrapped in single quotes with '' escapes, which is CSV quoting with
+    ' as the enclosure character, so COPY INTO loads the same values an INSERT would.
+
+    Args:
+        df: DataFrame whose columns are platform_viewership column names
+        use_column_encoders: Encode column-wise (False = row-at-a-time renderer)
+        null_marker: Text written for NULL cells (must match the file format's NULL_IF)
+
+    Returns:
+        CSV text, one line per row, no header
+    """
+    if df.empty:
+        return ''
+    if use_column_encoders and _renders_as_objects(df):
+        encoded = encode_columns(df)
+    else:
+        columns = df.columns.tolist()
+        rows = df.values
+        encoded = [
+            np.array([render_literal(val, columns[idx]) for val in rows[:, idx]], dtype=object)
+            for idx in range(len(columns))
+        ]
+    encoded = [np.where(cells == 'NULL', null_marker, cells) for cells in encoded]
+    return '\n'.join(','.join(cells) for cells in zip(*encoded)) + '\n'
+
+
+def find_renderer_mismatches(df: pd.DataFrame, limit: int = 20) -> List[Tuple[int, str, str, str]]:
+    """
+    Compare the column encoders against the row-at-a-time renderer
+
+    Args:
+        df: DataFrame to render both ways
+        limit: Maximum number of mismatches to report
+
+    Returns:
+        List of (row_position, column, rowwise_literal, encoded_literal) tuples;
+        empty when both renderers agree on every cell
+    """
+    mismatches = []
+    if df.empty or not _renders_as_objects(df):
+        return mismatches
+
+    encoded = encode_columns(df)
+    columns = df.columns.tolist()
+    for row_pos, row in enumerate(df.values):
+        for col_idx, val in enumerate(row):
+            expected = render_literal(val, columns[col_idx])
+            actual = encoded[col_idx][row_pos]
+            if expected != actual:
+                mismatches.append((row_pos, columns[col_idx], expected, actual))
+                if len(mismatches) >= limit:
+                    return mismatches
+    return mismatches
@@ -0,0 +1,198 @@
+"""
+Stage Loader
+Bulk ingest for platform_viewership: write each batch to a gzipped CSV file
+(or a Parquet file built from an Arrow table), upload it to a Snowflake internal
+stage with PUT, and load it with COPY INTO.
+
+The CSV fields are the same SQL literals the INSERT ... VALUES path renders
+(see src/sql_encoders.py), so both paths load identical values.
+"""
+
+import gzip
+import os
+import shutil
+import uuid
+from typing import List
+
+import pandas as pd
+
+from src.sql_encoders import render_csv
+
+# NULL cells are written as \N so a quoted 'NULL' string is still loaded as text
+NULL_MARKER = '\\N'
+
+# CSV fields use single quotes as the enclosure character with '' escapes,
+# exactly as the SQL literals are rendered
+CSV_FILE_FORMAT = (
+    "TYPE = CSV "
+    "FIELD_DELIMITER = ',' "
+    "FIELD_OPTIONALLY_ENCLOSED_BY = '0x27' "
+    "ESCAPE = NONE "
+    "ESCAPE_UNENCLOSED_FIELD = NONE "
+    "NULL_IF = ('\\\\N') "
+    "EMPTY_FIELD_AS_NULL = FALSE "
+    "COMPRESSION = GZIP"
+)
+
+# Parquet files keep numerics binary; logical types carry DATE/TIMESTAMP through.
+# They are loaded with MATCH_BY_COLUMN_NAME: table stages do not support a query as
+# the COPY source, and the file columns are already typed from the DDL template.
+PARQUET_FILE_FORMAT = "TYPE = PARQUET USE_LOGICAL_TYPE = TRUE"
+
+
+def write_batch_file(df: pd.DataFrame, directory: str, file_name: str, use_column_encoders: bool = True) -> str:
+    """
+    Write one batch of rows to a gzipped CSV file
+
+    Args:
+        df: Batch of transformed rows (columns are platform_viewership column names)
+        directory: Directory to write into
+        file_name: File name (should end in .csv.gz)
+        use_column_encoders: Render fields with the column-wise encoders
+
+    Returns:
+        Full path of the written file
+    """
+    path = os.path.join(directory, file_name)
+    with gzip.open(path, 'wt', encoding='utf-8', newline='') as f:
+        f.write(render_csv(df, use_column_encoders=use_column_encoders, null_marker=NULL_MARKER))
+    return path
+
+
+def write_parquet_file(table, directory: str, file_name: str) -> str:
+    """
+    Write an Arrow table to a Snappy-compressed Parquet file
+
+    Args:
+        table: pyarrow.Table (see src.viewership_schema.to_arrow_table)
+        directory: Directory to write into
+        file_name: File name (should end in .parquet)
+
+    Returns:
+        Full path of the written file
+    """
+    import pyarrow.parquet as pq
+
+    path = os.path.join(directory, file_name)
+    pq.write_table(table, path, compression='snappy')
+    return path
+
+
+def source_compression(path: str) -> str:
+    """PUT SOURCE_COMPRESSION for a batch file: GZIP for .csv.gz, NONE for Parquet"""
+    return 'GZIP' if path.endswith('.gz') else 'NONE'
+
+
+def _rows_loaded(cursor) -> int:
+    """Sum the rows_loaded column of a COPY INTO result"""
+    rows = cursor.fetchall()
+    columns = [col[0].lower() for col in (cursor.description or [])]
+    if 'rows_loaded' not in columns:
+        # "Copy executed with 0 files processed."
+        return 0
+    idx = columns.index('rows_loaded')
+    return sum(int(row[idx] or 0) for row in rows)
+
+
+class TableStage:
+    """The table's own Snowflake internal stage (@%table)"""
+
+    def __init__(self, cursor, table_name: str):
+        """
+        Args:
+            cursor: Snowflake cursor
+            table_name: Fully qualified table name (database.schema.table)
+        """
+        self.cursor = cursor
+        self.table_name = table_name
+        database, schema, table = table_name.split('.')
+        # Unique prefix so concurrent uploads never COPY each other's files
+        self.location = f"@{database}.{schema}.%{table}/streamlit_load_{uuid.uuid4().hex}"
+
+    def put(self, path: str):
+        """Upload a local file to the stage (gzipped CSV batches or Parquet files)"""
+        local = os.path.abspath(path).replace('\\', '/')
+        self.cursor.execute(
+            f"PUT 'file://{local}' '{self.location}' AUTO_COMPRESS = FALSE "
+            f"SOURCE_COMPRESSION = {source_compression(path)} OVERWRITE = TRUE"
+        )
+
+    def copy_into(self, columns: List[str], file_name: str, file_format: str = CSV_FILE_FORMAT) -> int:
+        """
+        COPY one staged file into the table
+
+        Args:
+            columns: Target columns, in file order (Parquet files are matched by column name)
+            file_name: Staged file name
+            file_format: FILE_FORMAT options
+
+        Returns:
+            Rows loaded, as reported by COPY INTO
+        """
+        if file_format == PARQUET_FILE_FORMAT:
+            target, match = self.table_name, "MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE"
+        else:
+            target, match = f"{self.table_name} ({', '.join(columns)})", ""
+        self.cursor.execute(f"""
+            COPY INTO {target}
+            FROM '{self.location}/'
+            FILES = ('{file_name}')
+            FILE_FORMAT = ({file_format})
+            {match}
+            ON_ERROR = ABORT_STATEMENT
+            PURGE = TRUE
+        """)
+        return _rows_loaded(self.cursor)
+
+    def remove(self):
+        """Remove any files left on the stage (e.g. after a failed COPY)"""
+        self.cursor.execute(f"REMOVE '{self.location}/'")
+
+
+class LocalStage:
+    """
+    Local stand-in for an internal stage
+
+    Accepts the same staged files as TableStage and "loads" them by parsing the
+    CSV back, so the staged output can be checked without a warehouse.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory: Directory that plays the role of the stage
+        """
+        self.directory = directory
+        self.loaded: List[pd.DataFrame] = []
+        os.makedirs(directory, exist_ok=True)
+
+    def put(self, path: str):
+        """Copy a local file onto the stage"""
+        shutil.copy(path, os.path.join(self.directory, os.path.basename(path)))
+
+    def copy_into(self, columns: List[str], file_name: str, file_format: str = CSV_FILE_FORMAT) -> int:
+        """Parse a staged file with the same rules COPY INTO uses"""
+        path = os.path.join(self.directory, file_name)
+        if file_format == PARQUET_FILE_FORMAT:
+            df = pd.read_parquet(path, columns=columns)
+            self.loaded.append(df)
+            os.remove(path)
+            return len(df)
+        df = pd.read_csv(
+            path,
+            compression='gzip',
+            header=None,
+            names=columns,
+            quotechar="'",
+            doublequote=True,
+            na_values=[NULL_MARKER],
+            keep_default_na=False,
+            dtype=str,
+        )
+        self.loaded.append(df)
+        os.remove(path)
+        return len(df)
+
+    def remove(self):
+        """Nothing to clean up between loads"""
+        pass
@@ -0,0 +1,77 @@
+"""
+Template Cache
+In-process cache of parsed viewership_file_formats configs.
+
+Lookups are keyed by (platform, partner, territory), compared case-insensitively as
+the lookup query does. Every entry remembers the table version it was read under:
+MAX(updated_date) and COUNT(*) of the table. A lookup first reads the current version
+(one aggregate query, much cheaper than fetching and parsing a config) and only uses
+an entry whose version still matches, so edits made by other processes are picked
+up at once. Edits made through this process invalidate the cache directly.
+"""
+
+import copy
+import threading
+from typing import Dict, Optional, Tuple
+
+
+def template_key(platform, partner, territory=None) -> Tuple[str, str, str]:
+    """Cache key of a lookup (case-insensitive, blank territory = no territory)"""
+    return (
+        str(platform or '').strip().lower(),
+        str(partner or '').strip().lower(),
+        str(territory or '').strip().lower(),
+    )
+
+
+class TemplateCache:
+    """Thread-safe map of lookup key -> parsed config (or None when nothing matched)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple, Tuple] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple, version: Tuple) -> Tuple[bool, Optional[Dict]]:
+        """
+        Look up a cached config
+
+        Args:
+            key: template_key() of the lookup
+            version: Current table version
+
+        Returns:
+            (found, config); config is a copy the caller may modify
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+            return True, copy.deepcopy(entry[1])
+
+    def put(self, key: Tuple, version: Tuple, config: Optional[Dict]):
+        """
+        Store a lookup result
+
+        Args:
+            key: template_key() of the lookup
+            version: Table version read before the config was fetched
+            config: Parsed config, or None when no config matched
+        """
+        with self._lock:
+            # Entries read under another version can never be served again
+            self._entries = {k: v for k, v in self._entries.items() if v[0] == version}
+            self._entries[key] = (version, copy.deepcopy(config))
+
+    def invalidate(self):
+        """Drop every entry (a config was inserted, updated or deleted)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """Entry and hit counts, for debugging"""
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,663 @@
+"""
+Transformation Plans
+Compiles a column_mappings transformation config into a plan of whole-column operations.
+
+apply_transformation used to run most step types as Series.apply with a Python
+lambda per value. A plan runs the string steps (split, extract_index,
+remove_prefix, trim_all, trim_ends, value_map, split_extract, clean_numeric) as
+Arrow compute kernels over the whole column, keeping the column in Arrow between
+consecutive string steps. Conditional steps compute one mask per condition and
+run each branch as its own plan on the rows it claims. Every operation
+reproduces preview_transformation_step on each value (Arrow's whitespace
+trimming matches str.strip()), so previews and loads agree.
+
+Compilation flattens nested chains and fuses `split` + `extract_index` into one
+bounded split. Steps without a kernel, and every step when pyarrow is not
+installed, run through their existing row-wise implementation. Plans are cached
+per config.
+
+Source columns (channel, partner, territory, series...) usually hold a few dozen
+distinct values over many rows. When a column's distinct values are few
+relative to its length, the plan runs on the distinct values only and the
+results are scattered back to the rows (factorize, then take).
+
+apply_transformations() plans the transformations of all mapped target columns
+together: targets reading the same source column run their common leading steps
+once and branch where their chains diverge.
+"""
+
+import functools
+import json
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.transformations import (
+    PLAIN_NUMBER_PATTERN,
+    TRANSFORMATION_CLASSES,
+    CleanNumericTransformation,
+    DateFormatTransformation,
+    SplitExtractTransformation,
+    apply_conditional_transformation,
+    as_text,
+    blank_mask,
+    compiled_pattern,
+    detect_date_format,
+    is_literal_pattern,
+    preview_transformation_step,
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+    pc = None
+
+# Compiled plans kept in memory, keyed by the serialized config
+PLAN_CACHE_SIZE = 256
+
+# Run plans on distinct values only for columns of at least MEMOIZE_MIN_ROWS rows
+# with at most MEMOIZE_MAX_UNIQUE_RATIO distinct values per row. Plans made only of
+# Arrow kernels are nearly as fast as factorizing, so they need far fewer distinct
+# values (MEMOIZE_MAX_UNIQUE_RATIO_KERNELS) to gain.
+MEMOIZE_MIN_ROWS = 1000
+MEMOIZE_MAX_UNIQUE_RATIO = 0.5
+MEMOIZE_MAX_UNIQUE_RATIO_KERNELS = 0.01
+
+# Leading rows counted first: more distinct values than allowed among them rules
+# out memoizing without factorizing the whole column
+MEMOIZE_SAMPLE_ROWS = 10000
+
+def arrow_available() -> bool:
+    """True when plans can run their Arrow kernels"""
+    return pa is not None
+
+
+class PlanStep:
+    """
+    One operation of a plan
+
+    on_series is always available. on_text, when set, is the Arrow kernel used
+    instead: it receives the column as an Arrow string array (empty values as '')
+    and returns an Arrow array to keep working in Arrow, or a numpy array that
+    ends the Arrow segment.
+    """
+
+    def __init__(self, description: str, on_series: Callable[[pd.Series], pd.Series],
+                 on_text: Optional[Callable] = None):
+        self.description = description
+        self.on_series = on_series
+        self.on_text = on_text
+
+
+def _to_text(data: pd.Series):
+    """Column as an Arrow string array, with empty values as ''"""
+    if data.dtype == object:
+        try:
+            # Columns of str (and missing values) convert directly
+            return pa.array(data.to_numpy(), type=pa.large_string(), from_pandas=True).fill_null('')
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass
+    text = as_text(data).to_numpy(dtype=object)
+    text[blank_mask(data).to_numpy()] = ''
+    return pa.array(text, type=pa.large_string())
+
+
+def _from_text(text, data: pd.Series) -> pd.Series:
+    return pd.Series(text.to_numpy(zero_copy_only=False), index=data.index, name=data.name)
+
+
+def _from_values(values, data: pd.Series, infer_dtypes: bool) -> pd.Series:
+    """
+    Series of per-row results; with infer_dtypes the dtype is inferred from the
+    values as Series.apply does, otherwise the values are kept as objects
+    """
+    result = pd.Series(values, index=data.index, name=data.name, dtype=object)
+    return result.infer_objects() if infer_dtypes else result
+
+
+def _split_index_kernel(delimiter: str, index: int):
+    """`split` + `extract_index`: the index-th part, or '' when there are fewer parts"""
+    def run(text):
+        parts = pc.split_pattern(text, delimiter, max_splits=index + 1)
+        part = pc.list_slice(parts, index, index + 1, return_fixed_size_list=True)
+        return pc.list_flatten(part).fill_null('')
+    return run
+
+
+def _strip_prefix(text, prefix: str):
+    """str.strip(), then drop prefix (and strip again) where present"""
+    stripped = pc.utf8_trim_whitespace(text)
+    if not prefix:
+        return stripped
+    rest = pc.utf8_trim_whitespace(pc.utf8_slice_codeunits(stripped, len(prefix)))
+    return pc.if_else(pc.starts_with(stripped, prefix), rest, stripped)
+
+
+def _split_extract_kernel(transform: SplitExtractTransformation):
+    def run(text):
+        parts = pc.split_pattern(text, transform.delimiter, max_splits=transform.index + 1)
+        part = pc.list_slice(parts, transform.index, transform.index + 1, return_fixed_size_list=True)
+        return _strip_prefix(pc.list_flatten(part).fill_null(''), transform.strip_prefix)
+    return run
+
+
+def _value_map_kernel(mapping: Dict, default):
+    keys = [str(key) for key in mapping]
+    # Last slot holds the default, for unmapped and empty values
+    values = np.empty(len(keys) + 1, dtype=object)
+    values[:] = list(mapping.values()) + [default]
+
+    def run(text):
+        value_set = pa.array(keys, type=pa.large_string())
+        positions = pc.index_in(pc.utf8_trim_whitespace(text), value_set=value_set)
+        return values[positions.fill_null(len(keys)).to_numpy(zero_copy_only=False)]
+    return run
+
+
+def _value_map_series(mapping: Dict, default, infer_dtypes: bool):
+    def run(data):
+        stripped = as_text(data).str.strip().to_numpy(dtype=object)
+        blank = data.isna().to_numpy() | (stripped == '')
+        values = [default if is_blank else mapping.get(key, default) for key, is_blank in zip(stripped, blank)]
+        return _from_values(values, data, infer_dtypes)
+    return run
+
+
+def _clean_numeric_kernel(transform: CleanNumericTransformation):
+    def run(text):
+        cleaned = pc.utf8_trim_whitespace(text)
+        for char in (',', '$', '%', ' '):
+            cleaned = pc.replace_substring(cleaned, char, '')
+        cleaned = pc.if_else(pc.equal(cleaned, ''), '0', cleaned)
+        if pc.all(pc.match_substring_regex(cleaned, f"^{PLAIN_NUMBER_PATTERN}$")).as_py():
+            # Plain decimals parse to the same (correctly rounded) float in Arrow
+            return transform.round_values(pc.cast(cleaned, pa.float64()).to_numpy())
+        return transform.parse_cleaned(cleaned.to_numpy(zero_copy_only=False))
+    return run
+
+
+def _parse_date(params: Dict):
+    """parse_date, auto-detecting the input format from the column when none is given"""
+    def run(data):
+        if params.get('input_format') is None:
+            detected_format = detect_date_format(data)
+            if detected_format:
+                return DateFormatTransformation(**{**params, 'input_format': detected_format}).apply_series(data)
+        return DateFormatTransformation(**params).apply_series(data)
+    return run
+
+
+def _per_value(*steps: Dict, infer_dtypes: bool = True):
+    """preview_transformation_step, for each step in turn, on every value"""
+    def apply_steps(value):
+        for step in steps:
+            value = preview_transformation_step(value, step)
+        return value
+    return lambda data: _from_values([apply_steps(value) for value in data.to_numpy(dtype=object)],
+                                     data, infer_dtypes)
+
+
+def _flatten(config: Dict) -> List[Dict]:
+    """Steps of a config in execution order, with nested chains expanded"""
+    if config.get('type') == 'chain':
+        steps = []
+        for step in config.get('steps', []):
+            steps.extend(_flatten(step))
+        return steps
+    return [config]
+
+
+def _condition_text(data: pd.Series):
+    """The string conditions are tested against: str(value), or '' when missing"""
+    if arrow_available():
+        return _to_text(data)
+    return as_text(data).where(data.notna(), '')
+
+
+def _condition_mask(text, condition: Dict) -> np.ndarray:
+    """Rows matching one condition of a conditional step"""
+    condition_type = condition.get('type')
+    check_value = condition.get('value', '')
+
+    if condition_type == 'regex_match' and is_literal_pattern(check_value):
+        # A search for a literal pattern is a substring test
+        condition_type = 'contains'
+    elif condition_type == 'regex_match':
+        if arrow_available():
+            text = pd.Series(text.to_numpy(zero_copy_only=False), dtype=object)
+        return text.str.contains(compiled_pattern(check_value), regex=True).to_numpy(dtype=bool)
+
+    if arrow_available():
+        kernels = {'contains': pc.match_substring, 'starts_with': pc.starts_with,
+                   'ends_with': pc.ends_with, 'equals': pc.equal}
+        if condition_type in kernels:
+            return kernels[condition_type](text, check_value).to_numpy(zero_copy_only=False)
+    elif condition_type == 'contains':
+        return text.str.contains(check_value, regex=False).to_numpy(dtype=bool)
+    elif condition_type == 'starts_with':
+        return text.str.startswith(check_value).to_numpy(dtype=bool)
+    elif condition_type == 'ends_with':
+        return text.str.endswith(check_value).to_numpy(dtype=bool)
+    elif condition_type == 'equals':
+        return (text == check_value).to_numpy(dtype=bool)
+
+    # Unknown condition types never match
+    return np.zeros(len(text), dtype=bool)
+
+
+def _branch_plan(steps: List[Dict]) -> 'TransformationPlan':
+    """
+    Plan for the steps of one conditional branch
+
+    Branch steps run like preview_transformation_step: a nested chain is not
+    expanded, parse_date does not auto-detect the input format and values keep
+    their types until the whole conditional is assembled.
+    """
+    steps = [step if step.get('type') != 'chain' else {'type': 'nested_chain'} for step in steps]
+    return TransformationPlan({'type': 'chain', 'steps': steps}, detect_dates=False, infer_dtypes=False,
+                              memoize=False)
+
+
+def _conditional(step: Dict, infer_dtypes: bool) -> PlanStep:
+    """
+    Conditional step evaluated with one mask per condition
+
+    Conditions are tested over the whole column in order. Each branch's steps run
+    once on the rows it claims (first match wins), the else steps on the rest, and
+    the results are put back in row order.
+    """
+    conditions = step.get('conditions', [])
+    else_steps = step.get('else_steps', [])
+
+    if not all(isinstance(condition.get('value', ''), str) for condition in conditions):
+        # Non-text values cannot be tested over a string column; keep the row-wise rules
+        return PlanStep('conditional (per value)', lambda data: _from_values(
+            [apply_conditional_transformation(value, step) for value in data.to_numpy(dtype=object)],
+            data, infer_dtypes))
+
+    branches = [(condition, _branch_plan(condition.get('steps', []))) for condition in conditions]
+    else_plan = _branch_plan(else_steps) if else_steps else None
+
+    def run(data):
+        text = _condition_text(data)
+        remaining = np.ones(len(data), dtype=bool)
+        values = data.to_numpy(dtype=object).copy()
+
+        for condition, plan in branches:
+            if not remaining.any():
+                break
+            claimed = remaining & _condition_mask(text, condition)
+            if claimed.any():
+                values[claimed] = plan.run(data[claimed]).to_numpy(dtype=object)
+                remaining &= ~claimed
+
+        if else_plan is not None and remaining.any():
+            values[remaining] = else_plan.run(data[remaining]).to_numpy(dtype=object)
+
+        return _from_values(values, data, infer_dtypes)
+
+    return PlanStep(f"conditional ({len(conditions)} condition(s))", run)
+
+
+def _compile_step(step: Dict, detect_dates: bool = True, infer_dtypes: bool = True) -> PlanStep:
+    """Operation for one step applied to scalar values"""
+    trans_type = step.get('type')
+    params = step.get('params', {})
+
+    if trans_type == 'conditional':
+        return _conditional(step, infer_dtypes)
+    if trans_type == 'split':
+        return PlanStep('split', _per_value(step, infer_dtypes=infer_dtypes))
+    if trans_type == 'extract_index':
+        # Scalars pass through extract_index unchanged
+        return PlanStep('extract_index (no-op)', lambda data: data)
+    if trans_type == 'remove_prefix':
+        prefix = params.get('prefix', '')
+        return PlanStep('remove_prefix', _per_value(step), lambda text: _strip_prefix(text, prefix))
+    if trans_type == 'trim_all':
+        return PlanStep('trim_all', _per_value(step), lambda text: pc.replace_substring(text, ' ', ''))
+    if trans_type == 'trim_ends':
+        return PlanStep('trim_ends', _per_value(step), lambda text: pc.utf8_trim_whitespace(text))
+    if trans_type == 'value_map':
+        mapping, default = params.get('mapping', {}), params.get('default', '')
+        return PlanStep('value_map', _value_map_series(mapping, default, infer_dtypes),
+                        _value_map_kernel(mapping, default))
+    if trans_type == 'regex_replace':
+        pattern, replacement = params.get('pattern', ''), params.get('replacement', '')
+        kernel = None
+        if is_literal_pattern(pattern) and isinstance(replacement, str) and '\\' not in replacement:
+            # Literal pattern and replacement: a plain substring replacement
+            kernel = lambda text: pc.utf8_trim_whitespace(pc.replace_substring(text, pattern, replacement))
+        return PlanStep('regex_replace', lambda data: as_text(data).str.replace(
+            compiled_pattern(pattern), replacement, regex=True).str.strip().where(~blank_mask(data), ''), kernel)
+    if trans_type == 'parse_date':
+        if not detect_dates:
+            return PlanStep('parse_date', DateFormatTransformation(**params).apply_series)
+        return PlanStep('parse_date', _parse_date(params))
+    if trans_type == 'split_extract':
+        transform = SplitExtractTransformation(**params)
+        kernel = None
+        if transform.delimiter != '' and transform.index >= 0:
+            kernel = _split_extract_kernel(transform)
+        return PlanStep('split_extract', transform.apply_series, kernel)
+    if trans_type == 'clean_numeric':
+        transform = CleanNumericTransformation(**params)
+        return PlanStep('clean_numeric', transform.apply_series, _clean_numeric_kernel(transform))
+    if trans_type in TRANSFORMATION_CLASSES:
+        return PlanStep(trans_type, TRANSFORMATION_CLASSES[trans_type](**params).apply_series)
+    # Unknown step types leave the data unchanged
+    return PlanStep(f"{trans_type} (no-op)", lambda data: data)
+
+
+def _distinct_rows(data: pd.Series, kernels_only: bool) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Factorize a column when it has few enough distinct values to be worth it
+
+    Args:
+        data: Column to factorize
+        kernels_only: The work to memoize runs as Arrow kernels only
+
+    Returns:
+        (row of the first occurrence of each distinct value, code of every row),
+        or None when the column has too many distinct values (or unhashable ones)
+    """
+    limit = len(data) * (MEMOIZE_MAX_UNIQUE_RATIO_KERNELS if kernels_only else MEMOIZE_MAX_UNIQUE_RATIO)
+    try:
+        if data.iloc[:MEMOIZE_SAMPLE_ROWS].nunique(dropna=False) > limit:
+            return None
+        codes, uniques = pd.factorize(data)
+    except TypeError:
+        return None
+    if len(uniques) > limit:
+        return None
+
+    # factorize treats 1, 1.0 and True (and None, NaN and NaT) as one value, but steps
+    # may not: in object columns, such values are told apart by their type
+    nulls = codes == -1
+    if data.dtype == object and pd.api.types.infer_dtype(data, skipna=True) not in ('string', 'empty'):
+        type_codes, types = pd.factorize(np.frompyfunc(type, 1, 1)(data.to_numpy(dtype=object)))
+        codes = pd.factorize(codes * len(types) + type_codes)[0]
+    elif nulls.any():
+        codes = codes.copy()
+        if data.dtype == object:
+            null_types = np.frompyfunc(type, 1, 1)(data.to_numpy(dtype=object)[nulls])
+            codes[nulls] = len(uniques) + pd.factorize(null_types)[0]
+        else:
+            codes[nulls] = len(uniques)
+
+    # Row of the first occurrence of each code (codes number values by first appearance)
+    rows = np.arange(len(codes))
+    first = np.empty(codes.max(initial=-1) + 1, dtype=rows.dtype)
+    first[codes[::-1]] = rows[::-1]
+    return first, codes
+
+
+def _scatter(result: pd.Series, codes: np.ndarray, data: pd.Series) -> pd.Series:
+    """Results computed per distinct value, back on the rows of data"""
+    return pd.Series(result.array.take(codes), index=data.index, name=data.name)
+
+
+class TransformationPlan:
+    """A compiled transformation: whole-column operations run in order"""
+
+    def __init__(self, config: Dict, detect_dates: bool = True, infer_dtypes: bool = True,
+                 memoize: bool = True):
+        """
+        Args:
+            config: Transformation config (single step, chain or conditional)
+            detect_dates: Let parse_date steps without input_format detect it from the column
+            infer_dtypes: Infer the dtype of mixed per-row results after each step (as
+                Series.apply does); otherwise they stay object
+            memoize: Run on distinct values only when the column has few of them
+        """
+        self.config = config
+        self.infer_dtypes = infer_dtypes
+        self.memoize = memoize
+        self.steps: List[PlanStep] = []
+
+        steps = _flatten(config)
+        holds_lists = False
+        i = 0
+        while i < len(steps):
+            step = steps[i]
+            trans_type = step.get('type')
+            delimiter = step.get('params', {}).get('delimiter', ',')
+            following = steps[i + 1] if i + 1 < len(steps) else {}
+            index = following.get('params', {}).get('index', 0)
+
+            if (trans_type == 'split' and not holds_lists and following.get('type') == 'extract_index'
+                    and isinstance(index, int) and index >= 0 and delimiter != ''):
+                self.steps.append(PlanStep(f"split+extract_index[{index}]",
+                                           _per_value(step, following, infer_dtypes=infer_dtypes),
+                                           _split_index_kernel(delimiter, index)))
+                i += 2
+                continue
+
+            if holds_lists:
+                # The column holds lists from an unfused split; only per-value steps apply
+                self.steps.append(PlanStep(f"{trans_type} (per value)", _per_value(step, infer_dtypes=infer_dtypes)))
+            else:
+                self.steps.append(_compile_step(step, detect_dates, infer_dtypes))
+            holds_lists = trans_type == 'split'
+            i += 1
+
+    @property
+    def descriptions(self) -> List[str]:
+        return [step.description for step in self.steps]
+
+    def run(self, data: pd.Series) -> pd.Series:
+        """
+        Apply the plan to a column
+
+        Args:
+            data: Input pandas Series
+
+        Returns:
+            Transformed pandas Series (same index and name)
+        """
+        if self.memoize and len(data) >= MEMOIZE_MIN_ROWS:
+            result = self._run_memoized(data)
+            if result is not None:
+                return result
+        return self._run_steps(data)
+
+    @property
+    def kernels_only(self) -> bool:
+        """True when every step runs as an Arrow kernel"""
+        return arrow_available() and all(step.on_text is not None for step in self.steps)
+
+    def _run_memoized(self, data: pd.Series) -> Optional[pd.Series]:
+        """
+        Run the steps on the distinct values of the column and scatter the results
+
+        Every step is a function of the value alone, and parse_date detection only
+        looks at distinct values in order of first appearance, so the result is the
+        same as running on the whole column.
+
+        Returns:
+            Transformed Series, or None when the column has too many distinct
+            values (or unhashable ones)
+        """
+        distinct = _distinct_rows(data, self.kernels_only)
+        if distinct is None:
+            return None
+        first, codes = distinct
+        return _scatter(self._run_steps(data.iloc[first].reset_index(drop=True)), codes, data)
+
+    def _run_steps(self, data: pd.Series, text=None, keep_text: bool = False):
+        """
+        Run the steps on a column
+
+        Args:
+            data: Input column
+            text: The same column already converted by _to_text (None = not converted)
+            keep_text: Return (result, text) where text is the output still in Arrow
+                (result is then stale) or None
+
+        Returns:
+            Transformed Series, or (result, text) with keep_text
+        """
+        result = data
+        for step in self.steps:
+            if step.on_text is not None and arrow_available():
+                if text is None:
+                    text = _to_text(result)
+                output = step.on_text(text)
+                if isinstance(output, np.ndarray):
+                    result = _from_values(output, data, self.infer_dtypes) if output.dtype == object \
+                        else pd.Series(output, index=data.index, name=data.name)
+                    text = None
+                else:
+                    text = output
+                continue
+
+            if text is not None:
+                result = _from_text(text, data)
+                text = None
+            result = step.on_series(result)
+
+        if keep_text:
+            return result, text
+        if text is not None:
+            result = _from_text(text, data)
+        return result
+
+
+@functools.lru_cache(maxsize=PLAN_CACHE_SIZE)
+def _compile_cached(config_json: str, memoize: bool) -> TransformationPlan:
+    return TransformationPlan(json.loads(config_json), memoize=memoize)
+
+
+def compile_transformation(config: Dict, memoize: bool = True) -> TransformationPlan:
+    """
+    Compile a transformation config, reusing the plan of an identical config
+
+    Args:
+        config: Transformation config (see apply_transformation)
+        memoize: Let the plan run on distinct values only (see TransformationPlan)
+
+    Returns:
+        TransformationPlan
+    """
+    try:
+        config_json = json.dumps(config, sort_keys=True)
+    except TypeError:
+        # Configs holding non-JSON values are compiled without caching
+        return TransformationPlan(config, memoize=memoize)
+    return _compile_cached(config_json, memoize)
+
+
+def _units(config: Dict) -> List[List[Dict]]:
+    """
+    Steps of a config grouped into the units a chain may be cut between
+
+    A split is kept together with the steps that follow it, since those steps
+    work on the lists it produces.
+    """
+    units = []
+    for step in _flatten(config):
+        if units and units[-1][-1].get('type') == 'split':
+            units[-1].append(step)
+        else:
+            units.append([step])
+    return units
+
+
+def _unit_key(unit: List[Dict]) -> str:
+    return json.dumps(unit, sort_keys=True, default=repr)
+
+
+def _run_shared(data: pd.Series, text, branches: List[Tuple[str, List[List[Dict]]]], results: Dict,
+                errors: Dict):
+    """
+    Run the remaining units of several targets over the same input, running
+    each leading run of units the targets have in common only once
+
+    Args:
+        data: Input shared by the branches
+        text: data already converted by _to_text, or None
+        branches: (target, remaining units) pairs
+        results: Filled with target -> transformed Series
+        errors: Filled with target -> exception raised by its transformation
+    """
+    groups: Dict[str, List[Tuple[str, List[List[Dict]]]]] = {}
+    for target, units in branches:
+        if not units:
+            results[target] = _from_text(text, data) if text is not None else data
+        else:
+            groups.setdefault(_unit_key(units[0]), []).append((target, units))
+
+    for group in groups.values():
+        keys = [[_unit_key(unit) for unit in units] for _, units in group]
+        shared = 0
+        while all(len(k) > shared and k[shared] == keys[0][shared] for k in keys):
+            shared += 1
+        steps = [step for unit in group[0][1][:shared] for step in unit]
+        try:
+            plan = compile_transformation({'type': 'chain', 'steps': steps}, memoize=False)
+            # Intermediate results stay in Arrow between consecutive string steps
+            output, output_text = plan._run_steps(data, text, keep_text=True)
+        except Exception as e:
+            for target, _ in group:
+                errors[target] = e
+            continue
+        _run_shared(output, output_text, [(target, units[shared:]) for target, units in group], results, errors)
+
+
+def apply_transformations(df: pd.DataFrame, transformations: Dict[str, Tuple[str, Dict]]) -> Dict:
+    """
+    Apply the transformations of several target columns, sharing common work
+
+    Targets reading the same source column are planned together: leading steps
+    their chains have in common (e.g. the same trim or split before different
+    extractions) run once and the chains branch where they diverge. When the
+    column has few distinct values it is factorized once for all its targets
+    instead of once per target. Every result equals apply_transformation() on
+    that target alone.
+
+    Args:
+        df: Source DataFrame
+        transformations: target -> (source column, transformation config)
+
+    Returns:
+        {
+            'columns': {target: transformed Series},
+            'errors': {target: exception raised by its transformation}
+        }
+    """
+    results, errors = {}, {}
+    by_source: Dict[str, List[Tuple[str, Dict]]] = {}
+    for target, (source_col, config) in transformations.items():
+        by_source.setdefault(source_col, []).append((target, config))
+
+    for source_col, targets in by_source.items():
+        data = df[source_col]
+        if len(targets) == 1:
+            target, config = targets[0]
+            try:
+                results[target] = compile_transformation(config).run(data)
+            except Exception as e:
+                errors[target] = e
+            continue
+
+        branches = [(target, _units(config)) for target, config in targets]
+        try:
+            kernels_only = all(compile_transformation(config).kernels_only for _, config in targets)
+        except Exception:
+            # Invalid configs (e.g. a bad regex_extract pattern) fail in _run_shared, per target
+            kernels_only = False
+        distinct = _distinct_rows(data, kernels_only) if len(data) >= MEMOIZE_MIN_ROWS else None
+        if distinct is None:
+            _run_shared(data, None, branches, results, errors)
+            continue
+
+        first, codes = distinct
+        distinct_results = {}
+        _run_shared(data.iloc[first].reset_index(drop=True), None, branches, distinct_results, errors)
+        for target, result in distinct_results.items():
+            results[target] = _scatter(result, codes, data)
+
+    return {'columns': results, 'errors': errors}
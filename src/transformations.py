@@ -3,10 +3,83 @@ Data transformation utilities for column mapping
 Handles field-level transformations like parsing time, extracting values, etc.
 """
 
+import functools
+import json
+import numpy as np
 import pandas as pd
 import re
+import threading
 from datetime import datetime, timedelta
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+    pc = None
+
+
+def blank_mask(series: pd.Series) -> pd.Series:
+    """Rows the transformations treat as empty (`pd.isna(value) or value == ''`)"""
+    blank = series.isna()
+    if series.dtype.kind not in 'biufcmM':
+        blank |= series == ''
+    return blank
+
+
+def as_text(series: pd.Series) -> pd.Series:
+    """str(value) for every row, as an object Series"""
+    if series.dtype == object:
+        return series.astype(str)
+    # Go through Python objects so e.g. datetimes render like str(Timestamp)
+    return series.astype(object).astype(str)
+
+
+# Compiled regex patterns kept for the life of the process (shared by every
+# transformation, row, chunk and file using the same pattern)
+REGEX_CACHE_SIZE = 512
+
+# Characters with a special meaning in a regex; patterns without any match literally
+REGEX_SPECIAL_CHARACTERS = frozenset('.^$*+?{}[]\\|()')
+
+
+@functools.lru_cache(maxsize=REGEX_CACHE_SIZE)
+def compiled_pattern(pattern: str) -> re.Pattern:
+    """re.compile(pattern), compiled once per pattern"""
+    return re.compile(pattern)
+
+
+def is_literal_pattern(pattern) -> bool:
+    """True when a regex pattern matches exactly its own (non-empty) text"""
+    return isinstance(pattern, str) and pattern != '' and REGEX_SPECIAL_CHARACTERS.isdisjoint(pattern)
+
+
+def condition_matches(condition: Dict, value_str: str) -> bool:
+    """
+    Whether a condition of a conditional transformation matches a value
+
+    Args:
+        condition: {'type': 'contains' | 'starts_with' | 'ends_with' | 'equals' | 'regex_match', 'value': ...}
+        value_str: str(value), or '' for missing values
+
+    Returns:
+        True when the condition matches (unknown condition types never match)
+    """
+    condition_type = condition.get('type')
+    check_value = condition.get('value', '')
+
+    if condition_type == 'contains':
+        return check_value in value_str
+    elif condition_type == 'starts_with':
+        return value_str.startswith(check_value)
+    elif condition_type == 'ends_with':
+        return value_str.endswith(check_value)
+    elif condition_type == 'equals':
+        return value_str == check_value
+    elif condition_type == 'regex_match':
+        return bool(compiled_pattern(check_value).search(value_str))
+    return False
 
 
 class FieldTransformation:
@@ -77,6 +150,95 @@ class TimeFormatTransformation(FieldTransformation):
         except (ValueError, AttributeError):
             return 0.0
 
+    def apply_series(self, series: pd.Series) -> pd.Series:
+        """
+        Parse a whole column with the same results as apply()
+
+        Texts are split on ':' into a matrix of their first three parts (Arrow
+        kernels; pandas' str.split runs per value and is no faster than apply()).
+        2- and 3-part values whose parts are plain integers are combined with array
+        arithmetic in apply()'s order of operations, and single-part plain numbers
+        are converted at once. Anything else (e.g. int() accepting '1_0' or
+        non-ASCII digits) goes through apply().
+        """
+        if len(series) == 0:
+            return series.apply(self.apply)
+        if series.dtype.kind in 'biuf':
+            # Plain numbers: float(value), with missing values as 0.0
+            return series.astype(float).fillna(0.0)
+        if pc is None:
+            return super().apply_series(series)
+
+        source = series.to_numpy(dtype=object)
+        try:
+            # Columns of str (and missing values) convert directly; after stripping,
+            # empty texts (blank or whitespace-only values) all give 0.0
+            text = pc.utf8_trim_whitespace(pa.array(source, type=pa.large_string(), from_pandas=True).fill_null(''))
+            empty = pc.equal(text, '').to_numpy(zero_copy_only=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            try:
+                text = pc.utf8_trim_whitespace(pa.array(as_text(series).to_numpy(dtype=object), type=pa.large_string()))
+            except (pa.ArrowInvalid, pa.ArrowTypeError, UnicodeEncodeError):
+                # Text Arrow cannot hold (e.g. lone surrogates)
+                return super().apply_series(series)
+            empty = blank_mask(series).to_numpy()
+
+        result = np.zeros(len(series))
+        parts = pc.split_pattern(text, ':')
+        counts = pc.list_value_length(parts).to_numpy()
+
+        plain = pc.match_substring_regex(text, f'^{PLAIN_NUMBER_PATTERN}$').to_numpy(zero_copy_only=False)
+        plain &= (counts == 1) & ~empty
+        numbers = pc.cast(pc.if_else(pa.array(plain), text, '0'), pa.float64()).to_numpy()
+        result[plain] = numbers[plain]
+
+        # (rows, 3) matrix of the parts of 2- and 3-part values, '0' everywhere else
+        three = counts == 3
+        candidates = ((counts == 2) | three) & ~empty
+        cells = pc.list_flatten(pc.list_slice(parts, 0, 3, return_fixed_size_list=True)).fill_null('0')
+        cells = pc.utf8_trim_whitespace(pc.if_else(pa.array(np.repeat(candidates, 3)), cells, '0'))
+        values, integer = self._integer_cells(cells)
+        values, integer = values.reshape(-1, 3), integer.reshape(-1, 3)
+        first, second, third = values[:, 0], values[:, 1], values[:, 2]
+
+        timed = candidates & integer[:, 0] & integer[:, 1] & (integer[:, 2] | ~three)
+        # hh:mm:ss; hh:mm when the first part is above 24, otherwise mm:ss
+        hours_first = three | (first > 24)
+        hours = np.where(hours_first, first, 0)
+        minutes = np.where(hours_first, second, first)
+        seconds = np.where(three, third, np.where(hours_first, 0, second))
+        if self.output_unit == 'hours':
+            parsed = hours.astype(float) + (minutes / 60) + (seconds / 3600)
+        else:
+            parsed = (hours * 60 + minutes).astype(float) + (seconds / 60)
+        result[timed] = parsed[timed]
+
+        for row in np.flatnonzero(~(plain | timed | empty)):
+            result[row] = self.apply(source[row])
+        return pd.Series(result, index=series.index, name=series.name)
+
+    @staticmethod
+    def _integer_cells(cells):
+        """
+        int() of each cell of an Arrow string array, where it is a plain integer
+
+        Returns:
+            (int64 values with 0 where not a plain integer, mask of plain integers)
+        """
+        # At most 15 digits, so every intermediate value is exact in int64 and float64
+        limit = 10 ** 15
+        try:
+            values = pc.cast(cells, pa.int64()).to_numpy()
+            if np.abs(values).max(initial=0) < limit:
+                return values, np.ones(len(values), dtype=bool)
+        except pa.ArrowInvalid:
+            pass
+        # Some cells are not plain (or have a '+' sign, which Arrow does not parse)
+        integer = pc.match_substring_regex(cells, r'^[+-]?[0-9]{1,15}$')
+        unsigned = pc.if_else(pc.starts_with(cells, '+'), pc.utf8_slice_codeunits(cells, 1), cells)
+        values = pc.cast(pc.if_else(integer, unsigned, '0'), pa.int64()).to_numpy()
+        return values, integer.to_numpy(zero_copy_only=False)
+
 
 class RegexExtractTransformation(FieldTransformation):
     """Extract value using regex pattern"""
@@ -92,7 +254,7 @@ class RegexExtractTransformation(FieldTransformation):
             name="regex_extract",
             description=f"Extract using pattern: {pattern}"
         )
-        self.pattern = re.compile(pattern)
+        self.pattern = compiled_pattern(pattern)
         self.group = group
         self.default = default
 
@@ -146,6 +308,10 @@ class SplitExtractTransformation(FieldTransformation):
             return ''
 
 
+# Numbers float() and every fast parser read identically
+PLAIN_NUMBER_PATTERN = r'[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?'
+
+
 class CleanNumericTransformation(FieldTransformation):
     """Clean numeric values (remove commas, currency symbols, etc.)"""
 
@@ -183,6 +349,45 @@ class CleanNumericTransformation(FieldTransformation):
         except (ValueError, AttributeError):
             return 0.0
 
+    def apply_series(self, series: pd.Series) -> pd.Series:
+        """Clean and convert the whole column (same result as apply on each value)"""
+        if series.dtype.kind in 'iuf':
+            # str() of a number parses back to the same float
+            values = self.round_values(series.astype(float).fillna(0.0).to_numpy())
+            return pd.Series(values, index=series.index, name=series.name)
+
+        cleaned = as_text(series).str.strip().str.replace(r'[,$% ]', '', regex=True).to_numpy(dtype=object)
+        cleaned[blank_mask(series).to_numpy()] = ''
+        return pd.Series(self.parse_cleaned(cleaned), index=series.index, name=series.name)
+
+    def parse_cleaned(self, cleaned: np.ndarray) -> np.ndarray:
+        """
+        Convert strings that are already stripped of ',', '$', '%' and spaces
+
+        Args:
+            cleaned: Object array of str ('' for empty values)
+
+        Returns:
+            float64 array (same values apply would give)
+        """
+        cleaned = cleaned.copy()
+        cleaned[cleaned == ''] = '0'
+        try:
+            values = cleaned.astype(float)
+        except ValueError:
+            # Only plain decimals are converted in bulk; anything else goes through apply
+            plain = pd.Series(cleaned).str.fullmatch(PLAIN_NUMBER_PATTERN).to_numpy()
+            values = np.zeros(len(cleaned))
+            values[plain] = cleaned[plain].astype(float)
+            values[~plain] = [self.apply(value) for value in cleaned[~plain]]
+        return self.round_values(values)
+
+    def round_values(self, values: np.ndarray) -> np.ndarray:
+        """Round like apply does (Python's round, not numpy's)"""
+        if self.decimal_places is None:
+            return values
+        return np.array([round(value, self.decimal_places) for value in values.tolist()], dtype=float)
+
 
 def detect_date_format(data: pd.Series, sample_size: int = 200) -> Optional[str]:
     """
@@ -209,11 +414,15 @@ def detect_date_format(data: pd.Series, sample_size: int = 200) -> Optional[str]
 
     # Get unique values to avoid date-sorted bias (e.g., all "01-10-2025" at start)
     # This ensures we see the full range of dates for violation detection
-    data_clean = data.dropna().astype(str)
+    data_clean = data.dropna()
     if len(data_clean) == 0:
         return None
 
-    unique_dates = data_clean.unique()
+    if pd.api.types.infer_dtype(data_clean, skipna=False) == 'string':
+        # Text columns: dedupe before converting (same values, same order)
+        unique_dates = data_clean.unique()
+    else:
+        unique_dates = data_clean.astype(str).unique()
     sample = pd.Series(unique_dates[:sample_size]) if len(unique_dates) > sample_size else pd.Series(unique_dates)
 
     # Store parsed date components for analysis
@@ -331,9 +540,54 @@ def detect_date_format(data: pd.Series, sample_size: int = 200) -> Optional[str]
         return f'{first_format}{separator}%Y{separator}{second_format}'
 
 
+# Formats detected per (file, column), so reruns over the same upload skip the scan
+DATE_FORMAT_CACHE_SIZE = 256
+_date_format_cache: Dict[Tuple, Optional[str]] = {}
+_date_format_cache_lock = threading.Lock()
+
+
+def detect_column_date_format(data: pd.Series, filename: Optional[str], column: str) -> Optional[str]:
+    """
+    detect_date_format() for a column of an uploaded file, remembered per (file, column)
+
+    Args:
+        data: The column's values
+        filename: Name of the uploaded file (None = do not cache)
+        column: Name of the column in the file
+
+    Returns:
+        Format string, or None if the format cannot be determined
+    """
+    if not filename:
+        return detect_date_format(data)
+
+    # Length and leading values guard against a different file uploaded under the same name
+    key = (filename, column, len(data), tuple(data.head(20).astype(str)))
+    with _date_format_cache_lock:
+        if key in _date_format_cache:
+            return _date_format_cache[key]
+
+    detected_format = detect_date_format(data)
+    with _date_format_cache_lock:
+        if len(_date_format_cache) >= DATE_FORMAT_CACHE_SIZE:
+            _date_format_cache.pop(next(iter(_date_format_cache)))
+        _date_format_cache[key] = detected_format
+    return detected_format
+
+
 class DateFormatTransformation(FieldTransformation):
     """Parse date in various formats with smart auto-detection"""
 
+    # Formats tried in order when no input_format is given
+    AUTO_FORMATS = [
+        '%Y-%m-%d',
+        '%m/%d/%Y',
+        '%d/%m/%Y',
+        '%Y/%m/%d',
+        '%m-%d-%Y',
+        '%d-%m-%Y',
+    ]
+
     def __init__(self, input_format: Optional[str] = None, output_format: str = '%Y-%m-%d'):
         """
         Args:
@@ -359,17 +613,8 @@ class DateFormatTransformation(FieldTransformation):
                 dt = datetime.strptime(date_str, self.input_format)
             else:
                 # Try common formats
-                formats = [
-                    '%Y-%m-%d',
-                    '%m/%d/%Y',
-                    '%d/%m/%Y',
-                    '%Y/%m/%d',
-                    '%m-%d-%Y',
-                    '%d-%m-%Y',
-                ]
-
                 dt = None
-                for fmt in formats:
+                for fmt in self.AUTO_FORMATS:
                     try:
                         dt = datetime.strptime(date_str, fmt)
                         break
@@ -384,6 +629,44 @@ class DateFormatTransformation(FieldTransformation):
         except (ValueError, AttributeError):
             return str(value)
 
+    def apply_series(self, series: pd.Series) -> pd.Series:
+        """
+        Parse a whole column with the same results as apply()
+
+        apply() only depends on str(value), so each distinct text is parsed once:
+        one to_datetime(format=...) call per candidate format over the texts not
+        parsed yet. Texts to_datetime rejects (unparseable ones, but also dates
+        outside its year range 1677-2262) go through apply().
+        """
+        if len(series) == 0:
+            return series.apply(self.apply)
+
+        present = ~blank_mask(series).to_numpy()
+        codes, texts = pd.factorize(as_text(series).to_numpy(dtype=object)[present])
+        stripped = pd.Series(texts, dtype=object).str.strip()
+
+        parsed = np.full(len(texts), None, dtype=object)
+        pending = np.ones(len(texts), dtype=bool)
+        for fmt in ([self.input_format] if self.input_format else self.AUTO_FORMATS):
+            rows = np.flatnonzero(pending)
+            if len(rows) == 0:
+                break
+            try:
+                dates = pd.to_datetime(stripped.iloc[rows], format=fmt, errors='coerce')
+                ok = dates.notna().to_numpy()
+                parsed[rows[ok]] = dates[ok].dt.strftime(self.output_format).to_numpy(dtype=object)
+            except (ValueError, TypeError):
+                # Formats to_datetime cannot handle are left to apply()
+                continue
+            pending[rows[ok]] = False
+
+        for i in np.flatnonzero(pending):
+            parsed[i] = self.apply(texts[i])
+
+        result = np.full(len(series), None, dtype=object)
+        result[present] = parsed[codes]
+        return pd.Series(result, index=series.index, name=series.name)
+
 
 class ChainTransformation(FieldTransformation):
     """Chain multiple transformations together"""
@@ -464,25 +747,9 @@ def apply_conditional_transformation(value: Any, condition_config: Dict) -> Any:
 
     # Check each condition
     for condition in conditions:
-        condition_type = condition.get('type')
-        check_value = condition.get('value', '')
         steps = condition.get('steps', [])
 
-        matched = False
-
-        if condition_type == 'contains':
-            matched = check_value in value_str
-        elif condition_type == 'starts_with':
-            matched = value_str.startswith(check_value)
-        elif condition_type == 'ends_with':
-            matched = value_str.endswith(check_value)
-        elif condition_type == 'equals':
-            matched = value_str == check_value
-        elif condition_type == 'regex_match':
-            import re
-            matched = bool(re.search(check_value, value_str))
-
-        if matched:
+        if condition_matches(condition, value_str):
             # Apply the steps for this condition
             result = value
             for step in steps:
@@ -526,87 +793,47 @@ def apply_transformation(data: pd.Series, transformation_config: Dict) -> pd.Ser
     Returns:
         Transformed pandas Series
     """
-    trans_type = transformation_config.get('type')
-
-    # Handle conditional transformations
-    if trans_type == 'conditional':
-        return data.apply(lambda x: apply_conditional_transformation(x, transformation_config))
-
-    # Handle chained transformations
-    if trans_type == 'chain':
-        steps = transformation_config.get('steps', [])
-        result = data
-        for step in steps:
-            result = apply_transformation(result, step)
-        return result
+    # Compiled once per config into whole-column operations (src/transformation_plan.py)
+    from src.transformation_plan import compile_transformation
+    return compile_transformation(transformation_config).run(data)
+
+
+# Step types backed by a FieldTransformation class
+TRANSFORMATION_CLASSES = {
+    'parse_time': TimeFormatTransformation,
+    'regex_extract': RegexExtractTransformation,
+    'split_extract': SplitExtractTransformation,
+    'clean_numeric': CleanNumericTransformation,
+    'parse_date': DateFormatTransformation,
+}
 
-    # Single transformation
-    params = transformation_config.get('params', {})
+# Step transformations kept built, keyed by type and parameters
+STEP_CACHE_SIZE = 256
 
-    # Handle simple operations that don't need full transformation classes
-    if trans_type == 'split':
-        delimiter = params.get('delimiter', ',')
-        return data.apply(lambda x: str(x).split(delimiter) if pd.notna(x) and x != '' else [])
 
-    elif trans_type == 'extract_index':
-        index = params.get('index', 0)
-        return data.apply(lambda x: x[index] if isinstance(x, list) and len(x) > index else (x if not isinstance(x, list) else ''))
+@functools.lru_cache(maxsize=STEP_CACHE_SIZE)
+def _cached_step_transformation(trans_type: str, params_json: str) -> FieldTransformation:
+    return TRANSFORMATION_CLASSES[trans_type](**json.loads(params_json))
 
-    elif trans_type == 'remove_prefix':
-        prefix = params.get('prefix', '')
-        def remove_prefix(x):
-            if pd.isna(x) or x == '':
-                return ''
-            result = str(x).strip()
-            if result.startswith(prefix):
-                result = result[len(prefix):].strip()
-            return result
-        return data.apply(remove_prefix)
-
-    elif trans_type == 'trim_all':
-        return data.apply(lambda x: str(x).replace(' ', '') if pd.notna(x) and x != '' else '')
-
-    elif trans_type == 'trim_ends':
-        return data.apply(lambda x: str(x).strip() if pd.notna(x) and x != '' else '')
 
-    elif trans_type == 'value_map':
-        mapping = params.get('mapping', {})
-        default = params.get('default', '')
-        return data.apply(lambda x: mapping.get(str(x).strip(), default) if pd.notna(x) and str(x).strip() != '' else default)
+def step_transformation(trans_type: str, params: Dict) -> FieldTransformation:
+    """
+    The FieldTransformation of a step, built once per type and parameters (so
+    e.g. a regex_extract pattern is compiled once, not per previewed value)
 
-    elif trans_type == 'regex_replace':
-        pattern = params.get('pattern', '')
-        replacement = params.get('replacement', '')
-        return data.apply(lambda x: re.sub(pattern, replacement, str(x)).strip() if pd.notna(x) and x != '' else '')
-
-    # Handle transformation classes
-    elif trans_type == 'parse_time':
-        transform = TimeFormatTransformation(**params)
-    elif trans_type == 'regex_extract':
-        transform = RegexExtractTransformation(**params)
-    elif trans_type == 'split_extract':
-        transform = SplitExtractTransformation(**params)
-    elif trans_type == 'clean_numeric':
-        transform = CleanNumericTransformation(**params)
-    elif trans_type == 'parse_date':
-        # Auto-detect date format if input_format not specified
-        if 'input_format' not in params or params['input_format'] is None:
-            detected_format = detect_date_format(data)
-            if detected_format:
-                # Use detected format
-                params_with_detection = params.copy()
-                params_with_detection['input_format'] = detected_format
-                transform = DateFormatTransformation(**params_with_detection)
-            else:
-                # No detection possible, use default behavior
-                transform = DateFormatTransformation(**params)
-        else:
-            transform = DateFormatTransformation(**params)
-    else:
-        # No transformation
-        return data
+    Args:
+        trans_type: Step type (a key of TRANSFORMATION_CLASSES)
+        params: Step parameters
 
-    return transform.apply_series(data)
+    Returns:
+        FieldTransformation instance (shared; transformations hold no state)
+    """
+    try:
+        params_json = json.dumps(params, sort_keys=True)
+    except TypeError:
+        # Parameters holding non-JSON values are not cached
+        return TRANSFORMATION_CLASSES[trans_type](**params)
+    return _cached_step_transformation(trans_type, params_json)
 
 
 def preview_transformation_step(value: Any, step_config: Dict) -> Any:
@@ -675,27 +902,11 @@ def preview_transformation_step(value: Any, step_config: Dict) -> Any:
         replacement = params.get('replacement', '')
         if pd.isna(value) or value == '':
             return ''
-        return re.sub(pattern, replacement, str(value)).strip()
-
-    elif trans_type == 'split_extract':
-        transform = SplitExtractTransformation(**params)
-        return transform.apply(value)
-
-    elif trans_type == 'parse_time':
-        transform = TimeFormatTransformation(**params)
-        return transform.apply(value)
-
-    elif trans_type == 'regex_extract':
-        transform = RegexExtractTransformation(**params)
-        return transform.apply(value)
-
-    elif trans_type == 'clean_numeric':
-        transform = CleanNumericTransformation(**params)
-        return transform.apply(value)
+        return compiled_pattern(pattern).sub(replacement, str(value)).strip()
 
-    elif trans_type == 'parse_date':
-        transform = DateFormatTransformation(**params)
-        return transform.apply(value)
+    elif trans_type in TRANSFORMATION_CLASSES:
+        # split_extract, parse_time, regex_extract, clean_numeric, parse_date
+        return step_transformation(trans_type, params).apply(value)
 
     elif trans_type == 'conditional':
         # Handle conditional transformations
@@ -706,25 +917,9 @@ def preview_transformation_step(value: Any, step_config: Dict) -> Any:
 
         # Check the condition
         for condition in conditions:
-            condition_type = condition.get('type')
-            check_value = condition.get('value', '')
             steps = condition.get('steps', [])
 
-            matched = False
-
-            if condition_type == 'contains':
-                matched = check_value in value_str
-            elif condition_type == 'starts_with':
-                matched = value_str.startswith(check_value)
-            elif condition_type == 'ends_with':
-                matched = value_str.endswith(check_value)
-            elif condition_type == 'equals':
-                matched = value_str == check_value
-            elif condition_type == 'regex_match':
-                import re
-                matched = bool(re.search(check_value, value_str))
-
-            if matched:
+            if condition_matches(condition, value_str):
                 # Apply THEN steps
                 result = value
                 for step in steps:
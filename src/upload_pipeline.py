@@ -0,0 +1,446 @@
+"""
+Upload Pipeline
+Streams an uploaded file to Snowflake in chunks: read a chunk, transform it, load it.
+
+Peak memory follows the chunk size instead of the file size. CSV files are read
+with pandas' chunked reader. Excel files and wide-format CSVs need the whole sheet
+(the wide-to-long transform pivots every row), so those are read fully and then
+handed out in slices.
+
+survey_uploads() ingests several uploads at once, one file per worker process.
+Workers send each survey back with its preview, and the whole ingested file when it
+will not be streamed, as Arrow IPC buffers, so the load step does not read it again.
+"""
+
+import copy
+import io
+import itertools
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from src.logo_detection import detect_header_row
+from src.wide_format_handler import detect_and_transform, may_be_wide_format
+
+# Rows per chunk read from the file
+DEFAULT_CHUNK_ROWS = 50000
+
+# Rows kept from the first chunk for previews
+PREVIEW_ROWS = 50
+
+# Worker processes shared by every survey_uploads() call (created on first use)
+_survey_pool = None
+_survey_pool_workers = 0
+_survey_pool_lock = threading.Lock()
+
+
+def _is_csv(file_name: str) -> bool:
+    return file_name.endswith('.csv')
+
+
+def _detect_header(file_buffer, is_csv: bool) -> int:
+    """Header row index, skipping logo/banner rows (same peek as the Load Data tab)"""
+    file_buffer.seek(0)
+    if is_csv:
+        df_peek = pd.read_csv(file_buffer, header=None, nrows=15)
+    else:
+        df_peek = pd.read_excel(file_buffer, header=None, nrows=15)
+    file_buffer.seek(0)
+    return detect_header_row(df_peek)
+
+
+def _read_full(file_buffer, file_name: str, header_row: int, stats: Dict) -> pd.DataFrame:
+    """Read a whole file and apply the empty-row and wide-format handling"""
+    file_buffer.seek(0)
+    if _is_csv(file_name):
+        df = pd.read_csv(file_buffer, header=header_row)
+    else:
+        df = pd.read_excel(file_buffer, header=header_row)
+    df.columns = df.columns.str.strip()
+
+    original_count = len(df)
+    df = df.dropna(how='all')
+    stats['empty_rows_removed'] += original_count - len(df)
+
+    file_buffer.seek(0)
+    df, was_transformed, filtered_count = detect_and_transform(
+        df, file_buffer=file_buffer, file_type='csv' if _is_csv(file_name) else 'xlsx'
+    )
+    stats['wide_format'] = was_transformed
+    stats['filtered_count'] = filtered_count
+    return df
+
+
+def _csv_chunks(file_buffer, header_row: int, chunk_rows: int, dtypes: Optional[Dict[str, str]]) -> Iterator[pd.DataFrame]:
+    """Chunked CSV reader; dtypes are keyed by stripped column name"""
+    read_dtypes = None
+    if dtypes:
+        file_buffer.seek(0)
+        raw_columns = pd.read_csv(file_buffer, header=header_row, nrows=0).columns
+        read_dtypes = {raw: dtypes[raw.strip()] for raw in raw_columns if raw.strip() in dtypes}
+
+    file_buffer.seek(0)
+    # Closing the reader explicitly (also when the generator is abandoned early)
+    # releases its text wrapper without closing the caller's buffer
+    with pd.read_csv(file_buffer, header=header_row, chunksize=chunk_rows, dtype=read_dtypes) as reader:
+        for chunk in reader:
+            chunk.columns = chunk.columns.str.strip()
+            yield chunk
+
+
+def read_upload_chunks(file_buffer, file_name: str, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                       max_rows: Optional[int] = None, dtypes: Optional[Dict[str, str]] = None,
+                       stats: Optional[Dict] = None) -> Iterator[pd.DataFrame]:
+    """
+    Read an uploaded file as a sequence of raw DataFrame chunks
+
+    Args:
+        file_buffer: Uploaded file (anything pandas can read that supports seek)
+        file_name: File name (.csv files are streamed, anything else is read as Excel)
+        chunk_rows: Rows per chunk
+        max_rows: Stop after this many rows (debug mode)
+        dtypes: Column dtypes to force while reading, from survey_upload(), so every chunk
+            gets the dtype a full read would infer
+        stats: Optional dict filled with 'rows', 'empty_rows_removed', 'wide_format',
+            'filtered_count' and 'streamed'
+
+    Yields:
+        DataFrames with stripped column names and no all-empty rows
+    """
+    stats = stats if stats is not None else {}
+    stats.update(rows=0, empty_rows_removed=0, wide_format=False, filtered_count=0, streamed=False)
+    header_row = _detect_header(file_buffer, _is_csv(file_name))
+
+    if _is_csv(file_name):
+        chunks = _csv_chunks(file_buffer, header_row, chunk_rows, dtypes)
+        first = next(chunks, None)
+        if first is None:
+            return
+
+        if may_be_wide_format(first.dropna(how='all')):
+            chunks.close()
+        else:
+            stats['streamed'] = True
+            for chunk in itertools.chain([first], chunks):
+                original_count = len(chunk)
+                chunk = chunk.dropna(how='all')
+                stats['empty_rows_removed'] += original_count - len(chunk)
+
+                if max_rows is not None:
+                    chunk = chunk.head(max_rows - stats['rows'])
+                if chunk.empty:
+                    if max_rows is not None and stats['rows'] >= max_rows:
+                        return
+                    continue
+
+                stats['rows'] += len(chunk)
+                yield chunk
+            return
+
+    # Excel files and wide-format CSVs need the whole sheet
+    df = _read_full(file_buffer, file_name, header_row, stats)
+    if max_rows is not None:
+        df = df.head(max_rows)
+    stats['rows'] = len(df)
+    for i in range(0, len(df), chunk_rows):
+        yield df.iloc[i:i + chunk_rows]
+
+
+def _resolve_dtype(kinds: set) -> Optional[str]:
+    """
+    Dtype a full read would give a column whose chunks were inferred as `kinds`
+
+    Only mixed cases need forcing: text anywhere makes the whole column text
+    (keeping values like '007' intact), and ints mixed with floats become floats.
+    """
+    if len(kinds) < 2 or 'b' in kinds:
+        return None
+    if 'O' in kinds:
+        return 'str'
+    if kinds <= {'i', 'u', 'f'}:
+        return 'float64'
+    return None
+
+
+def _buffer_size(file_buffer) -> int:
+    """Size in bytes of a seekable buffer"""
+    file_buffer.seek(0, io.SEEK_END)
+    size = file_buffer.tell()
+    file_buffer.seek(0)
+    return size
+
+
+def will_stream(stats: Dict, file_size: int, stream_min_bytes: Optional[int]) -> bool:
+    """
+    Whether a surveyed file is loaded chunk by chunk instead of in memory
+
+    Args:
+        stats: Stats from read_upload_chunks() / survey_upload()
+        file_size: Size of the upload in bytes
+        stream_min_bytes: Smallest file that is streamed (None = never stream)
+    """
+    return bool(stats.get('streamed')) and stream_min_bytes is not None and file_size >= stream_min_bytes
+
+
+def survey_upload(file_buffer, file_name: str, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                  max_rows: Optional[int] = None, keep_frame: bool = False,
+                  stream_min_bytes: Optional[int] = None) -> Dict:
+    """
+    Scan an uploaded file once
+
+    Args:
+        file_buffer: Uploaded file
+        file_name: File name
+        chunk_rows: Rows per chunk
+        max_rows: Stop after this many rows (debug mode)
+        keep_frame: Also return the ingested file, unless will_stream() says it is
+            streamed (those are never held in memory)
+        stream_min_bytes: See will_stream()
+
+    Returns:
+        {
+            'rows': row count,
+            'columns': column names,
+            'preview': first PREVIEW_ROWS rows,
+            'dtypes': dtypes to pass back to read_upload_chunks(),
+            'stats': see read_upload_chunks(),
+            'frame': the whole ingested file, as the load step would read it (None when
+                not kept)
+        }
+    """
+    stats = {}
+    preview = None
+    kinds: Dict[str, set] = {}
+    chunks = None
+
+    for chunk in read_upload_chunks(file_buffer, file_name, chunk_rows, max_rows, stats=stats):
+        if preview is None:
+            preview = chunk.head(PREVIEW_ROWS).copy()
+            # stats['streamed'] is known once the first chunk has been read
+            if keep_frame and not will_stream(stats, _buffer_size(file_buffer), stream_min_bytes):
+                chunks = []
+        if chunks is not None:
+            chunks.append(chunk)
+        for col in chunk.columns:
+            values = chunk[col]
+            # An all-empty chunk says nothing about the column's type
+            if values.notna().any():
+                kinds.setdefault(col, set()).add(values.dtype.kind)
+
+    dtypes = {}
+    if stats.get('streamed'):
+        for col, col_kinds in kinds.items():
+            resolved = _resolve_dtype(col_kinds)
+            if resolved:
+                dtypes[col] = resolved
+
+    frame = None
+    if chunks is not None:
+        if dtypes:
+            # Chunks inferred different types for some columns: read again with the
+            # resolved dtypes, as the load step would
+            chunks = read_upload_chunks(file_buffer, file_name, chunk_rows, max_rows, dtypes=dtypes)
+        frame = pd.concat(chunks, ignore_index=True)
+    elif keep_frame and preview is None:
+        frame = pd.DataFrame()
+
+    if preview is None:
+        preview = pd.DataFrame()
+    return {
+        'rows': stats.get('rows', 0),
+        'columns': list(preview.columns),
+        'preview': preview,
+        'dtypes': dtypes,
+        'stats': stats,
+        'frame': frame,
+    }
+
+
+def resolve_date_detection(column_mappings: Dict, sample: pd.DataFrame) -> Dict:
+    """
+    Pin the auto-detected Date format so every chunk parses dates the same way
+
+    apply_column_mappings detects the Date format from the data it is given when no
+    transformation is configured. Chunks could disagree, so the format is detected
+    once on the first chunk and written into a copy of the mappings.
+
+    Args:
+        column_mappings: Template column mappings
+        sample: First raw chunk of the file
+
+    Returns:
+        Column mappings (a modified copy when a format was pinned)
+    """
+    from src.transformations import detect_date_format
+
+    mapping = column_mappings.get('Date')
+    if not isinstance(mapping, dict) or mapping.get('transformation') or not mapping.get('source_column'):
+        return column_mappings
+
+    source_col = mapping['source_column']
+    normalized = {col.strip().lower(): col for col in sample.columns}
+    actual_col = source_col if source_col in sample.columns else normalized.get(source_col.strip().lower())
+    if not actual_col:
+        return column_mappings
+
+    detected_format = detect_date_format(sample[actual_col])
+    if not detected_format:
+        return column_mappings
+
+    pinned = copy.deepcopy(column_mappings)
+    pinned['Date']['transformation'] = {
+        'type': 'parse_date',
+        'params': {'input_format': detected_format, 'output_format': '%Y-%m-%d'}
+    }
+    return pinned
+
+
+def _pack_frame(df: pd.DataFrame):
+    """
+    Arrow IPC stream of a DataFrame, for handing it between processes
+
+    Frames that do not survive the round trip unchanged (e.g. object columns
+    mixing numbers and text) are returned as they are.
+    """
+    try:
+        import pyarrow as pa
+        table = pa.Table.from_pandas(df, preserve_index=True)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        packed = sink.getvalue().to_pybytes()
+        unpacked = unpack_frame(packed)
+    except Exception:
+        return df
+    if (unpacked.equals(df) and unpacked.columns.equals(df.columns) and unpacked.index.equals(df.index)
+            and list(unpacked.dtypes) == list(df.dtypes)):
+        return packed
+    return df
+
+
+def unpack_frame(packed) -> pd.DataFrame:
+    """DataFrame from a packed survey frame (see survey_uploads)"""
+    if isinstance(packed, pd.DataFrame):
+        return packed
+    import pyarrow as pa
+    return pa.ipc.open_stream(packed).read_all().to_pandas()
+
+
+def _survey_bytes(file_bytes: bytes, file_name: str, chunk_rows: int, max_rows: Optional[int],
+                  keep_frame: bool, stream_min_bytes: Optional[int]) -> Dict:
+    """survey_upload() run in a worker process, with the preview and frame packed"""
+    survey = survey_upload(io.BytesIO(file_bytes), file_name, chunk_rows, max_rows, keep_frame, stream_min_bytes)
+    survey['preview'] = _pack_frame(survey['preview'])
+    if survey['frame'] is not None:
+        survey['frame'] = _pack_frame(survey['frame'])
+    return survey
+
+
+def _file_bytes(file_buffer) -> bytes:
+    if hasattr(file_buffer, 'getvalue'):
+        return file_buffer.getvalue()
+    file_buffer.seek(0)
+    data = file_buffer.read()
+    file_buffer.seek(0)
+    return data
+
+
+def _get_survey_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Shared worker pool, recreated when the worker count changes"""
+    global _survey_pool, _survey_pool_workers
+    with _survey_pool_lock:
+        if _survey_pool is None or _survey_pool_workers != max_workers:
+            if _survey_pool is not None:
+                _survey_pool.shutdown(wait=False)
+            # Streamlit runs scripts on threads, and forking a threaded process is unsafe
+            _survey_pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+            _survey_pool_workers = max_workers
+        return _survey_pool
+
+
+def _reset_survey_pool():
+    """Drop a broken pool so the next call starts fresh workers"""
+    global _survey_pool
+    with _survey_pool_lock:
+        if _survey_pool is not None:
+            _survey_pool.shutdown(wait=False)
+        _survey_pool = None
+
+
+def survey_uploads(files: List[Tuple], chunk_rows: int = DEFAULT_CHUNK_ROWS, max_rows: Optional[int] = None,
+                   max_workers: int = 1, keep_frames: bool = False,
+                   stream_min_bytes: Optional[int] = None) -> Iterator[Tuple[int, Optional[Dict], Optional[Exception]]]:
+    """
+    Ingest several uploaded files, yielding each survey as soon as it is ready
+
+    With max_workers > 1 and more than one file, the files are ingested in worker
+    processes (header detection, empty-row removal and the wide-to-long transform
+    are CPU bound), so results arrive in completion order. Otherwise they are
+    ingested here, in order.
+
+    Args:
+        files: List of (file_buffer, file_name)
+        chunk_rows: Rows per chunk
+        max_rows: Stop after this many rows per file (debug mode)
+        max_workers: Maximum number of worker processes
+        keep_frames: Return each ingested file that is not streamed as 'frame' (see
+            survey_upload); build the DataFrame with unpack_frame()
+        stream_min_bytes: See will_stream()
+
+    Yields:
+        (index into files, survey_upload() result or None, exception or None).
+        From worker processes, 'frame' is an Arrow IPC buffer.
+    """
+    workers = min(max_workers, len(files), multiprocessing.cpu_count())
+    if workers <= 1:
+        for idx, (file_buffer, file_name) in enumerate(files):
+            try:
+                yield idx, survey_upload(file_buffer, file_name, chunk_rows, max_rows, keep_frames, stream_min_bytes), None
+            except Exception as e:
+                yield idx, None, e
+        return
+
+    pool = _get_survey_pool(workers)
+    futures = {
+        pool.submit(_survey_bytes, _file_bytes(file_buffer), file_name, chunk_rows, max_rows,
+                    keep_frames, stream_min_bytes): idx
+        for idx, (file_buffer, file_name) in enumerate(files)
+    }
+    for future in as_completed(futures):
+        idx = futures[future]
+        try:
+            survey = future.result()
+            survey['preview'] = unpack_frame(survey['preview'])
+            yield idx, survey, None
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory): ingest the file here instead
+            _reset_survey_pool()
+            file_buffer, file_name = files[idx]
+            try:
+                yield idx, survey_upload(file_buffer, file_name, chunk_rows, max_rows, keep_frames, stream_min_bytes), None
+            except Exception as e:
+                yield idx, None, e
+        except Exception as e:
+            yield idx, None, e
+
+
+def transform_chunks(chunks: Iterator[pd.DataFrame],
+                     transform: Callable[[pd.DataFrame, bool], pd.DataFrame]) -> Iterator[pd.DataFrame]:
+    """
+    Apply a per-chunk transformation lazily
+
+    Args:
+        chunks: Raw chunks (see read_upload_chunks)
+        transform: Callable(raw_chunk, is_first_chunk) -> transformed DataFrame
+
+    Yields:
+        Non-empty transformed chunks
+    """
+    for idx, chunk in enumerate(chunks):
+        transformed = transform(chunk, idx == 0)
+        if transformed is not None and not transformed.empty:
+            yield transformed
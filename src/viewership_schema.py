@@ -0,0 +1,251 @@
+"""
+Viewership Schema
+Column types of platform_viewership, read from sql/templates/create_platform_viewership.sql,
+and the dtype coercion used by the Arrow ingest path.
+
+The DDL template is the single source of truth: adding a column to the template is
+enough for the Arrow path to type it correctly. Columns the VALUES path renders
+specially (DATE, timestamps, REVENUE; see src/sql_encoders.py) are converted from
+the literals that path would send, so every load mode stores the same values.
+"""
+
+import os
+import re
+from functools import lru_cache
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from src.sql_encoders import CURRENCY_COLUMNS, DATE_COLUMNS, TIMESTAMP_COLUMNS, select_encoder
+
+DDL_TEMPLATE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'sql', 'templates', 'create_platform_viewership.sql'
+)
+
+# Column definition inside the CREATE TABLE block, e.g. "TOT_HOV FLOAT," or "PLATFORM VARCHAR(255),"
+_COLUMN_DEF = re.compile(r'^\s*([A-Z_][A-Z0-9_]*)\s+([A-Z_]+)(?:\((\d+)(?:\s*,\s*(\d+))?\))?', re.IGNORECASE)
+
+# SQL type -> kind used for coercion
+_SQL_KINDS = {
+    'VARCHAR': 'string',
+    'STRING': 'string',
+    'TEXT': 'string',
+    'NUMBER': 'integer',
+    'INTEGER': 'integer',
+    'INT': 'integer',
+    'BIGINT': 'integer',
+    'FLOAT': 'float',
+    'DOUBLE': 'float',
+    'DATE': 'date',
+    'TIMESTAMP_NTZ': 'timestamp',
+    'TIMESTAMP': 'timestamp',
+    'BOOLEAN': 'boolean',
+}
+
+_TRUE_STRINGS = {'true', 't', 'yes', 'y', 'on', '1'}
+_FALSE_STRINGS = {'false', 'f', 'no', 'n', 'off', '0'}
+
+
+@lru_cache(maxsize=None)
+def load_viewership_schema(path: str = DDL_TEMPLATE_PATH) -> Dict[str, str]:
+    """
+    Parse the platform_viewership DDL template
+
+    Args:
+        path: Path to the CREATE TABLE template
+
+    Returns:
+        Dictionary of column name -> SQL type (e.g. {'PLATFORM': 'VARCHAR(255)', 'TOT_HOV': 'FLOAT'}),
+        in table order
+    """
+    with open(path, 'r') as f:
+        ddl = f.read()
+
+    match = re.search(r'CREATE TABLE[^(]*\((.*)\);', ddl, re.IGNORECASE | re.DOTALL)
+    if not match:
+        raise Exception(f"No CREATE TABLE statement found in {path}")
+
+    schema = {}
+    for line in match.group(1).splitlines():
+        line = line.split('--')[0]
+        column = _COLUMN_DEF.match(line)
+        if not column:
+            continue
+        name, sql_type = column.group(1).upper(), column.group(2).upper()
+        if sql_type not in _SQL_KINDS:
+            continue
+        if column.group(3):
+            size = column.group(3) + (f",{column.group(4)}" if column.group(4) else '')
+            sql_type = f"{sql_type}({size})"
+        schema[name] = sql_type
+    return schema
+
+
+def column_kind(column: str) -> str:
+    """Coercion kind for a column ('string' for columns not in the template)"""
+    sql_type = load_viewership_schema().get(column.upper(), 'VARCHAR')
+    return _SQL_KINDS[sql_type.split('(')[0]]
+
+
+def arrow_schema(columns: List[str]):
+    """
+    Build the Arrow schema for a set of platform_viewership columns
+
+    Args:
+        columns: Column names, in the order they appear in the DataFrame
+
+    Returns:
+        pyarrow.Schema
+    """
+    import pyarrow as pa
+
+    arrow_types = {
+        'string': pa.string(),
+        'integer': pa.int64(),
+        'float': pa.float64(),
+        'date': pa.date32(),
+        'timestamp': pa.timestamp('us'),
+        'boolean': pa.bool_(),
+    }
+    return pa.schema([pa.field(col, arrow_types[column_kind(col)]) for col in columns])
+
+
+def _is_blank(values: pd.Series) -> pd.Series:
+    """True where a value is missing or an empty/whitespace-only string"""
+    return values.isna() | values.astype(str).str.strip().eq('')
+
+
+def _check_unparsed(column: str, values: pd.Series, parsed: pd.Series, kind: str):
+    """Raise when non-blank values could not be converted (Snowflake would reject them too)"""
+    bad = parsed.isna() & ~_is_blank(values)
+    if bad.any():
+        samples = ', '.join(repr(v) for v in values[bad].unique()[:5])
+        raise Exception(f"Column {column} expects {kind} values but found: {samples}")
+
+
+def _to_numeric(column: str, values: pd.Series) -> pd.Series:
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        return values.astype('float64')
+    as_text = values.where(values.isna(), values.astype(str).str.strip().str.replace(',', '', regex=False))
+    parsed = pd.to_numeric(as_text, errors='coerce').astype('float64')
+    _check_unparsed(column, values, parsed, 'numeric')
+    return parsed
+
+
+def _values_literals(column: str, values: pd.Series) -> pd.Series:
+    """SQL literals the VALUES path renders for a column, aligned with values"""
+    return pd.Series(select_encoder(column, values).encode(values, column), index=values.index)
+
+
+def _literal_float(text: str) -> float:
+    try:
+        return float(text)
+    except ValueError:
+        return np.nan
+
+
+def _from_literals(column: str, values: pd.Series, kind: str) -> pd.Series:
+    """
+    Convert a DATE / timestamp / REVENUE column from its VALUES literals
+
+    Missing and blank values become nulls. Any other literal that is not what the
+    VALUES path renders for a parsed value (dates it could not parse are passed
+    through as written for Snowflake to reject) raises.
+    """
+    literals = _values_literals(column, values)
+    missing = _is_blank(values) | literals.eq('NULL')
+    text = literals.where(~missing).str.slice(1, -1)
+
+    if kind == 'float':
+        # float() rather than to_numeric so numbers round-trip exactly through their literals
+        parsed = literals.where(~missing).map(_literal_float, na_action='ignore').astype('float64')
+    elif kind == 'date':
+        parsed = pd.to_datetime(text, errors='coerce', format='%Y-%m-%d')
+    else:
+        parsed = pd.to_datetime(text, errors='coerce', format='%Y-%m-%d %H:%M:%S')
+    _check_unparsed(column, values.where(~missing), parsed, kind)
+    return parsed
+
+
+def coerce_column(column: str, values: pd.Series) -> pd.Series:
+    """
+    Convert one column to the dtype its platform_viewership type maps to
+
+    Args:
+        column: platform_viewership column name
+        values: Column values as produced by apply_column_mappings
+
+    Returns:
+        Series with a dtype Arrow converts to the column's Arrow type without loss
+    """
+    kind = column_kind(column)
+
+    if kind == 'string':
+        if pd.api.types.is_string_dtype(values) and values.map(type).eq(str).all():
+            return values
+        return values.map(lambda v: None if pd.isna(v) else str(v)).astype(object)
+
+    if column.upper() in CURRENCY_COLUMNS and kind == 'float':
+        # '$1,234.50' -> 1234.5, '-' and other non-numbers -> NULL, as the VALUES path renders them
+        return _from_literals(column.upper(), values, 'float')
+
+    if kind == 'float':
+        return _to_numeric(column, values)
+
+    if kind == 'integer':
+        parsed = _to_numeric(column, values)
+        # Snowflake rounds half away from zero when storing a fractional value in an integer column
+        rounded = np.sign(parsed) * np.floor(np.abs(parsed) + 0.5)
+        return rounded.astype('Int64')
+
+    if kind == 'date' and column.upper() in DATE_COLUMNS:
+        # YYYYMMDD exports and other formats parse as the VALUES path parses them
+        parsed = _from_literals(column.upper(), values, 'date')
+        return parsed.dt.date.astype(object).where(parsed.notna(), None)
+
+    if kind == 'timestamp' and column.upper() in TIMESTAMP_COLUMNS:
+        # Day-first, like the VALUES path ('01-02-2025 10:00' is 1 February)
+        return _from_literals(column.upper(), values, 'timestamp').astype('datetime64[us]')
+
+    if kind in ('date', 'timestamp'):
+        raise Exception(f"Column {column} is a {kind} column without a VALUES rendering in src/sql_encoders.py")
+
+    if kind == 'boolean':
+        if pd.api.types.is_bool_dtype(values):
+            return values.astype('boolean')
+        lowered = values.astype(str).str.strip().str.lower()
+        parsed = pd.Series(pd.NA, index=values.index, dtype='boolean')
+        parsed[lowered.isin(_TRUE_STRINGS)] = True
+        parsed[lowered.isin(_FALSE_STRINGS)] = False
+        _check_unparsed(column, values, parsed, 'boolean')
+        return parsed
+
+    return values
+
+
+def coerce_to_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert every column of a transformed DataFrame to its platform_viewership dtype
+
+    Args:
+        df: Transformed DataFrame (column names are platform_viewership columns)
+
+    Returns:
+        New DataFrame with the same columns, typed for Arrow conversion
+    """
+    return pd.DataFrame({col: coerce_column(col, df[col]) for col in df.columns}, index=df.index)
+
+
+def to_arrow_table(df: pd.DataFrame):
+    """
+    Convert a transformed DataFrame to an Arrow table typed from the DDL template
+
+    Returns:
+        pyarrow.Table
+    """
+    import pyarrow as pa
+
+    coerced = coerce_to_schema(df)
+    return pa.Table.from_pandas(coerced, schema=arrow_schema(list(coerced.columns)), preserve_index=False)
@@ -3,6 +3,8 @@ Wide Format Handler
 Detects and transforms wide-format viewership data (dates as columns) to long format (dates as rows)
 """
 
+import functools
+import numpy as np
 import pandas as pd
 import re
 from datetime import datetime
@@ -12,11 +14,125 @@ import io
 # Global to track filtered rows
 _last_filtered_count = 0
 
+# Patterns to match date columns in multiple formats including pandas-renamed duplicates (.1, .2, etc.)
+DATE_PATTERN_YMD = re.compile(r'^(\d{4}-\d{2}-\d{2})(?:\.(\d+))?$')  # YYYY-MM-DD
+DATE_PATTERN_DMY = re.compile(r'^(\d{2}-\d{2}-\d{4})(?:\.(\d+))?$')  # DD-MM-YYYY or MM-DD-YYYY
 
-def is_wide_format(df: pd.DataFrame) -> Tuple[bool, Optional[Dict]]:
+# Pandas-renamed duplicate headers: 'Stream Starts.1', 'Stream Starts.2', ...
+METRIC_SUFFIX_PATTERN = re.compile(r'^(.+)\.\d+$')
+
+# Distinct header tuples whose HeaderAnalysis is kept, so repeat uploads of a
+# template (and every chunk of a streamed file) reuse the classification
+HEADER_CACHE_SIZE = 128
+
+
+def _parse_header_date(col_str: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Dates of a stripped column header
+
+    Returns:
+        (date counted by wide-format detection, date the column is grouped under when
+        transforming), both YYYY-MM-DD or None. YYYY-MM-DD headers are grouped as
+        written but only counted when they are valid dates; DD-MM-YYYY / MM-DD-YYYY
+        headers are normalized for both.
+    """
+    match = DATE_PATTERN_YMD.match(col_str)
+    if match:
+        base_date = match.group(1)
+        try:
+            datetime.strptime(base_date, '%Y-%m-%d')
+            return base_date, base_date
+        except ValueError:
+            return None, base_date
+
+    match = DATE_PATTERN_DMY.match(col_str)
+    if match:
+        raw_date = match.group(1)
+        # Try both DD-MM-YYYY and MM-DD-YYYY
+        for fmt in ['%d-%m-%Y', '%m-%d-%Y']:
+            try:
+                normalized_date = datetime.strptime(raw_date, fmt).strftime('%Y-%m-%d')
+                return normalized_date, normalized_date
+            except ValueError:
+                continue
+    return None, None
+
+
+class HeaderAnalysis:
+    """
+    Classification of every column header of a DataFrame, computed once
+
+    Shared by wide-format detection and transformation; get one with
+    analyze_headers(). All lists are aligned with the DataFrame's columns.
+
+    Attributes:
+        names: str() of each header
+        detected_dates: Normalized date of headers that count as date columns, else None
+        group_dates: Date the column is grouped under when transforming, else None
+        metric_bases: Base name of 'Name.N' headers, else None
+        unnamed: Whether the header is a pandas 'Unnamed: N' placeholder
+    """
+
+    def __init__(self, names: Tuple[str, ...]):
+        self.names = names
+        parsed = [_parse_header_date(name.strip()) for name in names]
+        self.detected_dates = [detected for detected, _ in parsed]
+        self.group_dates = [group for _, group in parsed]
+        self.metric_bases = []
+        for name in names:
+            match = METRIC_SUFFIX_PATTERN.match(name)
+            self.metric_bases.append(match.group(1) if match else None)
+        self.unnamed = [name.startswith('Unnamed:') for name in names]
+
+    @property
+    def date_columns(self) -> List[str]:
+        """Stripped headers of the date columns (including .1, .2 suffixes from pandas)"""
+        return [name.strip() for name, date in zip(self.names, self.detected_dates) if date]
+
+    @property
+    def base_dates(self) -> set:
+        """Distinct normalized dates among the date columns"""
+        return {date for date in self.detected_dates if date}
+
+    @property
+    def unnamed_count(self) -> int:
+        return sum(self.unnamed)
+
+    def has_repeated_metrics(self, min_repeats: int = 5) -> bool:
+        """Whether some base name appears with at least min_repeats numeric suffixes"""
+        counts: Dict[str, int] = {}
+        for base in self.metric_bases:
+            if base is not None:
+                counts[base] = counts.get(base, 0) + 1
+        return bool(counts) and max(counts.values()) >= min_repeats
+
+
+@functools.lru_cache(maxsize=HEADER_CACHE_SIZE)
+def _analyze_header_names(names: Tuple[str, ...]) -> HeaderAnalysis:
+    return HeaderAnalysis(names)
+
+
+def analyze_headers(df: pd.DataFrame) -> HeaderAnalysis:
+    """
+    HeaderAnalysis of a DataFrame's columns (cached per tuple of headers)
+
+    Args:
+        df: Any DataFrame
+
+    Returns:
+        Shared HeaderAnalysis; treat it as read-only
+    """
+    return _analyze_header_names(tuple(str(col) for col in df.columns))
+
+
+def is_wide_format(df: pd.DataFrame, headers: Optional[HeaderAnalysis] = None) -> Tuple[bool, Optional[Dict]]:
     """
     Detect if a dataframe is in wide format (dates as columns).
 
+    Args:
+        df: Dataframe to check
+        headers: analyze_headers(df), when the caller already has it
+
     Returns:
         Tuple of (is_wide_format: bool, metadata: dict)
         metadata contains: date_columns, metric_columns, content_columns
@@ -24,45 +140,11 @@ def is_wide_format(df: pd.DataFrame) -> Tuple[bool, Optional[Dict]]:
     if df.empty or len(df.columns) < 5:
         return False, None
 
-    # Pattern to match date columns in multiple formats including pandas-renamed duplicates (.1, .2, etc.)
-    # Supports: YYYY-MM-DD, DD-MM-YYYY, MM-DD-YYYY
-    date_pattern_ymd = re.compile(r'^(\d{4}-\d{2}-\d{2})(?:\.(\d+))?$')  # YYYY-MM-DD
-    date_pattern_dmy = re.compile(r'^(\d{2}-\d{2}-\d{4})(?:\.(\d+))?$')  # DD-MM-YYYY or MM-DD-YYYY
-
     # Find columns that look like dates (including .1, .2 suffixes from pandas)
-    date_columns = []
-    base_dates = set()
-
-    for col in df.columns:
-        col_str = str(col).strip()
-
-        # Try YYYY-MM-DD format
-        match = date_pattern_ymd.match(col_str)
-        if match:
-            base_date = match.group(1)
-            try:
-                datetime.strptime(base_date, '%Y-%m-%d')
-                date_columns.append(col_str)
-                base_dates.add(base_date)
-                continue
-            except ValueError:
-                pass
-
-        # Try DD-MM-YYYY format
-        match = date_pattern_dmy.match(col_str)
-        if match:
-            base_date = match.group(1)
-            # Try both DD-MM-YYYY and MM-DD-YYYY
-            for fmt in ['%d-%m-%Y', '%m-%d-%Y']:
-                try:
-                    parsed_date = datetime.strptime(base_date, fmt)
-                    # Convert to YYYY-MM-DD for consistency
-                    normalized_date = parsed_date.strftime('%Y-%m-%d')
-                    date_columns.append(col_str)
-                    base_dates.add(normalized_date)
-                    break
-                except ValueError:
-                    continue
+    # Supports: YYYY-MM-DD, DD-MM-YYYY, MM-DD-YYYY
+    headers = headers or analyze_headers(df)
+    date_columns = headers.date_columns
+    base_dates = headers.base_dates
 
     # Check if we have multiple date columns (minimum 2 unique base dates for wide format)
     if len(base_dates) < 2:
@@ -116,13 +198,83 @@ def is_wide_format(df: pd.DataFrame) -> Tuple[bool, Optional[Dict]]:
     return False, None
 
 
-def transform_wide_to_long(df: pd.DataFrame, metadata: Dict) -> pd.DataFrame:
+def _stack_date_groups(df_data: pd.DataFrame, content_columns: List, date_groups: Dict) -> pd.DataFrame:
+    """
+    Reshape two-row-header data to one row per content row per date
+
+    The (date, metric) pairs from the header rows become a column MultiIndex and
+    stack() moves the date level into the rows. Rows whose content columns are all
+    empty are skipped, and (row, date) pairs without any metric data are dropped.
+    When a date repeats a metric name, the last column wins.
+
+    Args:
+        df_data: Data rows (metric name row removed)
+        content_columns: Non-date columns, copied to every output row
+        date_groups: {base_date: [(column, metric_name), ...]} in column order
+
+    Returns:
+        Long format rows: content columns, 'Date', then the cleaned metric columns
+    """
+    # Skip rows where content columns are all NA (all rows when there are none)
+    content = df_data[content_columns]
+    blank = content.isna() | content.apply(lambda values: values.astype(str).str.strip() == '')
+    data_rows = np.flatnonzero(~blank.all(axis=1).to_numpy())
+
+    # (date position, clean metric name) of every column with a metric name
+    columns, keys = [], []
+    for date_pos, columns_and_metrics in enumerate(date_groups.values()):
+        for col_name, metric_name in columns_and_metrics:
+            if metric_name.strip() != '':
+                columns.append(col_name)
+                keys.append((date_pos, metric_name.replace(' ', '_').replace('-', '_').upper()))
+    if len(data_rows) == 0 or not columns:
+        return pd.DataFrame()
+
+    wide = df_data.iloc[data_rows, [df_data.columns.get_loc(col) for col in columns]]
+    wide = wide.set_axis(pd.MultiIndex.from_tuples(keys, names=['date', 'metric']), axis=1)
+
+    # A (row, date) has data when any of its metric cells is non-empty
+    cells = wide.to_numpy(dtype=object)
+    present = ~pd.isna(cells)
+    present[present] = pd.Series(cells[present]).astype(str).str.strip().to_numpy() != ''
+    has_data = pd.DataFrame(present, columns=wide.columns).T.groupby(level='date', sort=False).any().T
+
+    wide = wide.loc[:, ~wide.columns.duplicated(keep='last')]
+    # One row per (content row, date), row-major like has_data raveled
+    long = wide.stack(level='date', future_stack=True)
+    long = long.reindex(pd.MultiIndex.from_product([wide.index, has_data.columns]))
+    dates = np.array(list(date_groups.keys()), dtype=object)[has_data.columns.to_numpy()]
+    long = long.set_axis(np.repeat(np.arange(len(data_rows)), len(dates)), axis=0)
+    long['date'] = np.tile(dates, len(data_rows))
+    long = long[has_data.to_numpy().ravel()]
+    if long.empty:
+        return pd.DataFrame()
+
+    # Metric columns in order of first appearance, as rows are emitted
+    first_row = np.argmax(has_data.to_numpy(), axis=0)
+    metric_order = []
+    for date_pos in sorted(has_data.columns[has_data.to_numpy().any(axis=0)],
+                           key=lambda pos: (first_row[has_data.columns.get_loc(pos)], pos)):
+        for key_pos, metric in keys:
+            if key_pos == date_pos and metric not in metric_order:
+                metric_order.append(metric)
+
+    row_positions = data_rows[long.index.to_numpy()]
+    result = {col: df_data[col].iloc[row_positions].reset_index(drop=True).infer_objects() for col in content_columns}
+    result['Date'] = long['date'].reset_index(drop=True)
+    for metric in metric_order:
+        result[metric] = long[metric].reset_index(drop=True).infer_objects()
+    return pd.DataFrame(result)
+
+
+def transform_wide_to_long(df: pd.DataFrame, metadata: Dict, headers: Optional[HeaderAnalysis] = None) -> pd.DataFrame:
     """
     Transform wide format dataframe to long format.
 
     Args:
         df: Wide format dataframe with dates as columns
         metadata: Detection metadata from is_wide_format()
+        headers: analyze_headers(df), when the caller already has it
 
     Returns:
         Long format dataframe with one row per content per date
@@ -136,39 +288,14 @@ def transform_wide_to_long(df: pd.DataFrame, metadata: Dict) -> pd.DataFrame:
         # Skip the metric name row for data
         df_data = df.iloc[1:].reset_index(drop=True)
 
-        # Get ALL columns and identify date columns (including pandas-renamed ones like 2025-07-01.1, .2, etc.)
-        all_columns = list(df.columns)
-
-        # Patterns to match date columns and their pandas suffixes
-        date_pattern_ymd = re.compile(r'^(\d{4}-\d{2}-\d{2})(?:\.(\d+))?$')  # YYYY-MM-DD
-        date_pattern_dmy = re.compile(r'^(\d{2}-\d{2}-\d{4})(?:\.(\d+))?$')  # DD-MM-YYYY or MM-DD-YYYY
+        # Identify date columns (including pandas-renamed ones like 2025-07-01.1, .2, etc.)
+        headers = headers or analyze_headers(df)
 
         # Group columns by base date
         date_groups = {}  # {base_date: [(col_name, metric_name), ...]}
         content_columns = []
 
-        for col in all_columns:
-            col_str = str(col).strip()
-            base_date = None
-
-            # Try YYYY-MM-DD format
-            match = date_pattern_ymd.match(col_str)
-            if match:
-                base_date = match.group(1)
-            else:
-                # Try DD-MM-YYYY format
-                match = date_pattern_dmy.match(col_str)
-                if match:
-                    raw_date = match.group(1)
-                    # Try to parse and normalize to YYYY-MM-DD
-                    for fmt in ['%d-%m-%Y', '%m-%d-%Y']:
-                        try:
-                            parsed_date = datetime.strptime(raw_date, fmt)
-                            base_date = parsed_date.strftime('%Y-%m-%d')
-                            break
-                        except ValueError:
-                            continue
-
+        for col, base_date in zip(df.columns, headers.group_dates):
             if base_date:
                 metric_name = str(metric_row[col]).strip()
 
@@ -179,49 +306,7 @@ def transform_wide_to_long(df: pd.DataFrame, metadata: Dict) -> pd.DataFrame:
             else:
                 content_columns.append(col)
 
-        # Create long format rows
-        long_rows = []
-
-        for idx, row in df_data.iterrows():
-            # Skip rows where content columns are all NA
-            content_values = [row[col] for col in content_columns]
-            if all(pd.isna(v) or str(v).strip() == '' for v in content_values):
-                continue
-
-            # For each date, create a row with all metrics for that date
-            for base_date, columns_and_metrics in date_groups.items():
-                long_row = {}
-
-                # Copy content columns
-                for col in content_columns:
-                    long_row[col] = row[col]
-
-                # Add date
-                long_row['Date'] = base_date
-
-                # Add metrics for this date
-                has_data = False
-                for col_name, metric_name in columns_and_metrics:
-                    value = row[col_name]
-
-                    # Skip if metric name is empty or NaN
-                    if pd.isna(metric_name) or metric_name.strip() == '':
-                        continue
-
-                    # Clean up metric name
-                    clean_metric = metric_name.replace(' ', '_').replace('-', '_').upper()
-                    long_row[clean_metric] = value
-
-                    # Check if this metric has actual data
-                    if pd.notna(value) and str(value).strip() != '':
-                        has_data = True
-
-                # Only add row if it has some data
-                if has_data:
-                    long_rows.append(long_row)
-
-        # Create dataframe
-        df_result = pd.DataFrame(long_rows)
+        df_result = _stack_date_groups(df_data, content_columns, date_groups)
 
         # Convert metric columns to numeric, handling commas
         for col in df_result.columns:
@@ -311,21 +396,30 @@ def read_wide_format_with_multiheader(file_path_or_buffer) -> pd.DataFrame:
             return pd.read_excel(file_path_or_buffer)
 
 
-def _has_repeated_metric_columns(df: pd.DataFrame, min_repeats: int = 5) -> bool:
+def _has_repeated_metric_columns(df: pd.DataFrame, min_repeats: int = 5,
+                                 headers: Optional[HeaderAnalysis] = None) -> bool:
     """
     Detect columns that follow 'MetricName', 'MetricName.1', 'MetricName.2', ... pattern.
     This happens when header detection picks the metric sub-header row (e.g. Roku's
     'Stream Starts' row) instead of the date row, leaving metric names as column headers
     with pandas-appended numeric suffixes.
     """
-    suffix_pattern = re.compile(r'^(.+)\.\d+$')
-    base_name_counts: Dict[str, int] = {}
-    for col in df.columns:
-        match = suffix_pattern.match(str(col))
-        if match:
-            base = match.group(1)
-            base_name_counts[base] = base_name_counts.get(base, 0) + 1
-    return bool(base_name_counts) and max(base_name_counts.values()) >= min_repeats
+    return (headers or analyze_headers(df)).has_repeated_metrics(min_repeats)
+
+
+def may_be_wide_format(df: pd.DataFrame) -> bool:
+    """
+    Cheap check, on the first rows of a file, for anything detect_and_transform would rewrite.
+
+    Wide files have to be read whole (the transform pivots every row and may re-read
+    the headers), so callers that stream a file in chunks use this to fall back to a
+    full read.
+    """
+    headers = analyze_headers(df)
+    if headers.has_repeated_metrics() or headers.unnamed_count >= 3:
+        return True
+    is_wide, _ = is_wide_format(df, headers)
+    return is_wide
 
 
 def detect_and_transform(df: pd.DataFrame, file_buffer=None, file_type: str = 'csv') -> Tuple[pd.DataFrame, bool, int]:
@@ -346,7 +440,8 @@ def detect_and_transform(df: pd.DataFrame, file_buffer=None, file_type: str = 'c
     # Detect Roku-style wrong-header: metric names like "Stream Starts", "Stream Starts.1",
     # ..., "Stream Starts.88" were used as column headers instead of the date row.
     # Re-read from the buffer with header=0 to recover the actual date column names.
-    if _has_repeated_metric_columns(df) and file_buffer is not None:
+    headers = analyze_headers(df)
+    if headers.has_repeated_metrics() and file_buffer is not None:
         print(f"🔍 Detected repeated metric columns — re-reading with header=0 to recover date headers...")
         try:
             file_buffer.seek(0)
@@ -355,15 +450,14 @@ def detect_and_transform(df: pd.DataFrame, file_buffer=None, file_type: str = 'c
             else:
                 df = pd.read_excel(file_buffer, header=0)
             df.columns = df.columns.str.strip()
+            headers = analyze_headers(df)
             print(f"📋 Re-read columns (first 10): {list(df.columns[:10])}")
         except Exception as e:
             print(f"⚠️ Failed to re-read file with header=0: {e}")
 
     # First, check if this looks like a 2-row header that was incorrectly read
     # Signs: Many "Unnamed: X" columns, and first row contains field names
-    unnamed_cols = [col for col in df.columns if str(col).startswith('Unnamed:')]
-
-    if len(unnamed_cols) >= 3 and len(df) > 0:
+    if headers.unnamed_count >= 3 and len(df) > 0:
         # Check if first row contains field-like names
         first_row = df.iloc[0]
         field_keywords = ['title', 'content', 'season', 'episode', 'provider', 'stream', 'starts', 'hour']
@@ -376,8 +470,8 @@ def detect_and_transform(df: pd.DataFrame, file_buffer=None, file_type: str = 'c
             new_columns = []
             header_row = df.iloc[0]  # Field names / metric names row
 
-            for i, col in enumerate(df.columns):
-                if str(col).startswith('Unnamed:'):
+            for i, (col, unnamed) in enumerate(zip(df.columns, headers.unnamed)):
+                if unnamed:
                     # Use the value from first row as column name (content columns)
                     field_name = str(header_row.iloc[i]) if pd.notna(header_row.iloc[i]) else f"Column_{i}"
                     new_columns.append(field_name)
@@ -408,14 +502,15 @@ def detect_and_transform(df: pd.DataFrame, file_buffer=None, file_type: str = 'c
 
             print(f"📋 Reconstructed columns (first 15): {list(df.columns[:15])}")
             print(f"📋 Total columns after cleanup: {len(df.columns)}")
+            headers = analyze_headers(df)
             # Row 0 still contains metric names for date columns - keep it for transformation
 
-    is_wide, metadata = is_wide_format(df)
+    is_wide, metadata = is_wide_format(df, headers)
 
     if is_wide:
         print(f"📊 Wide format detected: {len(metadata.get('date_columns', []))} date columns found")
         print(f"📋 Original columns (first 10): {list(df.columns[:10])}")
-        transformed_df = transform_wide_to_long(df, metadata)
+        transformed_df = transform_wide_to_long(df, metadata, headers)
         print(f"✅ Transformed to long format: {len(df)} rows → {len(transformed_df)} rows")
         print(f"📋 Transformed columns: {list(transformed_df.columns)}")
         return transformed_df, True, _last_filtered_count
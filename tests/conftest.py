@@ -0,0 +1,48 @@
+"""
+Shared fixtures: the sample uploads in sample_data/, read the way the Load Data tab
+reads them (header detection, empty-row removal, wide-to-long transformation)
+"""
+
+import contextlib
+import functools
+import glob
+import io
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd
+import pytest
+
+from src.logo_detection import detect_header_row
+from src.wide_format_handler import detect_and_transform
+
+SAMPLE_FILES = sorted(glob.glob(os.path.join(ROOT, 'sample_data', '**', '*.csv'), recursive=True))
+
+
+@functools.lru_cache(maxsize=None)
+def read_sample(path: str) -> pd.DataFrame:
+    """Read a sample CSV (UTF-16 exports are tab-separated) and transform wide layouts"""
+    encoding = None
+    with open(path, 'rb') as f:
+        if f.read(2) in (b'\xff\xfe', b'\xfe\xff'):
+            encoding = 'utf-16'
+    sep = '\t' if encoding == 'utf-16' else ','
+
+    df_peek = pd.read_csv(path, header=None, nrows=15, encoding=encoding, sep=sep)
+    header_row = detect_header_row(df_peek)
+    df = pd.read_csv(path, header=header_row, encoding=encoding, sep=sep)
+    df.columns = df.columns.astype(str).str.strip()
+    df = df.dropna(how='all')
+    # The wide-format handler reports its steps with print()
+    with open(path, 'rb') as f, contextlib.redirect_stdout(io.StringIO()):
+        df, _, _ = detect_and_transform(df, file_buffer=f, file_type='csv')
+    return df.reset_index(drop=True)
+
+
+@pytest.fixture(params=SAMPLE_FILES, ids=os.path.basename)
+def sample_file(request):
+    """(file name, DataFrame) of each sample CSV; callers must not modify the frame"""
+    return os.path.basename(request.param), read_sample(request.param)
@@ -0,0 +1,52 @@
+"""
+Tuning of INSERT ... VALUES batch sizes (src/batch_sizer.py)
+
+Run with: python -m pytest tests
+"""
+
+import random
+
+import pytest
+
+from src.batch_sizer import AdaptiveBatchSizer
+
+
+def run(sizer, seconds_for, batches=60):
+    """Feed the sizer batches timed by seconds_for(rows); return the sizes it chose"""
+    sizes = []
+    for _ in range(batches):
+        rows = sizer.next_size()
+        sizes.append(rows)
+        sizer.record(rows, rows * 100, seconds_for(rows))
+    return sizes
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_size_settles_near_the_fastest_batch(seed):
+    # Fixed overhead per statement plus a cost that grows past ~20k rows, with noise
+    noise = random.Random(seed)
+    sizer = AdaptiveBatchSizer(num_columns=3, initial_rows=2000)
+    sizes = run(sizer, lambda rows: (0.2 + rows * 1e-5 + (rows / 20000) ** 2 * 0.1) * noise.uniform(0.97, 1.03))
+
+    assert sizer.settled
+    assert len(set(sizes[-20:])) == 1
+    assert 5000 <= sizes[-1] <= 40000
+
+
+def test_size_stays_at_the_expression_cap():
+    # Larger batches are always faster: the sizer should stop at its cap instead of backing off
+    sizer = AdaptiveBatchSizer(num_columns=19)
+    sizes = run(sizer, lambda rows: 0.5 + rows * 1e-6, batches=10)
+
+    assert sizes == [sizer.max_rows] * 10
+    assert sizer.settled
+
+
+def test_settled_size_still_follows_the_byte_ceiling():
+    sizer = AdaptiveBatchSizer(num_columns=3, max_statement_bytes=1000000, initial_rows=2000)
+    run(sizer, lambda rows: 0.5 + rows * 1e-6, batches=20)
+    assert sizer.settled
+
+    # Wider rows: 500 bytes each, so at most 2000 rows fit the ceiling
+    sizer.record(sizer.next_size(), sizer.next_size() * 900, 1.0)
+    assert sizer.next_size() * sizer.bytes_per_row <= 1000000
@@ -0,0 +1,47 @@
+"""
+Client-side totals of the post-load verification (src/load_verification.py)
+
+Run with: python -m pytest tests
+"""
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from src.load_verification import build_report, content_checksum, expected_totals
+
+
+def md5_lower64(text):
+    return int.from_bytes(hashlib.md5(text.encode('utf-8')).digest()[8:], 'big')
+
+
+def test_checksum_hashes_the_stored_text():
+    df = pd.DataFrame({'PLATFORM_CONTENT_ID': ["O'Brien", None, 'x'],
+                       'PLATFORM_CONTENT_NAME': ['a', 'b', None]})
+    expected = md5_lower64("O'Brien|a") + md5_lower64('|b') + md5_lower64('x|')
+    assert content_checksum(df, ['PLATFORM_CONTENT_ID', 'PLATFORM_CONTENT_NAME']) == expected
+
+
+def test_numeric_content_ids_are_checked_as_their_digits():
+    numeric = pd.DataFrame({'PLATFORM_CONTENT_ID': [101, 202, 303], 'PLATFORM_CONTENT_NAME': ['a', 'b', 'c']})
+    mixed = pd.DataFrame({'PLATFORM_CONTENT_ID': pd.Series([101, '202', np.nan], dtype=object),
+                          'PLATFORM_CONTENT_NAME': ['a', 'b', 'c']})
+    as_text = pd.DataFrame({'PLATFORM_CONTENT_ID': ['101', '202', None], 'PLATFORM_CONTENT_NAME': ['a', 'b', 'c']})
+
+    assert expected_totals(numeric)['content_checksum'] == (
+        md5_lower64('101|a') + md5_lower64('202|b') + md5_lower64('303|c'))
+    assert expected_totals(mixed)['content_checksum'] == expected_totals(as_text)['content_checksum']
+
+
+def test_report_names_skipped_checks():
+    df = pd.DataFrame({'TOT_HOV': [1.0, 2.0], 'PLATFORM_SERIES': ['s', 't']})
+    expected = expected_totals(df)
+
+    scoped = build_report(expected, 2, 'Roku', 'file.csv', [2, 3.0, expected['content_checksum']])
+    assert scoped['verified']
+    assert scoped['skipped'] == ['TOT_MOV_sum', 'REVENUE_sum', 'date_count', 'date_days']
+
+    unscoped = build_report(expected, 2)
+    assert unscoped['skipped'] == ['record_count', 'TOT_HOV_sum', 'TOT_MOV_sum', 'REVENUE_sum',
+                                   'date_count', 'date_days', 'content_checksum']
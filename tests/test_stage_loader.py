@@ -0,0 +1,184 @@
+"""
+'copy' mode of load_to_platform_viewership against LocalStage, the local stand-in
+for a Snowflake internal stage: the staged files must round-trip the DataFrame and
+the rows reported as loaded must come from the COPY INTO results.
+
+Needs the app's dependencies (streamlit, snowflake-connector-python) to import
+src.snowflake_utils; no Snowflake account is used.
+
+Run with: python -m pytest tests
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('streamlit')
+pytest.importorskip('snowflake.connector')
+
+import config
+import src.snowflake_utils as snowflake_utils
+from src.load_verification import expected_totals
+from src.snowflake_utils import SnowflakeConnection, SnowflakeSessionPool
+from src.sql_encoders import render_literal
+from src.stage_loader import LocalStage
+
+# The reference renderer parses ISO timestamps with dayfirst=True
+pytestmark = pytest.mark.filterwarnings('ignore:Parsing dates in .* when dayfirst=True:UserWarning')
+
+PLATFORM = 'Roku'
+FILENAME = "O'Brien_Q3.csv"
+
+
+class FakeCursor:
+    """Records statements; answers the verification query from the rows the stage loaded"""
+
+    def __init__(self, answer):
+        self.answer = answer
+        self.statements = []
+        self.description = None
+        self.sfqid = None
+        self._row = None
+
+    def execute(self, sql, params=None):
+        self.statements.append((' '.join(sql.split()), params))
+        self._row = self.answer() if sql.lstrip().startswith('SELECT') else None
+        return self
+
+    def fetchone(self):
+        return self._row
+
+    def fetchall(self):
+        return [self._row] if self._row else []
+
+    def close(self):
+        pass
+
+
+class FakeConn:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.commits = 0
+
+    def cursor(self):
+        return self._cursor
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+    def is_closed(self):
+        return False
+
+    def close(self):
+        pass
+
+
+class ShortCopyStage(LocalStage):
+    """Reports one row fewer than the file holds for the second staged file"""
+
+    def copy_into(self, columns, file_name, *args, **kwargs):
+        rows = super().copy_into(columns, file_name, *args, **kwargs)
+        return rows - 1 if file_name == 'batch_00002.csv.gz' else rows
+
+
+class CountingStage(LocalStage):
+    """Remembers what every COPY INTO reported"""
+
+    def __init__(self, directory):
+        super().__init__(directory)
+        self.reported = []
+
+    def copy_into(self, *args, **kwargs):
+        rows = super().copy_into(*args, **kwargs)
+        self.reported.append(rows)
+        return rows
+
+
+@pytest.fixture
+def upload():
+    # Text equal to NULL_MARKER itself ('\\N') is not included: like NULL_IF in
+    # Snowflake, LocalStage loads it as NULL
+    return pd.DataFrame({
+        'PLATFORM': PLATFORM,
+        'FILENAME': FILENAME,
+        'PLATFORM_CONTENT_NAME': ["Judge Nosey, Ep. 1", "It's \"Judge\"", 'NULL', None, 'Line\nbreak', 'Tab\tand ,comma', 'Plain'],
+        'PLATFORM_CONTENT_ID': ['A1', 'A2', 'A3', 'A4', None, 'A6', 'A7'],
+        'DATE': ['20250701', '07/02/2025', '2025-07-03', None, '20250705', '2025-07-06', '2025-07-07'],
+        'REVENUE': ['$1,234.50', '-', '12', None, '0.5', '$ 7', 3.25],
+        'TOT_HOV': [1.5, 2.0, np.nan, 4.25, 0.0, 6.0, 7.75],
+    })
+
+
+def loaded_rows(stage):
+    return pd.concat(stage.loaded, ignore_index=True) if stage.loaded else pd.DataFrame()
+
+
+def make_connection(stage, df):
+    """SnowflakeConnection whose pooled sessions are FakeConns over one FakeCursor"""
+    expected_keys = list(expected_totals(df))
+
+    def answer():
+        totals = expected_totals(loaded_rows(stage)) if stage.loaded else {}
+        return tuple(totals.get(key, 0) for key in expected_keys)
+
+    cursor = FakeCursor(answer)
+    fake_conn = FakeConn(cursor)
+    sf_conn = SnowflakeConnection.__new__(SnowflakeConnection)
+    sf_conn.database, sf_conn.schema = 'UPLOAD_DB', 'PUBLIC'
+    sf_conn._local = threading.local()
+    sf_conn._pool = SnowflakeSessionPool(lambda: fake_conn, max_size=1)
+    sf_conn._template_cache = None
+    return sf_conn, cursor, fake_conn
+
+
+def staged_text(val, col_name):
+    """What a staged CSV field holds for a value: the VALUES literal, unquoted"""
+    literal = render_literal(val, col_name)
+    if literal == 'NULL':
+        return None
+    if literal.startswith("'"):
+        return literal[1:-1].replace("''", "'")
+    return literal
+
+
+@pytest.fixture(autouse=True)
+def local_config(monkeypatch, tmp_path):
+    monkeypatch.setenv('STREAMLIT_ENV', 'development')
+    monkeypatch.setattr(config.Config, 'LOAD_MANIFEST_DIR', str(tmp_path / 'manifests'))
+    # Several staged files per load
+    monkeypatch.setattr(snowflake_utils, 'COPY_BATCH_SIZE', 3)
+
+
+@pytest.mark.parametrize('use_column_encoders', [False, True])
+def test_staged_files_round_trip_the_frame(upload, tmp_path, use_column_encoders):
+    stage = CountingStage(str(tmp_path / 'stage'))
+    sf_conn, cursor, fake_conn = make_connection(stage, upload)
+
+    report = sf_conn.load_to_platform_viewership(upload, load_mode='copy', stage=stage,
+                                                 use_column_encoders=use_column_encoders, return_report=True)
+
+    loaded = loaded_rows(stage)
+    expected = pd.DataFrame({col: [staged_text(val, col) for val in upload[col].tolist()] for col in upload.columns})
+    pd.testing.assert_frame_equal(loaded.astype(object).where(loaded.notna(), None), expected.astype(object))
+
+    assert report['verified'], report['checks']
+    assert stage.reported == [3, 3, 1]
+    assert report['rows_loaded'] == sum(stage.reported) == len(upload)
+    assert fake_conn.commits >= len(stage.reported)
+
+    deletes = [(sql, params) for sql, params in cursor.statements if sql.startswith('DELETE')]
+    assert deletes == [("DELETE FROM UPLOAD_DB.PUBLIC.platform_viewership WHERE PLATFORM = %s AND FILENAME = %s "
+                        "AND PROCESSED IS NULL", (PLATFORM, FILENAME))]
+
+
+def test_rows_loaded_come_from_copy_result(upload, tmp_path):
+    stage = ShortCopyStage(str(tmp_path / 'stage'))
+    sf_conn, _, _ = make_connection(stage, upload)
+
+    with pytest.raises(Exception, match='COPY INTO loaded 2 of 3 rows from batch_00002.csv.gz'):
+        sf_conn.load_to_platform_viewership(upload, load_mode='copy', stage=stage)
@@ -0,0 +1,122 @@
+"""
+The Arrow ingest path (src/viewership_schema.py) must store the same values the
+INSERT ... VALUES path (src/sql_encoders.py) renders for DATE, timestamp and
+REVENUE columns.
+
+Run with: python -m pytest tests
+"""
+
+import pandas as pd
+import pytest
+
+from src.sql_encoders import render_literal
+from src.viewership_schema import to_arrow_table
+
+# The reference renderer parses ISO timestamps with dayfirst=True
+pytestmark = pytest.mark.filterwarnings('ignore:Parsing dates in .* when dayfirst=True:UserWarning')
+
+# Target columns assigned to sample columns, by kind, in order
+STRING_COLUMNS = ['PLATFORM_CONTENT_NAME', 'PLATFORM_SERIES', 'PLATFORM_CONTENT_ID', 'PLATFORM_CHANNEL_NAME',
+                  'PLATFORM_TERRITORY', 'PLATFORM_PARTNER_NAME', 'DEVICE_TYPE', 'COUNTRY', 'CITY',
+                  'LANGUAGE', 'REF_ID', 'SERIES_CODE']
+NUMERIC_COLUMNS = ['TOT_HOV', 'TOT_MOV', 'REVENUE', 'DURATION', 'AVG_DURATION_PER_SESSION',
+                   'AVG_DURATION_PER_VIEWER', 'AVG_SESSION_COUNT', 'CHANNEL_ADPOOL_REVENUE']
+COMPARED_COLUMNS = ['DATE', 'START_TIME', 'END_TIME', 'REVENUE']
+
+
+def arrow_literal(val, col_name):
+    """The VALUES literal for a value read back from the Arrow table"""
+    if val is None or (isinstance(val, float) and pd.isna(val)) or val is pd.NaT:
+        return 'NULL'
+    if col_name == 'DATE':
+        return f"'{val.strftime('%Y-%m-%d')}'"
+    if col_name in ('START_TIME', 'END_TIME'):
+        return f"'{val.strftime('%Y-%m-%d %H:%M:%S')}'"
+    return val
+
+
+def values_literal(raw, col_name):
+    """The VALUES literal for a raw cell, with numbers compared as numbers"""
+    literal = render_literal(raw, col_name)
+    return float(literal) if col_name == 'REVENUE' and literal != 'NULL' else literal
+
+
+def assert_same_values(df):
+    table = to_arrow_table(df)
+    for col in [c for c in COMPARED_COLUMNS if c in df.columns]:
+        stored = table.column(col).to_pylist()
+        for raw, val in zip(df[col], stored):
+            if isinstance(raw, str) and not raw.strip():
+                # Blank text is NULL on the Arrow path, '' on the VALUES path
+                continue
+            assert arrow_literal(val, col) == values_literal(raw, col), f"{col} {raw!r}"
+
+
+def parses_as_dates(values):
+    return pd.to_datetime(values, errors='coerce', format='mixed').notna().mean() > 0.9
+
+
+def shape_for_viewership(df, filename):
+    """
+    Give a sample file platform_viewership columns while keeping its value mix:
+    the first date-like column becomes DATE, numeric columns become float metrics
+    and everything else becomes text columns.
+    """
+    shaped = {'PLATFORM': ['Sample'] * len(df), 'FILENAME': [filename] * len(df)}
+    strings, numerics = iter(STRING_COLUMNS), iter(NUMERIC_COLUMNS)
+    for col in df.columns:
+        values = df[col]
+        if 'DATE' not in shaped and 'date' in col.lower() and parses_as_dates(values):
+            parsed = pd.to_datetime(values, errors='coerce', format='mixed')
+            shaped['DATE'] = parsed.dt.strftime('%Y-%m-%d').where(parsed.notna(), None)
+            continue
+        numeric = pd.to_numeric(values.astype(str).str.replace(r'[$,]', '', regex=True), errors='coerce')
+        if numeric.notna().sum() >= values.notna().sum() * 0.9 and values.notna().any():
+            target = next(numerics, None)
+            if target:
+                shaped[target] = numeric
+            continue
+        target = next(strings, None)
+        if target:
+            shaped[target] = values.where(values.notna(), None)
+    return pd.DataFrame(shaped)
+
+
+def with_raw_text(df, shaped):
+    """Put a sample file's date and revenue cells into the compared columns as written"""
+    shaped = shaped.copy()
+    date_cols = [c for c in df.columns if 'date' in c.lower() and parses_as_dates(df[c])]
+    revenue_cols = [c for c in df.columns if 'rev' in c.lower()]
+    if date_cols:
+        raw = df[date_cols[0]].astype(str).where(df[date_cols[0]].notna(), None).values
+        shaped['DATE'] = raw
+        shaped['START_TIME'] = raw
+    if revenue_cols:
+        shaped['REVENUE'] = df[revenue_cols[0]].astype(str).where(df[revenue_cols[0]].notna(), None).values
+    return shaped
+
+
+def test_sample_file_matches_values_path(sample_file):
+    name, df = sample_file
+    shaped = shape_for_viewership(df, name)
+    assert_same_values(shaped)
+    assert_same_values(with_raw_text(df, shaped))
+
+
+def test_currency_and_placeholders():
+    df = pd.DataFrame({'REVENUE': ['$1,234.50', '-', '(12.00)', None, '7', 3.25]})
+    assert_same_values(df)
+    assert to_arrow_table(df).column('REVENUE').to_pylist()[:2] == [1234.5, None]
+
+
+def test_day_first_timestamps():
+    df = pd.DataFrame({'START_TIME': ['01-02-2025 10:00', '2025-07-01 08:30:00', None],
+                       'END_TIME': ['13/02/2025 23:59:59', '02/03/2025', None]})
+    assert_same_values(df)
+    assert to_arrow_table(df).column('START_TIME').to_pylist()[0] == pd.Timestamp('2025-02-01 10:00')
+
+
+def test_yyyymmdd_dates():
+    df = pd.DataFrame({'DATE': ['20250701', '07/01/2025', '2025-07-02', None]})
+    assert_same_values(df)
+    assert str(to_arrow_table(df).column('DATE').to_pylist()[0]) == '2025-07-01'